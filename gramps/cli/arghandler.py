@@ -185,6 +185,7 @@ class ArgHandler:
         self.removes = parser.removes
         self.username = parser.username
         self.password = parser.password
+        self.jobs = parser.jobs
 
         self.open = self.__handle_open_option(parser.open, parser.create)
         self.sanitize_args(parser.imports, parser.exports)
@@ -474,6 +475,9 @@ class ArgHandler:
         self.__open_action()
         self.__import_action()
 
+        if self.jobs:
+            self.user.jobs = self.jobs
+
         for action, op_string in self.actions:
             print(_("Performing action: %s.") % action, file=sys.stderr)
             if op_string:
@@ -658,6 +662,7 @@ class ArgHandler:
                                 report_class,
                                 options_class,
                                 options_str_dict,
+                                jobs=self.jobs,
                             )
                         return
                 # name exists, but is not in the list of valid report names
@@ -748,6 +753,7 @@ class ArgHandler:
                         name,
                         book_list.get_book(name),
                         options_str_dict,
+                        jobs=self.jobs,
                     )
                     return
                 msg = _("Unknown book name.")
@@ -83,6 +83,7 @@ Application options
   -f, --format=FORMAT                    Specify Family Tree format
   -a, --action=ACTION                    Specify action
   -p, --options=OPTIONS_STRING           Specify options
+  -j, --jobs=NUMBER                      Apply filters and export in NUMBER processes (non-GUI mode only)
   -d, --debug=LOGGER_NAME                Enable debug logs
   -l [FAMILY_TREE_PATTERN...]            List Family Trees
   -L [FAMILY_TREE_PATTERN...]            List Family Trees in Detail
@@ -173,6 +174,7 @@ class ArgParser:
     -f, --format=FORMAT             Specify Family Tree format
     -a, --action=ACTION             Specify action
     -p, --options=OPTIONS_STRING    Specify options
+    -j, --jobs=NUMBER               Apply filters and export in NUMBER processes
     -d, --debug=LOGGER_NAME         Enable debug logs
     -l [FAMILY_TREE...]             List Family Trees
     -L [FAMILY_TREE...]             List Family Trees in Detail
@@ -212,6 +214,10 @@ class ArgParser:
     If the -y option is given, the user's acceptance of any CLI prompt is
     assumed. (see :meth:`.cli.user.User.prompt`)
 
+    If the -j option is given, the filters of reports, books, tools and
+    exports are applied to the whole Family Tree in NUMBER processes, when
+    their rules allow it.
+
     If the -q option is given, extra noise on sys.stderr, such as progress
     indicators, is suppressed.
     """
@@ -241,6 +247,7 @@ class ArgParser:
         self.create = None
         self.quiet = False
         self.auto_accept = False
+        self.jobs = None
 
         self.errors = []
         self.parse_args()
@@ -417,6 +424,17 @@ class ArgParser:
                 self.auto_accept = True
             elif option in ["-q", "--quiet"]:
                 self.quiet = True
+            elif option in ["-j", "--jobs"]:
+                try:
+                    self.jobs = int(value)
+                except ValueError:
+                    self.jobs = 0
+                if self.jobs < 1:
+                    self.errors.append(
+                        self.construct_error(
+                            "The number of jobs must be a positive integer."
+                        )
+                    )
             elif option in ["-S", "--safe"]:
                 cleandbg += [opt_ix]
             elif option in ["-D", "--default"]:
@@ -722,9 +722,18 @@ class CommandLineReport:
 # Command-line report generic task
 #
 # ------------------------------------------------------------------------
-def cl_report(database, name, category, report_class, options_class, options_str_dict):
+def cl_report(
+    database,
+    name,
+    category,
+    report_class,
+    options_class,
+    options_str_dict,
+    jobs=None,
+):
     """
-    function to actually run the selected report
+    function to actually run the selected report, with the filters applied
+    by jobs processes, or by the number of the settings if None
     """
 
     err_msg = _("Failed to write report. ")
@@ -778,7 +787,9 @@ def cl_report(database, name, category, report_class, options_class, options_str
             clr.option_class.handler.doc, "set_css_filename"
         ):
             clr.option_class.handler.doc.set_css_filename(clr.css_filename)
-        my_report = report_class(database, clr.option_class, User())
+        user = User()
+        user.jobs = jobs
+        my_report = report_class(database, clr.option_class, user)
         my_report.doc.init()
         my_report.begin_report()
         my_report.write_report()
@@ -854,10 +865,12 @@ def run_report(db, name, **options_str_dict):
 # Function to write books from command line
 #
 # ------------------------------------------------------------------------
-def cl_book(database, name, book, options_str_dict):
+def cl_book(database, name, book, options_str_dict, jobs=None):
     """
     function to actually run the selected book,
-    which in turn runs whatever reports the book has in it
+    which in turn runs whatever reports the book has in it,
+    with the filters applied by jobs processes, or by the number of the
+    settings if None
     """
 
     clr = CommandLineReport(
@@ -876,6 +889,7 @@ def cl_book(database, name, book, options_str_dict):
         ),
     )
     user = User()
+    user.jobs = jobs
     rptlist = []
     selected_style = StyleSheet()
     for item in book.get_item_list():
@@ -80,6 +80,16 @@ class TestArgParser(unittest.TestCase):
         ap = self.create_parser()
         assert not ap.auto_accept
 
+    def test_jobs_longopt_sets_jobs(self):
+        bad, ap = self.triggers_option_error("--jobs=4")
+        assert not bad, ap.errors
+        self.assertEqual(ap.jobs, 4)
+
+    def test_jobs_must_be_positive(self):
+        ap = self.create_parser("-j", "none", "-O", "family_tree_name")
+        self.assertEqual(len(ap.errors), 1)
+        self.assertIsNone(self.create_parser().jobs)
+
     def test_exception(self):
         argument_parser = self.create_parser("-O")
 
@@ -202,7 +202,14 @@ register("database.autobackup", 0)
 register("database.path", os.path.join(USER_DATA, "grampsdb"))
 register("database.host", "")
 register("database.port", "")
-
+register("database.cache-size", 10000)
+register("database.profile", "default")
+register("database.undo-delta", False)
+register("database.undo-size", 1000)
+register("database.filter-jobs", 1)
+
+register("export.compress-threads", 1)
+register("export.jobs", 1)
 register(
     "export.proxy-order",
     [["privacy", 0], ["living", 0], ["person", 0], ["note", 0], ["reference", 0]],
@@ -320,6 +320,7 @@ LONGOPTS = [
     "g-fatal-warnings",
     "help",
     "import=",
+    "jobs=",
     "load-modules=",
     "list" "name=",
     "oaf-activate-iid=",
@@ -344,7 +345,7 @@ LONGOPTS = [
     "quiet",
 ]
 
-SHORTOPTS = "O:U:P:C:i:e:f:a:p:d:c:r:lLthuv?syqSD:"
+SHORTOPTS = "O:U:P:C:i:e:f:a:p:j:d:c:r:lLthuv?syqSD:"
 
 GRAMPS_UUID = uuid.UUID("516cd010-5a41-470f-99f8-eb22f1098ad6")
 
@@ -71,3 +71,4 @@ from .exceptions import *
 from .undoredo import *
 from .utils import *
 from .generic import *
+from .graph import *
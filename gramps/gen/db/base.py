@@ -602,6 +602,275 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def get_citations_from_handles(self, handles):
+        """
+        Return a list of the Citation objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Citation does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Citation that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_events_from_handles(self, handles):
+        """
+        Return a list of the Event objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Event does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Event that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_families_from_handles(self, handles):
+        """
+        Return a list of the Family objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Family does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Family that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_media_from_handles(self, handles):
+        """
+        Return a list of the Media objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Media does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Media that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_notes_from_handles(self, handles):
+        """
+        Return a list of the Note objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Note does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Note that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_people_from_handles(self, handles):
+        """
+        Return a list of the Person objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Person does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Person that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_places_from_handles(self, handles):
+        """
+        Return a list of the Place objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Place does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Place that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_repositories_from_handles(self, handles):
+        """
+        Return a list of the Repository objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Repository does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Repository that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_sources_from_handles(self, handles):
+        """
+        Return a list of the Source objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Source does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Source that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_tags_from_handles(self, handles):
+        """
+        Return a list of the Tag objects in the database with the passed
+        handles, in the same order, reading them in bulk.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list of str
+
+        If any Tag does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) the list
+        holds 'None' for each Tag that is filtered out.
+        """
+        raise NotImplementedError
+
+    def prefetch_handles(self, obj_type, handles):
+        """
+        Read the objects of the given type with the given handles in bulk,
+        ahead of getting them one by one.  Databases without an object cache
+        do nothing.
+
+        :param obj_type: the class name of the objects, eg "Person".
+        :type obj_type: str
+        :param handles: handles of the objects to read.
+        :type handles: list of str
+        """
+
+    def select_handles(self, obj_type, conditions, order_by=None):
+        """
+        Return a list of the handles of the objects of the given type that
+        meet all the conditions, or None if the database cannot evaluate
+        them.
+
+        Fields declared by the get_index_fields method of the object class
+        are indexed, by their name or JSON path.
+
+        :param obj_type: the class name of the objects, eg "Person".
+        :type obj_type: str
+        :param conditions: (field, operator, value) tuples, as returned by
+            Rule.get_conditions.
+        :type conditions: list of tuple
+        :param order_by: field by which the handles are sorted.
+        :type order_by: str
+        """
+        return None
+
+    def search_text(self, query, obj_types=None):
+        """
+        Return a list of (class name, handle) tuples of the objects with text
+        data, as searched by matches_string, that may contain the query, or
+        None if the database has no full-text index able to answer it.
+
+        The result may include objects that don't match, but never leaves
+        out one that does, so callers confirm the matches.  Citations,
+        notes, people, places and sources are indexed.
+
+        :param query: the substring to search for, ignoring case.
+        :type query: str
+        :param obj_types: the class names of the objects to search, or None
+            for all the indexed objects.
+        :type obj_types: list of str
+        """
+        return None
+
+    def map_data(self, obj_type, function, context, workers, ordered=False):
+        """
+        Return an iterator over the results of function(db, context, rows)
+        for the objects of the given type, or None if the database cannot
+        call it in worker processes.
+
+        The rows are lists of (handle, data) tuples, in the order of the
+        cursor of the objects, or in handle order if ordered is True, with
+        the data as returned by the cursor.
+        The function is called in a pool of worker processes, each with
+        its own read-only connection to the database as db, and the results
+        are returned in the order of the rows.
+
+        :param obj_type: the class name of the objects, eg "Person".
+        :type obj_type: str
+        :param function: a module level function, called with a database,
+            the context and a list of rows.
+        :param context: a value passed to every call, which must be
+            picklable.
+        :param workers: the number of worker processes.
+        :type workers: int
+        :param ordered: whether the rows are sorted by handle.
+        :type ordered: bool
+        """
+        return None
+
+    def get_genealogy_graph(self):
+        """
+        Return a :py:class:`.GenealogyGraph` of the links between the people
+        and families of the database, kept current as they are committed,
+        or None if the database does not maintain one.
+
+        Ancestors and descendants can be walked through the graph without
+        reading the people and families.
+        """
+        return None
+
+    def get_sort_keys(self, obj_type, view, depends=()):
+        """
+        Return a dictionary of the sort keys stored for a view by
+        :meth:`set_sort_keys`, keyed by the handles of the objects, or None
+        if the database does not store sort keys.
+
+        Only the keys of objects that have not changed since their keys were
+        stored are returned, and none if an object of one of the dependency
+        types has changed.
+
+        :param obj_type: the class name of the objects, eg "Person".
+        :type obj_type: str
+        :param view: a name of the view, which changes with everything else
+            the keys depend on, such as the sort column and the locale.
+        :type view: str
+        :param depends: the class names of the other objects read to
+            compute the keys.
+        :type depends: tuple of str
+        """
+        return None
+
+    def set_sort_keys(self, obj_type, view, keys, depends=(), complete=False):
+        """
+        Store sort keys of a view, for :meth:`get_sort_keys`.  Databases
+        that do not store sort keys ignore them.
+
+        The keys of all the objects, with complete set to True, replace the
+        keys stored for the view if it is not valid any more.  Other keys
+        are ignored then, until the view is stored again in full.
+
+        :param obj_type: the class name of the objects, eg "Person".
+        :type obj_type: str
+        :param view: a name of the view, as given to get_sort_keys.
+        :type view: str
+        :param keys: (sort key, handle) tuples, with the keys as strings.
+        :type keys: list of tuple
+        :param depends: the class names of the other objects read to
+            compute the keys.
+        :type depends: tuple of str
+        :param complete: whether the keys are those of all the objects.
+        :type complete: bool
+        """
+
     def get_citation_handles(self, sort_handles=False, locale=glocale):
         """
         Return a list of database handles, one handle for each Citation in
@@ -988,6 +1257,76 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def get_raw_citation_data_many(self, handles):
+        """
+        Return a list of raw Citation objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
+    def get_raw_event_data_many(self, handles):
+        """
+        Return a list of raw Event objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
+    def get_raw_family_data_many(self, handles):
+        """
+        Return a list of raw Family objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
+    def get_raw_media_data_many(self, handles):
+        """
+        Return a list of raw Media objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
+    def get_raw_note_data_many(self, handles):
+        """
+        Return a list of raw Note objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
+    def get_raw_person_data_many(self, handles):
+        """
+        Return a list of raw Person objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
+    def get_raw_place_data_many(self, handles):
+        """
+        Return a list of raw Place objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
+    def get_raw_repository_data_many(self, handles):
+        """
+        Return a list of raw Repository objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
+    def get_raw_source_data_many(self, handles):
+        """
+        Return a list of raw Source objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
+    def get_raw_tag_data_many(self, handles):
+        """
+        Return a list of raw Tag objects from handles, in the same order,
+        reading them in bulk.  The list holds None for each missing handle.
+        """
+        raise NotImplementedError
+
     def get_researcher(self):
         """
         Return the Researcher instance, providing information about the owner
@@ -1650,21 +1989,30 @@ class DbWriteBase(DbReadBase):
         """
         raise NotImplementedError
 
+    def commit_many(self, objs, obj_key, transaction, change_time=None):
+        """
+        Commit several primary objects of the type given by obj_key to the
+        database, storing the changes as part of the transaction.
+        """
+        raise NotImplementedError
+
     def get_undodb(self):
         """
         Return the database that keeps track of Undo/Redo operations.
         """
         raise NotImplementedError
 
-    def rebuild_secondary(self, callback):
+    def rebuild_secondary(self, callback, workers=1):
         """
-        Rebuild secondary indices
+        Rebuild secondary indices, using the given number of worker
+        processes where the backend supports it.
         """
         raise NotImplementedError
 
-    def reindex_reference_map(self, callback):
+    def reindex_reference_map(self, callback, workers=1):
         """
-        Reindex all primary records in the database.
+        Reindex all primary records in the database, using the given number
+        of worker processes where the backend supports it.
         """
         raise NotImplementedError
 
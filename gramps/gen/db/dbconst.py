@@ -46,6 +46,7 @@ __all__ = (
     "SCHVERSFN",
     "PCKVERSFN",
     "DBBACKEND",
+    "DBPROFILEFN",
     "PERSON_KEY",
     "FAMILY_KEY",
     "SOURCE_KEY",
@@ -71,6 +72,7 @@ DBLOCKFN = "lock"  # File name of lock file
 DBRECOVFN = "need_recover"  # File name of recovery file
 BDBVERSFN = "bdbversion.txt"  # File name of Berkeley DB version file
 DBBACKEND = "database.txt"  # File name of Database backend file
+DBPROFILEFN = "profile.txt"  # File name of Database tuning profile file
 SCHVERSFN = "schemaversion.txt"  # File name of schema version file
 PCKVERSFN = "pickleupgrade.txt"  # Indicator that pickle has been upgrade t Python3
 DBLOGNAME = ".Db"  # Name of logger
@@ -83,6 +85,8 @@ DBLOCKS = 100000  # Maximum number of locks supported
 DBOBJECTS = 100000  # Maximum number of simultaneously locked objects
 DBUNDO = 1000  # Maximum size of undo buffer
 ARRAYSIZE = 1000  # The arraysize for a SQL cursor
+BATCHSIZE = 1000  # Number of commits buffered by a batch transaction
+CHUNKSIZE = 500  # Number of handles in one SQL "IN" clause
 
 PERSON_KEY = 0
 FAMILY_KEY = 1
@@ -35,6 +35,8 @@ import os
 import pickle
 import random
 import re
+import sqlite3
+import threading
 import time
 from pathlib import Path
 
@@ -43,6 +45,7 @@ from pathlib import Path
 # Gramps modules
 #
 # ------------------------------------------------------------------------
+from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 from ..errors import HandleError
 from ..lib import (
@@ -64,14 +67,17 @@ from ..lib.researcher import Researcher
 from ..updatecallback import UpdateCallback
 from ..utils.callback import Callback
 from ..utils.id import create_id
+from ..utils.lru import LRU
 from . import (
     CITATION_KEY,
+    CLASS_TO_KEY_MAP,
     DBLOGNAME,
     DBMODE_R,
     DBMODE_W,
     DBUNDOFN,
     EVENT_KEY,
     FAMILY_KEY,
+    KEY_TO_CLASS_MAP,
     KEY_TO_NAME_MAP,
     MEDIA_KEY,
     NOTE_KEY,
@@ -90,6 +96,7 @@ from . import (
 )
 from .bookmarks import DbBookmarks
 from .exceptions import DbUpgradeRequiredError, DbVersionError
+from .graph import GenealogyGraph
 from .utils import clear_lock_file, write_lock_file
 
 _ = glocale.translation.gettext
@@ -119,50 +126,154 @@ SIGBASE = (
 class DbGenericUndo(DbUndo):
     """
     Generic undo/redo handler
+
+    The undo records are kept in an SQLite file of the tree directory, or in
+    memory for a tree without a directory.  The oldest transactions are
+    dropped when there are more than "database.undo-size" of them, unless it
+    is 0.  If "database.undo-delta" is set, only the changed top-level
+    properties of the old data of an update are stored.
     """
 
     def __init__(self, grampsdb, path):
         super().__init__(grampsdb)
-        self.undodb = []
+        self.path = path
+        self.undodb = {}
+        self.connection = None
+        self.count = 0
+        self.max_size = config.get("database.undo-size")
+        self.delta = config.get("database.undo-delta")
 
     def open(self, value=None):
         """
-        Open the backing storage.  Needs to be overridden in the derived
-        class.
+        Open the backing storage, discarding the records of a previous
+        session.
         """
+        if self.path is None:
+            return
+        self.connection = sqlite3.connect(self.path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute("DROP TABLE IF EXISTS undo")
+        self.connection.execute(
+            "CREATE TABLE undo (recno INTEGER PRIMARY KEY, record BLOB)"
+        )
 
     def close(self):
         """
-        Close the backing storage.  Needs to be overridden in the derived
-        class.
+        Close the backing storage, and remove it.
+        """
+        self.undodb.clear()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Clear the undo/redo list and the backing storage.
         """
+        super().clear()
+        self.undodb.clear()
+        if self.connection is not None:
+            self.connection.execute("DELETE FROM undo")
 
     def append(self, value):
         """
-        Add a new entry on the end.  Needs to be overridden in the derived
-        class.
+        Add a new entry on the end, and return its record number.
         """
-        self.undodb.append(value)
+        recno = self.count
+        self[recno] = value
+        self.count += 1
+        return recno
 
     def __getitem__(self, index):
         """
-        Returns an entry by index number.  Needs to be overridden in the
-        derived class.
+        Returns an entry by index number.
         """
-        return self.undodb[index]
+        if self.connection is None:
+            return self.undodb[index]
+        row = self.connection.execute(
+            "SELECT record FROM undo WHERE recno = ?", [index]
+        ).fetchone()
+        if row is None:
+            raise IndexError(index)
+        return row[0]
 
     def __setitem__(self, index, value):
         """
-        Set an entry to a value.  Needs to be overridden in the derived class.
+        Set an entry to a value.
         """
-        self.undodb[index] = value
+        if self.connection is None:
+            self.undodb[index] = value
+        else:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO undo (recno, record) VALUES (?, ?)",
+                [index, value],
+            )
 
     def __len__(self):
         """
-        Returns the number of entries.  Needs to be overridden in the derived
-        class.
+        Returns the number of entries.
+        """
+        return self.count
+
+    def pack(self, record):
+        """
+        Return the value stored for an undo record.
+
+        With delta storage, the old data of an update is replaced by the
+        old values of the changed properties and the removed ones.
+        """
+        key, trans_type, handle, old_data, new_data = record
+        if self.delta and isinstance(old_data, dict) and isinstance(new_data, dict):
+            changed = {
+                name: value
+                for name, value in old_data.items()
+                if name not in new_data or new_data[name] != value
+            }
+            removed = [name for name in new_data if name not in old_data]
+            record = (key, trans_type, handle, (changed, removed), new_data, True)
+        return pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+
+    def unpack(self, value):
+        """
+        Return the undo record of a stored value.
+        """
+        record = pickle.loads(value)
+        if len(record) == 5:
+            return record
+        key, trans_type, handle, (changed, removed), new_data, _ = record
+        old_data = dict(new_data)
+        old_data.update(changed)
+        for name in removed:
+            del old_data[name]
+        return (key, trans_type, handle, old_data, new_data)
+
+    def commit(self, txn, msg):
+        """
+        Commit the transaction, and drop the oldest transactions beyond the
+        maximum size of the history.
+        """
+        super().commit(txn, msg)
+        while self.max_size and len(self.undoq) > self.max_size:
+            self._drop(self.undoq.popleft())
+
+    def _drop(self, txn):
+        """
+        Remove the records of a transaction from the backing storage.
         """
-        return len(self.undodb)
+        if txn.first is None or txn.last is None:
+            return
+        if self.connection is None:
+            for recno in txn.get_recnos():
+                self.undodb.pop(recno, None)
+        else:
+            self.connection.execute(
+                "DELETE FROM undo WHERE recno BETWEEN ? AND ?", [txn.first, txn.last]
+            )
 
     def _redo(self, update_history):
         """
@@ -181,13 +292,12 @@ class DbGenericUndo(DbUndo):
         try:
             self.db._txn_begin()
             for record_id in subitems:
-                (key, trans_type, handle, _, new_data) = pickle.loads(
-                    self.undodb[record_id]
-                )
+                key, trans_type, handle, _, new_data = self.unpack(self[record_id])
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(new_data, handle)
                 else:
+                    self.db.invalidate_cache(key, handle)
                     self.db.undo_data(new_data, handle, key)
                     sigs[key][trans_type].append(handle)
             # now emit the signals
@@ -230,13 +340,12 @@ class DbGenericUndo(DbUndo):
         try:
             self.db._txn_begin()
             for record_id in subitems:
-                (key, trans_type, handle, old_data, x) = pickle.loads(
-                    self.undodb[record_id]
-                )
+                key, trans_type, handle, old_data, x = self.unpack(self[record_id])
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(old_data, handle)
                 else:
+                    self.db.invalidate_cache(key, handle)
                     self.db.undo_data(old_data, handle, key)
                     sigs[key][trans_type].append(handle)
             # now emit the signals
@@ -614,6 +723,15 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.surname_list = []
         self.genderStats = GenderStats()  # can pass in loaded stats as dict
         self.owner = Researcher()
+        # Serialized objects, by primary key and handle:
+        self.cache_size = config.get("database.cache-size")
+        self._cache = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Links between people and families, built when first asked for
+        self._genealogy_graph = None
+        # Thread that loaded the database, which alone writes to it
+        self._main_thread = threading.get_ident()
         if directory:
             self.load(directory)
 
@@ -635,6 +753,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """
         raise NotImplementedError
 
+    def _create_indexes(self, rebuild=False):
+        """
+        Overload this method to create the indexes of the fields declared by
+        the get_index_fields method of the object classes, or recreate them
+        if rebuild is True.  Backends without such indexes do nothing.
+        """
+
     def __check_readonly(self, name):
         """
         Return True if we don't have read/write access to the database,
@@ -676,6 +801,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             mode = DBMODE_R
 
         self.readonly = mode == DBMODE_R
+        self._main_thread = threading.get_ident()
 
         if not self.readonly and directory != ":memory:":
             write_lock_file(directory)
@@ -735,7 +861,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
         self._set_save_path(directory)
 
-        if self._directory and self._directory != ":memory:":
+        if self._directory and self._directory != ":memory:" and not self.readonly:
             self.undolog = os.path.join(self._directory, DBUNDOFN)
         else:
             self.undolog = None
@@ -775,6 +901,9 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
                 self.close()
                 raise DbUpgradeRequiredError(dbversion, self.VERSION[0])
 
+        # Only a database of the current version is changed
+        self._create_indexes()
+
     def _create_undo_manager(self):
         """
         Create the undo manager.
@@ -855,8 +984,13 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             except IOError:
                 pass
 
+        if self.undodb is not None:
+            self.undodb.close()
         self.db_is_open = False
         self._directory = None
+        self.clear_cache()
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     def is_open(self):
         return self.db_is_open
@@ -1385,9 +1519,9 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             raise HandleError("Handle is None")
         if not handle:
             raise HandleError("Handle is empty")
-        data = self._get_raw_data(obj_key, handle)
-        if data:
-            return self.serializer.data_to_object(obj_class, data)
+        string = self._get_cached_string(obj_key, handle)
+        if string:
+            return self.serializer.string_to_object(obj_class, string)
 
         raise HandleError(f"Handle {handle} not found")
 
@@ -1421,6 +1555,56 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     def get_tag_from_handle(self, handle):
         return self._get_from_handle(TAG_KEY, Tag, handle)
 
+    ################################################################
+    #
+    # get_*_from_handles methods
+    #
+    ################################################################
+
+    def _get_from_handles(self, obj_key, obj_class, handles):
+        handles = list(handles)
+        for handle in handles:
+            if not handle:
+                raise HandleError("Handle is empty")
+        strings = self._get_cached_strings(obj_key, handles)
+        objects = []
+        for handle in handles:
+            string = strings.get(handle)
+            if not string:
+                raise HandleError(f"Handle {handle} not found")
+            objects.append(self.serializer.string_to_object(obj_class, string))
+        return objects
+
+    def get_events_from_handles(self, handles):
+        return self._get_from_handles(EVENT_KEY, Event, handles)
+
+    def get_families_from_handles(self, handles):
+        return self._get_from_handles(FAMILY_KEY, Family, handles)
+
+    def get_repositories_from_handles(self, handles):
+        return self._get_from_handles(REPOSITORY_KEY, Repository, handles)
+
+    def get_people_from_handles(self, handles):
+        return self._get_from_handles(PERSON_KEY, Person, handles)
+
+    def get_places_from_handles(self, handles):
+        return self._get_from_handles(PLACE_KEY, Place, handles)
+
+    def get_citations_from_handles(self, handles):
+        return self._get_from_handles(CITATION_KEY, Citation, handles)
+
+    def get_sources_from_handles(self, handles):
+        return self._get_from_handles(SOURCE_KEY, Source, handles)
+
+    def get_notes_from_handles(self, handles):
+        return self._get_from_handles(NOTE_KEY, Note, handles)
+
+    def get_media_from_handles(self, handles):
+        return self._get_from_handles(MEDIA_KEY, Media, handles)
+
+    def get_tags_from_handles(self, handles):
+        return self._get_from_handles(TAG_KEY, Tag, handles)
+
     ################################################################
     #
     # get_*_from_gramps_id methods
@@ -1779,6 +1963,16 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """
         Return raw (serialized) object from handle.
         """
+        string = self._get_cached_string(obj_key, handle)
+        if string:
+            return self.serializer.string_to_data(string)
+        return None
+
+    def _get_raw_string(self, obj_key, handle):
+        """
+        Return the serialized string of the object with the given handle
+        from the backend, or None if there is no such object.
+        """
         raise NotImplementedError
 
     def get_raw_person_data(self, handle):
@@ -1811,6 +2005,63 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     def get_raw_tag_data(self, handle):
         return self._get_raw_data(TAG_KEY, handle)
 
+    def _get_raw_data_many(self, obj_key, handles):
+        """
+        Return a list of raw (serialized) objects from handles, with None
+        for each missing handle.
+        """
+        handles = list(handles)
+        strings = self._get_cached_strings(obj_key, handles)
+        result = []
+        for handle in handles:
+            string = strings.get(handle)
+            result.append(self.serializer.string_to_data(string) if string else None)
+        return result
+
+    def _get_raw_strings(self, obj_key, handles):
+        """
+        Return a dictionary of the serialized strings of the objects with
+        the given handles from the backend, keyed by handle.  Missing
+        handles are left out.  Backends should override this to read the
+        objects in bulk.
+        """
+        strings = {}
+        for handle in handles:
+            string = self._get_raw_string(obj_key, handle)
+            if string:
+                strings[handle] = string
+        return strings
+
+    def get_raw_person_data_many(self, handles):
+        return self._get_raw_data_many(PERSON_KEY, handles)
+
+    def get_raw_family_data_many(self, handles):
+        return self._get_raw_data_many(FAMILY_KEY, handles)
+
+    def get_raw_source_data_many(self, handles):
+        return self._get_raw_data_many(SOURCE_KEY, handles)
+
+    def get_raw_citation_data_many(self, handles):
+        return self._get_raw_data_many(CITATION_KEY, handles)
+
+    def get_raw_event_data_many(self, handles):
+        return self._get_raw_data_many(EVENT_KEY, handles)
+
+    def get_raw_media_data_many(self, handles):
+        return self._get_raw_data_many(MEDIA_KEY, handles)
+
+    def get_raw_place_data_many(self, handles):
+        return self._get_raw_data_many(PLACE_KEY, handles)
+
+    def get_raw_repository_data_many(self, handles):
+        return self._get_raw_data_many(REPOSITORY_KEY, handles)
+
+    def get_raw_note_data_many(self, handles):
+        return self._get_raw_data_many(NOTE_KEY, handles)
+
+    def get_raw_tag_data_many(self, handles):
+        return self._get_raw_data_many(TAG_KEY, handles)
+
     ################################################################
     #
     # get_raw_*_from_id_data methods
@@ -2221,6 +2472,18 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             ]
         )
 
+    def commit_many(self, objs, obj_key, transaction, change_time=None):
+        """
+        Commit several primary objects of the type given by obj_key to the
+        database, storing the changes as part of the transaction.
+
+        In a batch transaction the backend may buffer the objects and write
+        them with bulk statements.
+        """
+        commit_func = self._get_table_func(KEY_TO_CLASS_MAP[obj_key], "commit_func")
+        for obj in objs:
+            commit_func(obj, transaction, change_time)
+
     def _after_commit(self, transaction):
         """
         Post-transaction commit processing
@@ -2563,7 +2826,151 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     def set_researcher(self, owner):
         self.owner.set_from(owner)
 
+    ################################################################
+    #
+    # Object cache
+    #
+    ################################################################
+
+    def _get_cached_string(self, obj_key, handle):
+        """
+        Return the serialized string of the object with the given handle,
+        from the cache if possible, or None if there is no such object.
+        """
+        cache = self._cache.get(obj_key)
+        if cache is None:
+            cache = self._cache[obj_key] = LRU(self.cache_size)
+        try:
+            string = cache[handle]
+        except KeyError:
+            pass
+        else:
+            self._cache_hits += 1
+            return string
+        self._cache_misses += 1
+        string = self._get_raw_string(obj_key, handle)
+        # Other threads may read older data, so they don't fill the cache
+        if string and threading.get_ident() == self._main_thread:
+            cache[handle] = string
+        return string
+
+    def _get_cached_strings(self, obj_key, handles):
+        """
+        Return a dictionary of the serialized strings of the objects with
+        the given handles, keyed by handle, taking those in the cache from
+        there and reading the others in bulk.  Missing handles are left out.
+        """
+        cache = self._cache.get(obj_key)
+        if cache is None:
+            cache = self._cache[obj_key] = LRU(self.cache_size)
+        strings = {}
+        missing = []
+        for handle in dict.fromkeys(handles):
+            try:
+                strings[handle] = cache[handle]
+            except KeyError:
+                missing.append(handle)
+        self._cache_hits += len(strings)
+        if missing:
+            self._cache_misses += len(missing)
+            found = self._get_raw_strings(obj_key, missing)
+            if threading.get_ident() == self._main_thread:
+                for handle, string in found.items():
+                    cache[handle] = string
+            strings.update(found)
+        return strings
+
+    def prefetch_handles(self, obj_type, handles):
+        """
+        Read the objects of the given type with the given handles into the
+        cache in bulk, so that getting them one by one afterwards does not
+        go to the backend.
+        """
+        self._get_cached_strings(CLASS_TO_KEY_MAP[obj_type], handles)
+
+    def invalidate_cache(self, obj_key, handle):
+        """
+        Remove the object with the given primary key and handle from the
+        cache.  Must be called before the object is written or removed.
+        """
+        cache = self._cache.get(obj_key)
+        if cache is not None and handle in cache:
+            del cache[handle]
+
+    def clear_cache(self):
+        """
+        Remove all objects from the cache.
+        """
+        self._cache = {}
+        self._genealogy_graph = None
+
+    def get_genealogy_graph(self):
+        """
+        Return a :py:class:`.GenealogyGraph` of the links between the people
+        and families of the database, kept current as they are committed.
+        The graph is built from the raw data when first asked for.
+        """
+        if self._genealogy_graph is None:
+            graph = GenealogyGraph()
+            for handle, data in self._iter_raw_person_data():
+                graph.set_person(
+                    handle, data["parent_family_list"], data["family_list"]
+                )
+            for handle, data in self._iter_raw_family_data():
+                graph.set_family(
+                    handle,
+                    data["father_handle"],
+                    data["mother_handle"],
+                    [
+                        (ref["ref"], ref["frel"]["value"], ref["mrel"]["value"])
+                        for ref in data["child_ref_list"]
+                    ],
+                )
+            self._genealogy_graph = graph
+        return self._genealogy_graph
+
+    def _update_genealogy_graph(self, obj):
+        """
+        Update the genealogy graph, if built, with a committed object.
+        """
+        graph = self._genealogy_graph
+        if graph is None:
+            return
+        if isinstance(obj, Person):
+            graph.set_person(obj.handle, obj.parent_family_list, obj.family_list)
+        elif isinstance(obj, Family):
+            graph.set_family(
+                obj.handle,
+                obj.father_handle,
+                obj.mother_handle,
+                [(ref.ref, ref.frel, ref.mrel) for ref in obj.child_ref_list],
+            )
+
+    def _remove_genealogy_graph(self, obj_key, handle):
+        """
+        Remove a removed object from the genealogy graph, if built.
+        """
+        graph = self._genealogy_graph
+        if graph is None:
+            return
+        if obj_key == PERSON_KEY:
+            graph.remove_person(handle)
+        elif obj_key == FAMILY_KEY:
+            graph.remove_family(handle)
+
+    def get_cache_stats(self):
+        """
+        Return a dictionary with the number of cache hits and misses since
+        the database was loaded, and the number of objects cached.
+        """
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": sum(len(cache.data) for cache in self._cache.values()),
+        }
+
     def request_rebuild(self):
+        self.clear_cache()
         self.emit("person-rebuild")
         self.emit("family-rebuild")
         self.emit("place-rebuild")
@@ -2605,9 +3012,11 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         return self.undodb
 
     def undo(self, update_history=True):
+        self.has_changed += 1
         return self.undodb.undo(update_history)
 
     def redo(self, update_history=True):
+        self.has_changed += 1
         return self.undodb.redo(update_history)
 
     def get_summary(self):
@@ -2735,6 +3144,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         """
         Set the serializer to 'blob' or 'json'
         """
+        self.clear_cache()
         if serializer_name == "blob":
             self.serializer = BlobSerializer
         elif serializer_name == "json":
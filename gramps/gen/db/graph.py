@@ -0,0 +1,240 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+In-memory index of the links between people and families.
+"""
+
+# ------------------------------------------------------------------------
+#
+# Python modules
+#
+# ------------------------------------------------------------------------
+from array import array
+
+__all__ = ("GenealogyGraph",)
+
+# Identifier of a missing father or mother
+NONE = -1
+
+
+# ------------------------------------------------------------------------
+#
+# GenealogyGraph
+#
+# ------------------------------------------------------------------------
+class GenealogyGraph:
+    """
+    The parent, child and spouse links between the people and families of
+    a database, as returned by DbReadBase.get_genealogy_graph.
+
+    People and families are numbered as they are first seen, and the links
+    are kept as arrays and tuples of these numbers, so that ancestors and
+    descendants can be walked without reading the objects.  The methods
+    take and return handles; links to objects that are not in the
+    database are kept, as they are in the objects.
+    """
+
+    def __init__(self):
+        self._person_ids = {}
+        self._person_handles = []
+        self._family_ids = {}
+        self._family_handles = []
+        # By person number: the numbers of the families of which the person
+        # is a child, and of which the person is a parent, in the order of
+        # the person's lists, or None if the person is not in the database
+        self._parent_families = []
+        self._families = []
+        # By family number: the numbers of the father, mother and children,
+        # and the (father, mother) relations of the children, or None for
+        # the children if the family is not in the database
+        self._fathers = array("l")
+        self._mothers = array("l")
+        self._children = []
+        self._relations = []
+
+    def _get_person_id(self, handle):
+        """
+        Return the number of a person, numbering the person if new.
+        """
+        person_id = self._person_ids.get(handle)
+        if person_id is None:
+            person_id = self._person_ids[handle] = len(self._person_handles)
+            self._person_handles.append(handle)
+            self._parent_families.append(None)
+            self._families.append(None)
+        return person_id
+
+    def _get_family_id(self, handle):
+        """
+        Return the number of a family, numbering the family if new.
+        """
+        family_id = self._family_ids.get(handle)
+        if family_id is None:
+            family_id = self._family_ids[handle] = len(self._family_handles)
+            self._family_handles.append(handle)
+            self._fathers.append(NONE)
+            self._mothers.append(NONE)
+            self._children.append(None)
+            self._relations.append(None)
+        return family_id
+
+    def _get_parent_id(self, handle):
+        """
+        Return the number of a father or mother, or NONE if there is none.
+        """
+        return self._get_person_id(handle) if handle else NONE
+
+    def set_person(self, handle, parent_family_handles, family_handles):
+        """
+        Set the links of a person, given the handles of the families of
+        which the person is a child, main family first, and of which the
+        person is a parent.
+        """
+        person_id = self._get_person_id(handle)
+        self._parent_families[person_id] = tuple(
+            self._get_family_id(family) for family in parent_family_handles
+        )
+        self._families[person_id] = tuple(
+            self._get_family_id(family) for family in family_handles
+        )
+
+    def set_family(self, handle, father_handle, mother_handle, child_refs):
+        """
+        Set the links of a family, given the handles of the parents, and
+        (handle, father relation, mother relation) tuples of the children,
+        with the relations as ChildRefType values.
+        """
+        family_id = self._get_family_id(handle)
+        self._fathers[family_id] = self._get_parent_id(father_handle)
+        self._mothers[family_id] = self._get_parent_id(mother_handle)
+        self._children[family_id] = tuple(
+            self._get_person_id(child) for child, _, _ in child_refs
+        )
+        self._relations[family_id] = tuple(
+            (int(frel), int(mrel)) for _, frel, mrel in child_refs
+        )
+
+    def remove_person(self, handle):
+        """
+        Remove the links of a person.
+        """
+        person_id = self._person_ids.get(handle)
+        if person_id is not None:
+            self._parent_families[person_id] = None
+            self._families[person_id] = None
+
+    def remove_family(self, handle):
+        """
+        Remove the links of a family.
+        """
+        family_id = self._family_ids.get(handle)
+        if family_id is not None:
+            self._fathers[family_id] = NONE
+            self._mothers[family_id] = NONE
+            self._children[family_id] = None
+            self._relations[family_id] = None
+
+    def has_person(self, handle):
+        """
+        Return True if the person is in the database.
+        """
+        person_id = self._person_ids.get(handle)
+        return person_id is not None and self._families[person_id] is not None
+
+    def has_family(self, handle):
+        """
+        Return True if the family is in the database.
+        """
+        family_id = self._family_ids.get(handle)
+        return family_id is not None and self._children[family_id] is not None
+
+    def get_parent_family_handles(self, handle):
+        """
+        Return the handles of the families of which the person is a child,
+        main family first.
+        """
+        person_id = self._person_ids.get(handle)
+        if person_id is None or self._parent_families[person_id] is None:
+            return []
+        return [
+            self._family_handles[family] for family in self._parent_families[person_id]
+        ]
+
+    def get_main_parents_family_handle(self, handle):
+        """
+        Return the handle of the main family of which the person is a
+        child, or None.
+        """
+        person_id = self._person_ids.get(handle)
+        if person_id is None or not self._parent_families[person_id]:
+            return None
+        return self._family_handles[self._parent_families[person_id][0]]
+
+    def get_family_handles(self, handle):
+        """
+        Return the handles of the families of which the person is a parent.
+        """
+        person_id = self._person_ids.get(handle)
+        if person_id is None or self._families[person_id] is None:
+            return []
+        return [self._family_handles[family] for family in self._families[person_id]]
+
+    def get_father_handle(self, handle):
+        """
+        Return the handle of the father of the family, or None.
+        """
+        family_id = self._family_ids.get(handle)
+        if family_id is None or self._fathers[family_id] == NONE:
+            return None
+        return self._person_handles[self._fathers[family_id]]
+
+    def get_mother_handle(self, handle):
+        """
+        Return the handle of the mother of the family, or None.
+        """
+        family_id = self._family_ids.get(handle)
+        if family_id is None or self._mothers[family_id] == NONE:
+            return None
+        return self._person_handles[self._mothers[family_id]]
+
+    def get_child_handles(self, handle):
+        """
+        Return the handles of the children of the family.
+        """
+        family_id = self._family_ids.get(handle)
+        if family_id is None or self._children[family_id] is None:
+            return []
+        return [self._person_handles[child] for child in self._children[family_id]]
+
+    def get_child_refs(self, handle):
+        """
+        Return (handle, father relation, mother relation) tuples of the
+        children of the family, with the relations as ChildRefType values.
+        """
+        family_id = self._family_ids.get(handle)
+        if family_id is None or self._children[family_id] is None:
+            return []
+        return [
+            (self._person_handles[child], frel, mrel)
+            for child, (frel, mrel) in zip(
+                self._children[family_id], self._relations[family_id]
+            )
+        ]
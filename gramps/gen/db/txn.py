@@ -31,7 +31,6 @@ database.
 import inspect
 import logging
 import os
-import pickle
 import time
 from collections import defaultdict
 
@@ -192,7 +191,7 @@ class DbTxn(defaultdict):
         data is the tuple returned by the object's serialize method.
         """
         self.last = self.commitdb.append(
-            pickle.dumps((obj_type, trans_type, handle, old_data, new_data), 1)
+            self.commitdb.pack((obj_type, trans_type, handle, old_data, new_data))
         )
         if self.last is None:
             self.last = len(self.commitdb) - 1
@@ -221,7 +220,7 @@ class DbTxn(defaultdict):
         for the PrimaryObject, and a tuple representing the data created by
         the object's serialize method.
         """
-        return pickle.loads(self.commitdb[recno])
+        return self.commitdb.unpack(self.commitdb[recno])
 
     def __len__(self):
         """
@@ -26,6 +26,7 @@ Base class for undo/redo functionality.
 # Python modules
 #
 # -------------------------------------------------------------------------
+import pickle
 import time
 from abc import ABCMeta, abstractmethod
 from collections import deque
@@ -117,6 +118,19 @@ class DbUndo(metaclass=ABCMeta):
         class.
         """
 
+    def pack(self, record):
+        """
+        Return the value stored for an undo record, a tuple of the object
+        type, the transaction type, the handle, the old data and the new data.
+        """
+        return pickle.dumps(record, 1)
+
+    def unpack(self, value):
+        """
+        Return the undo record of a stored value.
+        """
+        return pickle.loads(value)
+
     @abstractmethod
     def _redo(self, update_history):
         """ """
@@ -43,12 +43,18 @@ from ..const import PLUGINS_DIR, USER_PLUGINS
 from ..constfunc import get_env_var, win
 from ..lib import NameOriginType
 from ..plug import BasePluginManager
-from .dbconst import DBBACKEND, DBLOCKFN, DBLOGNAME
+from .dbconst import DBBACKEND, DBLOCKFN, DBLOGNAME, DBPROFILEFN
 
 _ = glocale.translation.gettext
 
 _LOG = logging.getLogger(DBLOGNAME)
 
+# Tuning profiles of the database backends, with their display names
+DB_PROFILES = {
+    "default": _("Default"),
+    "performance": _("Performance"),
+}
+
 
 def make_database(plugin_id):
     """
@@ -141,6 +147,34 @@ def get_dbid_from_path(dirpath):
     return dbid
 
 
+def get_profile_from_path(dirpath):
+    """
+    Return the tuning profile of a database from a directory path.
+
+    Trees without a profile of their own use the "database.profile" setting.
+    """
+    profile = config.get("database.profile")
+    profile_path = os.path.join(dirpath, DBPROFILEFN)
+    if os.path.isfile(profile_path):
+        with open(profile_path, encoding="utf8") as file:
+            profile = file.read().strip()
+    if profile not in DB_PROFILES:
+        _LOG.warning("Unknown database profile '%s'", profile)
+        profile = "default"
+    return profile
+
+
+def set_profile_for_path(dirpath, profile):
+    """
+    Set the tuning profile of a database from a directory path.
+
+    The profile is used the next time the database is opened.
+    """
+    profile_path = os.path.join(dirpath, DBPROFILEFN)
+    with open(profile_path, "w", encoding="utf8") as file:
+        file.write(profile)
+
+
 def import_as_dict(filename, user, skp_imp_adds=True):
     """
     Import the filename into a InMemoryDB and return it.
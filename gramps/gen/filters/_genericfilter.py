@@ -24,11 +24,20 @@
 Package providing filtering framework for Gramps.
 """
 
+# ------------------------------------------------------------------------
+#
+# Python modules
+#
+# ------------------------------------------------------------------------
+import logging
+
 # ------------------------------------------------------------------------
 #
 # Gramps imports
 #
 # ------------------------------------------------------------------------
+from ..config import config
+from ..db.dbconst import CHUNKSIZE
 from ..lib.person import Person
 from ..lib.family import Family
 from ..lib.src import Source
@@ -44,6 +53,36 @@ from ..const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
 
+LOG = logging.getLogger(".filter")
+
+# Objects tested between two measures of all the rules of a filter
+MEASURE_INTERVAL = 16
+# Measures between two orderings of the rules of a filter, once they are
+# ordered after 1, 2, 4... measures
+REORDER_INTERVAL = 64
+
+
+def _check_rows(db, filt, rows):
+    """
+    Return the number of rows, and the handles of the rows of raw data
+    matching a filter, in a process applying the filter to a database.
+    """
+    for rule in filt.flist:
+        if hasattr(rule, "db"):
+            rule.db = db
+    test = filt.get_test_func()
+    return len(rows), [
+        handle for handle, data in rows if test(db, from_dict(data)) != filt.invert
+    ]
+
+
+def _divide(cost, fraction):
+    """
+    Return the cost of a rule divided by the fraction of the objects it
+    decides the result of a filter for.
+    """
+    return cost / fraction if fraction else float("inf")
+
 
 # -------------------------------------------------------------------------
 #
@@ -70,6 +109,9 @@ class GenericFilter:
             self.comment = ""
             self.logical_op = "and"
             self.invert = False
+        # The rules in the order "and" and "or" filters apply them
+        self.rule_order = self.flist
+        self.__tested = 0
 
     def match(self, handle, db):
         """
@@ -114,12 +156,15 @@ class GenericFilter:
 
     def add_rule(self, rule):
         self.flist.append(rule)
+        self.rule_order = self.flist
 
     def delete_rule(self, rule):
         self.flist.remove(rule)
+        self.rule_order = self.flist
 
     def set_rules(self, rules):
         self.flist = rules
+        self.rule_order = self.flist
 
     def get_rules(self):
         return self.flist
@@ -136,11 +181,93 @@ class GenericFilter:
     def find_from_handle(self, db, handle):
         return db.get_person_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_people_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_people()
 
+    def iter_id_list(self, db, id_list, tupleind=None):
+        """
+        Return an iterator over the items of id_list and their objects,
+        reading the objects in bulk, one chunk at a time.
+        """
+        id_list = list(id_list)
+        for start in range(0, len(id_list), CHUNKSIZE):
+            chunk = id_list[start : start + CHUNKSIZE]
+            if tupleind is None:
+                handles = chunk
+            else:
+                handles = [data[tupleind] for data in chunk]
+            yield from zip(chunk, self.find_from_handles(db, handles))
+
+    def order_rules(self):
+        """
+        Order the rules of an "and" or "or" filter so that the rules most
+        likely to decide the result at the lowest cost are applied first,
+        from the estimated or measured cost and selectivity of the rules.
+        """
+        if self.logical_op == "and":
+            # Rules that often fail, cheaply
+            def key(rule):
+                return _divide(rule.get_cost(), 1 - rule.get_selectivity())
+
+        elif self.logical_op == "or":
+            # Rules that often match, cheaply
+            def key(rule):
+                return _divide(rule.get_cost(), rule.get_selectivity())
+
+        else:
+            self.rule_order = self.flist
+            return
+        self.rule_order = sorted(self.flist, key=key)
+
+    def measure_test(self, task, rules=None):
+        """
+        Return a function testing an object with task, except for one object
+        in MEASURE_INTERVAL, to which all the rules, or the given rules, are
+        applied and measured, ordering the rules again from time to time.
+        """
+        if rules is None:
+            rules = self.flist
+        combine = {
+            "or": any,
+            "xor": lambda results: sum(map(bool, results)) % 2 == 1,
+            "one": lambda results: sum(map(bool, results)) == 1,
+        }.get(self.logical_op, all)
+
+        def test(db, obj):
+            self.__tested += 1
+            if self.__tested % MEASURE_INTERVAL:
+                return task(db, obj)
+            results = [rule.measure_apply(db, obj) for rule in rules]
+            measures = self.__tested // MEASURE_INTERVAL
+            if measures & (measures - 1) == 0 or measures % REORDER_INTERVAL == 0:
+                self.order_rules()
+            return combine(results)
+
+        return test
+
+    def get_rule_stats(self):
+        """
+        Return a list of (rule, measures, selectivity, seconds) tuples, in the
+        order the rules are applied, with the number of measured applies of
+        each rule, the fraction of them that matched, and their average
+        time.
+        """
+        return [
+            (
+                rule,
+                rule.apply_count,
+                rule.apply_matches / rule.apply_count if rule.apply_count else 0.0,
+                rule.apply_time / rule.apply_count if rule.apply_count else 0.0,
+            )
+            for rule in self.rule_order
+        ]
+
     def check_func(self, db, id_list, task, user=None, tupleind=None, tree=False):
         final_list = []
+        task = self.measure_test(task)
         if user:
             user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
         if id_list is None:
@@ -152,12 +279,7 @@ class GenericFilter:
                     if task(db, person) != self.invert:
                         final_list.append(handle)
         else:
-            for data in id_list:
-                if tupleind is None:
-                    handle = data
-                else:
-                    handle = data[tupleind]
-                person = self.find_from_handle(db, handle)
+            for data, person in self.iter_id_list(db, id_list, tupleind):
                 if user:
                     user.step_progress()
                 if task(db, person) != self.invert:
@@ -166,30 +288,76 @@ class GenericFilter:
             user.end_progress()
         return final_list
 
+    def select_handles(self, db):
+        """
+        Return the handles of the objects meeting the conditions of the rules
+        that the database can evaluate, and a list of the other rules, or
+        None if the database cannot evaluate any rule.
+        """
+        conditions = []
+        flist = []
+        for rule in self.flist:
+            rule_conditions = rule.get_conditions()
+            if rule_conditions is None:
+                flist.append(rule)
+            else:
+                conditions.extend(rule_conditions)
+        if len(flist) == len(self.flist):
+            return None
+        obj_type = self.make_obj().__class__.__name__
+        handles = db.select_handles(obj_type, conditions)
+        if handles is None:
+            return None
+        return handles, flist
+
     def check_and(self, db, id_list, user=None, tupleind=None, tree=False):
         final_list = []
-        flist = self.flist
+        task = self.measure_test(self.and_test)
+        # The database does not select the objects in the order of the tree
+        selected = self.select_handles(db) if id_list is None and not tree else None
         if user:
-            user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
-        if id_list is None:
+            number = self.get_number(db) if selected is None else len(selected[0])
+            user.begin_progress(_("Filter"), _("Applying ..."), number)
+        if selected is not None:
+            # Only the objects selected by the database are read
+            handles, rules = selected
+            flist = [rule for rule in self.rule_order if rule in rules]
+            if flist:
+                task = self.measure_test(
+                    lambda db, obj: all(rule.apply(db, obj) for rule in flist), flist
+                )
+                final_list = []
+                for handle, obj in self.iter_id_list(db, handles):
+                    if user:
+                        user.step_progress()
+                    if task(db, obj):
+                        final_list.append(handle)
+                handles = final_list
+            elif user:
+                for _dummy in handles:
+                    user.step_progress()
+            if self.invert:
+                obj_type = self.make_obj().__class__.__name__
+                matched = set(handles)
+                handles = [
+                    handle
+                    for handle in db.method("iter_%s_handles", obj_type)()
+                    if handle not in matched
+                ]
+            final_list = handles
+        elif id_list is None:
             with self.get_tree_cursor(db) if tree else self.get_cursor(db) as cursor:
                 for handle, data in cursor:
                     person = from_dict(data)
                     if user:
                         user.step_progress()
-                    val = all(rule.apply(db, person) for rule in flist)
-                    if val != self.invert:
+                    if task(db, person) != self.invert:
                         final_list.append(handle)
         else:
-            for data in id_list:
-                if tupleind is None:
-                    handle = data
-                else:
-                    handle = data[tupleind]
-                person = self.find_from_handle(db, handle)
+            for data, person in self.iter_id_list(db, id_list, tupleind):
                 if user:
                     user.step_progress()
-                val = all(rule.apply(db, person) for rule in flist if person)
+                val = task(db, person) if person else True
                 if val != self.invert:
                     final_list.append(data)
         if user:
@@ -221,7 +389,53 @@ class GenericFilter:
         return found_one
 
     def or_test(self, db, person):
-        return any(rule.apply(db, person) for rule in self.flist)
+        return any(rule.apply(db, person) for rule in self.rule_order)
+
+    def and_test(self, db, person):
+        return all(rule.apply(db, person) for rule in self.rule_order)
+
+    def get_test_func(self):
+        """
+        Return the function testing an object against all the rules.
+        """
+        return getattr(self, self.logical_op + "_test", self.and_test)
+
+    def is_parallel(self):
+        """
+        Return True if the rules can be applied in other processes, that is
+        if no rule, nor any rule they hold, declares otherwise.
+        """
+        for rule in self.flist:
+            if not rule.parallel:
+                return False
+            for value in vars(rule).values():
+                if isinstance(value, GenericFilter) and not value.is_parallel():
+                    return False
+                if getattr(value, "parallel", True) is False:
+                    return False
+        return True
+
+    def check_parallel(self, db, jobs, user=None):
+        """
+        Return the handles of all the objects matching the filter, applying
+        the prepared rules to chunks of objects in a pool of jobs processes,
+        or None if the database cannot.
+        """
+        obj_type = self.make_obj().__class__.__name__
+        results = db.map_data(obj_type, _check_rows, self, jobs)
+        if results is None:
+            return None
+        final_list = []
+        if user:
+            user.begin_progress(_("Filter"), _("Applying ..."), self.get_number(db))
+        for count, handles in results:
+            final_list.extend(handles)
+            if user:
+                for _dummy in range(count):
+                    user.step_progress()
+        if user:
+            user.end_progress()
+        return final_list
 
     def get_check_func(self):
         try:
@@ -233,7 +447,7 @@ class GenericFilter:
     def check(self, db, handle):
         return self.get_check_func()(db, [handle])
 
-    def apply(self, db, id_list=None, tupleind=None, user=None, tree=False):
+    def apply(self, db, id_list=None, tupleind=None, user=None, tree=False, jobs=None):
         """
         Apply the filter using db.
         If id_list given, the handles in id_list are used. If not given
@@ -245,15 +459,42 @@ class GenericFilter:
 
         user is optional. If present it must be an instance of a User class.
 
+        jobs is the number of processes applying the rules to all the entries,
+        that of the user, or else the "database.filter-jobs" setting, if None.
+        The rules are applied in this process if it is 1, or if the rules or
+        the database do not support it.
+
         :Returns: if id_list given, it is returned with the items that
                 do not match the filter, filtered out.
                 if id_list not given, all items in the database that
                 match the filter are returned as a list of handles
         """
         m = self.get_check_func()
+        if jobs is None:
+            jobs = getattr(user, "jobs", None) or config.get("database.filter-jobs")
         for rule in self.flist:
+            rule.reset_measures()
             rule.requestprepare(db, user)
-        res = m(db, id_list, user, tupleind, tree)
+        self.__tested = 0
+        self.order_rules()
+        res = None
+        if id_list is None and not tree and jobs > 1 and self.is_parallel():
+            # The database selecting objects is faster still
+            if self.logical_op != "and" or all(
+                rule.get_conditions() is None for rule in self.flist
+            ):
+                res = self.check_parallel(db, jobs, user)
+        if res is None:
+            res = m(db, id_list, user, tupleind, tree)
+            if LOG.isEnabledFor(logging.DEBUG):
+                for rule, measures, selectivity, seconds in self.get_rule_stats():
+                    LOG.debug(
+                        "%s: %d measures, %.0f%% matched, %.1f us per object",
+                        rule.name,
+                        measures,
+                        100 * selectivity,
+                        seconds * 1e6,
+                    )
         for rule in self.flist:
             rule.requestreset()
         return res
@@ -272,6 +513,9 @@ class GenericFamilyFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_family_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_families_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_families()
 
@@ -289,6 +533,9 @@ class GenericEventFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_event_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_events_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_events()
 
@@ -306,6 +553,9 @@ class GenericSourceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_source_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_sources_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_sources()
 
@@ -326,6 +576,9 @@ class GenericCitationFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_citation_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_citations_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_citations()
 
@@ -346,6 +599,9 @@ class GenericPlaceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_place_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_places_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_places()
 
@@ -363,6 +619,9 @@ class GenericMediaFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_media_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_media_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_media()
 
@@ -380,6 +639,9 @@ class GenericRepoFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_repository_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_repositories_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_repositories()
 
@@ -397,6 +659,9 @@ class GenericNoteFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_note_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_notes_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_notes()
 
@@ -67,7 +67,7 @@ _Everything                  Match every object in the database
 
 # Need to expose this to be available for filter plugins:
 # the plugins should say: from .. import Rule
-from ._rule import Rule
+from ._rule import Rule, clear_prepare_cache, get_prepare_stats
 
 from ._everything import Everything
 from ._hasgrampsid import HasGrampsId
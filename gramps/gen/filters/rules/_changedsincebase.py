@@ -112,3 +112,13 @@ class ChangedSinceBase(Rule):
         if self.before:
             return obj_time < self.before
         return False
+
+    def get_conditions(self):
+        if not self.since and not self.before:
+            return None
+        conditions = []
+        if self.since:
+            conditions.append(("change", ">=", self.since))
+        if self.before:
+            conditions.append(("change", "<", self.before))
+        return conditions
@@ -55,3 +55,9 @@ class HasGrampsId(Rule):
         return true if the rule passes, false otherwise.
         """
         return obj.gramps_id == self.list[0]
+
+    def get_conditions(self):
+        if self.apply.__func__ is not HasGrampsId.apply:
+            # Subclasses matching the ID of another object
+            return None
+        return [("gramps_id", "=", self.list[0])]
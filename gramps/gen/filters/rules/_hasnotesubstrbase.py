@@ -46,9 +46,21 @@ class HasNoteSubstrBase(Rule):
     description = "Matches objects whose notes contain text matching a " "substring"
     category = _("General filters")
 
+    def prepare(self, db, user):
+        # Notes found by the full-text index, or None to search them all
+        self.note_handles = None
+        matches = db.search_text(self.list[0], ["Note"])
+        if matches is not None:
+            self.note_handles = {handle for _, handle in matches}
+
+    def reset(self):
+        self.note_handles = None
+
     def apply(self, db, person):
         notelist = person.get_note_list()
         for notehandle in notelist:
+            if self.note_handles is not None and notehandle not in self.note_handles:
+                continue
             note = db.get_note_from_handle(notehandle)
             n = note.get()
             if n.upper().find(self.list[0].upper()) != -1:
@@ -69,3 +69,8 @@ class HasTagBase(Rule):
         if self.tag_handle is None:
             return False
         return self.tag_handle in obj.get_tag_list()
+
+    def get_conditions(self):
+        if self.tag_handle is None:
+            return None
+        return [("$.tag_list", "CONTAINS", self.tag_handle)]
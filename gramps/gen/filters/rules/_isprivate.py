@@ -45,3 +45,6 @@ class IsPrivate(Rule):
 
     def apply(self, db, obj):
         return obj.get_privacy()
+
+    def get_conditions(self):
+        return [("private", "=", True)]
@@ -42,3 +42,6 @@ class IsPublic(Rule):
 
     def apply(self, db, obj):
         return not obj.get_privacy()
+
+    def get_conditions(self):
+        return [("private", "=", False)]
@@ -59,6 +59,8 @@ class MatchesFilterBase(Rule):
     name = "Objects matching the <filter>"
     description = "Matches objects matched by the specified filter name"
     category = _("General filters")
+    # The custom filters are not loaded in other processes
+    parallel = False
 
     def prepare(self, db, user):
         if gramps.gen.filters.CustomFilters:
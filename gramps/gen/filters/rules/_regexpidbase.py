@@ -58,3 +58,9 @@ class RegExpIdBase(Rule):
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def get_conditions(self):
+        if self.apply.__func__ is not RegExpIdBase.apply:
+            # Subclasses matching the ID of another object
+            return None
+        return self.get_regex_condition("gramps_id", 0)
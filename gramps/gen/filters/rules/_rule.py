@@ -29,6 +29,8 @@ Base class for filter rules.
 #
 # -------------------------------------------------------------------------
 import re
+import time
+import weakref
 
 from ...errors import FilterError
 from ...const import GRAMPS_LOCALE as glocale
@@ -44,6 +46,47 @@ import logging
 
 LOG = logging.getLogger(".")
 
+# Results of the prepare method of rules that declare them, by database,
+# with the state of the database they were prepared for
+_PREPARED = weakref.WeakKeyDictionary()
+# Number of prepares, number of reused results and seconds spent in
+# prepare, by rule class name
+_PREPARE_STATS = {}
+# Estimated seconds of an apply with a cost of 1
+COST_UNIT = 1e-6
+# Number of measured applies from which their average time and matches are
+# used instead of the estimates
+MIN_MEASURES = 8
+
+
+def get_prepare_stats():
+    """
+    Return a dictionary of (prepares, reuses, seconds) tuples, by rule class
+    name, with the number of times the rules were prepared, the number of
+    times prepared results were reused instead, and the time spent in the
+    prepare method.
+    """
+    return {name: tuple(stats) for name, stats in _PREPARE_STATS.items()}
+
+
+def clear_prepare_cache():
+    """
+    Forget the prepared results of rules, and the prepare statistics.
+    """
+    _PREPARED.clear()
+    _PREPARE_STATS.clear()
+
+
+def _get_db_state(db):
+    """
+    Return a value that changes with the contents of a database, or None if
+    the database does not count its changes, or is in a transaction.
+    """
+    changes = getattr(db, "has_changed", None)
+    if not isinstance(changes, int) or getattr(db, "transaction", None):
+        return None
+    return (db.get_dbid(), changes)
+
 
 # -------------------------------------------------------------------------
 #
@@ -58,6 +101,24 @@ class Rule:
     category = _("Miscellaneous filters")
     description = _("No description")
     allow_regex = False
+    # Names of the attributes holding the results of the prepare method, if
+    # they only depend on the values of the rule and on the database.  The
+    # results are then shared by rules with the same values until the
+    # database changes, so the reset method must not modify them in place.
+    prepare_cache = ()
+    # Whether the rule can be applied in another process, to a copy of the
+    # prepared rule and to a read-only connection to the same database.
+    # Rules that depend on other filters, or on state that is not in the
+    # database, must set it to False.
+    parallel = True
+    # Estimated cost of apply, in units of the time taken to test a value of
+    # the object, used to order the rules of a filter until it is measured.
+    # Rules reading other objects or computing over them set a higher cost.
+    cost = 1
+    # Number of measured applies, how many matched, and the seconds they took
+    apply_count = 0
+    apply_matches = 0
+    apply_time = 0.0
 
     def __init__(self, arg, use_regex=False, use_case=False):
         self.list = []
@@ -67,6 +128,28 @@ class Rule:
         self.use_regex = use_regex
         self.use_case = use_case
         self.nrprepare = 0
+        # Seconds spent in the last prepare, and whether its results were
+        # reused from another rule
+        self.prepare_time = 0.0
+        self.prepare_reused = False
+
+    def __getstate__(self):
+        """
+        Return the state of the rule to pickle, without the database, which
+        is set again by the process applying the rule.
+        """
+        state = self.__dict__.copy()
+        del state["match_substring"]
+        if "db" in state:
+            state["db"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.use_regex and self.regex:
+            self.match_substring = self.match_regex
+        else:
+            self.match_substring = self.__match_substring
 
     def is_empty(self):
         return False
@@ -95,7 +178,7 @@ class Rule:
                         except re.error:
                             self.regex[index] = re.compile("")
                 self.match_substring = self.match_regex
-            self.prepare(db, user)
+            self.__prepare(db, user)
         self.nrprepare += 1
         if self.nrprepare > 20:  # more references to a filter than expected
             raise FilterError(
@@ -106,6 +189,44 @@ class Rule:
                 ),
             )
 
+    def __prepare(self, db, user):
+        """
+        Call prepare, or reuse the results of a rule of the same class with
+        the same values prepared for the same state of the database.
+        """
+        stats = _PREPARE_STATS.setdefault(self.__class__.__name__, [0, 0, 0.0])
+        key = state = None
+        if self.prepare_cache:
+            state = _get_db_state(db)
+        if state is not None:
+            key = (
+                self.__class__,
+                tuple(self.list),
+                self.use_regex,
+                self.use_case,
+            )
+            prepared = _PREPARED.get(db)
+            if prepared is None or prepared[0] != state:
+                prepared = _PREPARED[db] = (state, {})
+            results = prepared[1].get(key)
+            if results is not None:
+                for name, value in results.items():
+                    setattr(self, name, value)
+                self.prepare_time = 0.0
+                self.prepare_reused = True
+                stats[1] += 1
+                return
+        start = time.perf_counter()
+        self.prepare(db, user)
+        self.prepare_time = time.perf_counter() - start
+        self.prepare_reused = False
+        stats[0] += 1
+        stats[2] += self.prepare_time
+        if key is not None and _get_db_state(db) == state:
+            prepared[1][key] = {
+                name: getattr(self, name) for name in self.prepare_cache
+            }
+
     def prepare(self, db, user):
         """prepare so the rule can be executed efficiently"""
         pass
@@ -154,6 +275,76 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def measure_apply(self, db, obj):
+        """
+        Apply the rule, adding the time it took and whether it matched to
+        the measures of the rule.
+        """
+        start = time.perf_counter()
+        result = self.apply(db, obj)
+        self.apply_time += time.perf_counter() - start
+        self.apply_count += 1
+        if result:
+            self.apply_matches += 1
+        return result
+
+    def reset_measures(self):
+        """
+        Forget the measured applies of the rule.
+        """
+        self.apply_count = 0
+        self.apply_matches = 0
+        self.apply_time = 0.0
+
+    def get_cost(self):
+        """
+        Return the estimated seconds of an apply: the measured average once
+        there are enough measures, or else the cost hint of the rule.
+        """
+        if self.apply_count >= MIN_MEASURES:
+            return self.apply_time / self.apply_count
+        return self.cost * COST_UNIT
+
+    def get_selectivity(self):
+        """
+        Return the estimated fraction of the objects that match the rule:
+        the measured fraction once there are enough measures, or else 0.5.
+        """
+        if self.apply_count >= MIN_MEASURES:
+            return self.apply_matches / self.apply_count
+        return 0.5
+
+    def get_conditions(self):
+        """
+        Return a list of the conditions that an object must all meet to
+        match the rule, so that the database can select the matching objects
+        without apply, or None if only apply can evaluate the rule.
+
+        Each condition is a tuple (field, operator, value).  The field is the
+        name of a secondary column, or a JSON path such as "$.tag_list".  The
+        operator is one of "=", "!=", "<", "<=", ">", ">=", "REGEXP", or
+        "CONTAINS" for a value in a JSON array.
+
+        Called after prepare.
+        """
+        return None
+
+    def get_regex_condition(self, field, param_index):
+        """
+        Return a list with the condition that field matches the filter
+        element indicated by param_index, as match_substring does.
+        """
+        if not self.list[param_index]:
+            return []
+        if self.use_regex:
+            regex = self.regex[param_index]
+            pattern = regex.pattern
+            if regex.flags & re.I:
+                pattern = "(?i)" + pattern
+        else:
+            pattern = "(?i)" + re.escape(self.list[param_index])
+        return [(field, "REGEXP", pattern)]
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = (
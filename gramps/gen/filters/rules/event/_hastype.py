@@ -68,3 +68,11 @@ class HasType(Rule):
         if self.event_type:
             return obj.get_type() == self.event_type
         return False
+
+    def get_conditions(self):
+        if not self.event_type:
+            return None
+        conditions = [("$.type.value", "=", self.event_type.value)]
+        if self.event_type.is_custom():
+            conditions.append(("$.type.string", "=", self.event_type.string))
+        return conditions
@@ -48,6 +48,7 @@ class IsAncestorOf(Rule):
     name = _("Ancestor families of <family>")
     category = _("General filters")
     description = _("Matches ancestor families of the specified family")
+    prepare_cache = ("map",)
 
     def prepare(self, db, user):
         self.map = set()
@@ -56,7 +57,7 @@ class IsAncestorOf(Rule):
         self.init_list(db, root_family, first)
 
     def reset(self):
-        self.map.clear()
+        self.map = set()
 
     def apply(self, db, family):
         return family.handle in self.map
@@ -76,6 +76,21 @@ def get_person_family_people(db, person, person_handle):
     return people
 
 
+def get_graph_family_people(graph, person_handle):
+    """Return the handles of the parents, children, siblings and spouses of
+    a person, as found in the genealogy graph of the database."""
+    people = set()
+    for family_handle in graph.get_family_handles(
+        person_handle
+    ) + graph.get_parent_family_handles(person_handle):
+        people.add(graph.get_father_handle(family_handle))
+        people.add(graph.get_mother_handle(family_handle))
+        people.update(graph.get_child_handles(family_handle))
+    people.discard(None)
+    people.discard(person_handle)
+    return people
+
+
 def find_deep_relations(db, user, person, target_people):
     """This explores all possible paths between a person and one or more
     targets.  The algorithm processes paths in a breadth first wave, one
@@ -94,6 +109,7 @@ def find_deep_relations(db, user, person, target_people):
     # the value is a handle of the previous person in the path, or None at
     # head of path.  This forms a linked list of handles along the path.
     done[person.handle] = None
+    graph = db.get_genealogy_graph()
 
     while todo:
         handle = todo.popleft()
@@ -111,11 +127,13 @@ def find_deep_relations(db, user, person, target_people):
             if not target_people:  # Quit searching if all targets found
                 break
 
-        person = db.get_person_from_handle(handle)
-        if person is None:
-            continue
-
-        people = get_person_family_people(db, person, handle)
+        if graph is not None:
+            people = get_graph_family_people(graph, handle)
+        else:
+            person = db.get_person_from_handle(handle)
+            if person is None:
+                continue
+            people = get_person_family_people(db, person, handle)
         for p_hndl in people:
             if p_hndl in done:  # check if we have already been here
                 continue  # and ignore if we have
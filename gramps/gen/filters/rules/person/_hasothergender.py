@@ -50,3 +50,6 @@ class HasOtherGender(Rule):
 
     def apply(self, db, person):
         return person.gender == Person.OTHER
+
+    def get_conditions(self):
+        return [("gender", "=", Person.OTHER)]
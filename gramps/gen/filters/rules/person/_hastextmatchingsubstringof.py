@@ -51,6 +51,10 @@ class HasTextMatchingSubstringOf(Rule):
     description = _("Matches people whose records contain text " "matching a substring")
     category = _("General filters")
     allow_regex = True
+    cost = 100
+    # Objects searched in the full-text index of the database
+    text_types = ("Citation", "Person", "Place", "Source")
+    text_matches = None
 
     def prepare(self, db, user):
         self.db = db
@@ -68,6 +72,11 @@ class HasTextMatchingSubstringOf(Rule):
                 self.case_sensitive = False
         except IndexError:
             self.case_sensitive = False
+        self.text_matches = None
+        if not self.use_regex:
+            matches = db.search_text(self.list[0], self.text_types)
+            if matches is not None:
+                self.text_matches = set(matches)
         self.cache_repos()
         self.cache_sources()
 
@@ -79,6 +88,7 @@ class HasTextMatchingSubstringOf(Rule):
         self.family_map.clear()
         self.place_map.clear()
         self.media_map.clear()
+        self.text_matches = None
 
     def apply(self, db, person):
         if person.handle in self.person_map:  # Cached by matching Source?
@@ -239,6 +249,13 @@ class HasTextMatchingSubstringOf(Rule):
     def match_object(self, obj):
         if not obj:
             return False
+        if (
+            self.text_matches is not None
+            and obj.__class__.__name__ in self.text_types
+            and (obj.__class__.__name__, obj.handle) not in self.text_matches
+        ):
+            # Not found by the full-text index
+            return False
         if self.use_regex:
             return obj.matches_regexp(self.list[0], self.case_sensitive)
         return obj.matches_string(self.list[0], self.case_sensitive)
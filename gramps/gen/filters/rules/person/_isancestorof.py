@@ -47,6 +47,7 @@ class IsAncestorOf(Rule):
     name = _("Ancestors of <person>")
     category = _("Ancestral filters")
     description = _("Matches people that are ancestors of a specified person")
+    prepare_cache = ("map",)
 
     def prepare(self, db, user):
         """Assume that if 'Inclusive' not defined, assume inclusive"""
@@ -58,12 +59,16 @@ class IsAncestorOf(Rule):
             first = 1
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_ancestor_list(db, root_person, first)
+            graph = db.get_genealogy_graph()
+            if graph is not None and root_person:
+                self.init_ancestor_graph(graph, root_person.handle, first)
+            else:
+                self.init_ancestor_list(db, root_person, first)
         except:
             pass
 
     def reset(self):
-        self.map.clear()
+        self.map = set()
 
     def apply(self, db, person):
         return person.handle in self.map
@@ -86,3 +91,20 @@ class IsAncestorOf(Rule):
                     self.init_ancestor_list(db, db.get_person_from_handle(f_id), 0)
                 if m_id:
                     self.init_ancestor_list(db, db.get_person_from_handle(m_id), 0)
+
+    def init_ancestor_graph(self, graph, handle, first):
+        todo = [(handle, first)]
+        while todo:
+            handle, first = todo.pop()
+            if handle in self.map:
+                continue
+            if not first:
+                self.map.add(handle)
+            fam_id = graph.get_main_parents_family_handle(handle)
+            if fam_id:
+                f_id = graph.get_father_handle(fam_id)
+                m_id = graph.get_mother_handle(fam_id)
+                if m_id:
+                    todo.append((m_id, 0))
+                if f_id:
+                    todo.append((f_id, 0))
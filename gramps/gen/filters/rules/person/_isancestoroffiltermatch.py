@@ -51,6 +51,8 @@ class IsAncestorOfFilterMatch(IsAncestorOf):
     description = _(
         "Matches people that are ancestors " "of anybody matched by a filter"
     )
+    # The matches of the filter may change without the database
+    prepare_cache = ()
 
     def prepare(self, db, user):
         self.db = db
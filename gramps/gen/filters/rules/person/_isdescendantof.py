@@ -48,6 +48,7 @@ class IsDescendantOf(Rule):
     name = _("Descendants of <person>")
     category = _("Descendant filters")
     description = _("Matches all descendants for the specified person")
+    prepare_cache = ("map",)
 
     def prepare(self, db, user):
         self.db = db
@@ -58,12 +59,16 @@ class IsDescendantOf(Rule):
             first = True
         try:
             root_person = db.get_person_from_gramps_id(self.list[0])
-            self.init_list(root_person, first)
+            graph = db.get_genealogy_graph()
+            if graph is not None and root_person:
+                self.init_graph_list(graph, root_person.handle, first)
+            else:
+                self.init_list(root_person, first)
         except:
             pass
 
     def reset(self):
-        self.map.clear()
+        self.map = set()
 
     def apply(self, db, person):
         return person.handle in self.map
@@ -80,3 +85,16 @@ class IsDescendantOf(Rule):
             if fam:
                 for child_ref in fam.get_child_ref_list():
                     self.init_list(self.db.get_person_from_handle(child_ref.ref), 0)
+
+    def init_graph_list(self, graph, handle, first):
+        todo = [(handle, first)]
+        while todo:
+            handle, first = todo.pop()
+            if handle in self.map:
+                continue
+            if not first:
+                self.map.add(handle)
+            for fam_id in graph.get_family_handles(handle):
+                todo.extend(
+                    (child, 0) for child in reversed(graph.get_child_handles(fam_id))
+                )
@@ -51,6 +51,7 @@ class IsDuplicatedAncestorOf(Rule):
     description = _(
         "Matches people that are ancestors twice or more " "of a specified person"
     )
+    prepare_cache = ("map", "map2")
 
     def prepare(self, db, user):
         self.db = db
@@ -61,8 +62,8 @@ class IsDuplicatedAncestorOf(Rule):
             self.init_ancestor_list(db, root_person)
 
     def reset(self):
-        self.map.clear()
-        self.map2.clear()
+        self.map = set()
+        self.map2 = set()
 
     def apply(self, db, person):
         return person.handle in self.map2
@@ -50,3 +50,6 @@ class IsFemale(Rule):
 
     def apply(self, db, person):
         return person.gender == Person.FEMALE
+
+    def get_conditions(self):
+        return [("gender", "=", Person.FEMALE)]
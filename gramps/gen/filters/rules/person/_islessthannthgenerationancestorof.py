@@ -51,6 +51,7 @@ class IsLessThanNthGenerationAncestorOf(Rule):
         "Matches people that are ancestors "
         "of a specified person not more than N generations away"
     )
+    prepare_cache = ("map",)
 
     def prepare(self, db, user):
         self.db = db
@@ -62,6 +63,7 @@ class IsLessThanNthGenerationAncestorOf(Rule):
                 self.init_ancestor_list(root_handle)
 
     def init_ancestor_list(self, root_handle):
+        graph = self.db.get_genealogy_graph()
         queue = [(root_handle, 1)]  # generation 1 is root
         while queue:
             handle, gen = queue.pop(0)  # pop off front of queue
@@ -71,21 +73,29 @@ class IsLessThanNthGenerationAncestorOf(Rule):
             self.map.add(handle)
             gen += 1
             if gen <= int(self.list[1]):
-                p = self.db.get_person_from_handle(handle)
-                fam_id = p.get_main_parents_family_handle()
-                if fam_id:
-                    fam = self.db.get_family_from_handle(fam_id)
-                    if fam:
-                        f_id = fam.get_father_handle()
-                        m_id = fam.get_mother_handle()
-                        # append to back of queue:
-                        if f_id:
-                            queue.append((f_id, gen))
-                        if m_id:
-                            queue.append((m_id, gen))
+                if graph is not None:
+                    # walk the links without reading people and families
+                    fam_id = graph.get_main_parents_family_handle(handle)
+                    if not fam_id:
+                        continue
+                    f_id = graph.get_father_handle(fam_id)
+                    m_id = graph.get_mother_handle(fam_id)
+                else:
+                    p = self.db.get_person_from_handle(handle)
+                    fam_id = p.get_main_parents_family_handle()
+                    fam = self.db.get_family_from_handle(fam_id) if fam_id else None
+                    if not fam:
+                        continue
+                    f_id = fam.get_father_handle()
+                    m_id = fam.get_mother_handle()
+                # append to back of queue:
+                if f_id:
+                    queue.append((f_id, gen))
+                if m_id:
+                    queue.append((m_id, gen))
 
     def reset(self):
-        self.map.clear()
+        self.map = set()
 
     def apply(self, db, person):
         return person.handle in self.map
@@ -51,6 +51,7 @@ class IsMoreThanNthGenerationAncestorOf(Rule):
         "Matches people that are ancestors "
         "of a specified person at least N generations away"
     )
+    prepare_cache = ("map",)
 
     def prepare(self, db, user):
         self.db = db
@@ -82,7 +83,7 @@ class IsMoreThanNthGenerationAncestorOf(Rule):
                         queue.append((m_id, gen))
 
     def reset(self):
-        self.map.clear()
+        self.map = set()
 
     def apply(self, db, person):
         return person.handle in self.map
@@ -51,6 +51,7 @@ class IsMoreThanNthGenerationDescendantOf(Rule):
         "Matches people that are descendants of a specified "
         "person at least N generations away"
     )
+    prepare_cache = ("map",)
 
     def prepare(self, db, user):
         self.db = db
@@ -62,7 +63,7 @@ class IsMoreThanNthGenerationDescendantOf(Rule):
             pass
 
     def reset(self):
-        self.map.clear()
+        self.map = set()
 
     def apply(self, db, person):
         return person.handle in self.map
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from ....utils.alive import probably_alive
+from ....utils.alive import probably_alive_many
 from .. import Rule
 from ....datehandler import parser
 
@@ -47,6 +47,7 @@ class ProbablyAlive(Rule):
     name = _("People probably alive")
     description = _("Matches people without indications of death that are not too old")
     category = _("General filters")
+    cost = 100
 
     def prepare(self, db, user):
         try:
@@ -55,4 +56,6 @@ class ProbablyAlive(Rule):
             self.current_date = None
 
     def apply(self, db, person):
-        return probably_alive(person, db, self.current_date)
+        return person.handle in probably_alive_many(
+            [person.handle], db, self.current_date
+        )
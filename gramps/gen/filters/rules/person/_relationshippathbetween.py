@@ -52,6 +52,7 @@ class RelationshipPathBetween(Rule):
         "to a common ancestor, producing the relationship "
         "path between two persons."
     )
+    prepare_cache = ("map",)
 
     def prepare(self, db, user):
         self.db = db
@@ -29,6 +29,7 @@ import inspect
 from ....filters import reload_custom_filters
 
 reload_custom_filters()
+from ....db import DbTxn
 from ....db.utils import import_as_dict
 from ....filters import GenericFilter, CustomFilters
 from ....const import DATA_DIR
@@ -195,6 +196,42 @@ class BaseTest(unittest.TestCase):
         res = self.filter_with_rule(rule)
         self.assertEqual(len(res), 85)
 
+    def test_prepare_cache(self):
+        """Test that prepared results are reused until the database changes"""
+        res = self.filter_with_rule(IsDescendantOf(["I0610", 0]))
+        rule = IsDescendantOf(["I0610", 0])
+        self.assertEqual(self.filter_with_rule(rule), res)
+        self.assertTrue(rule.prepare_reused)
+        with DbTxn("Change nothing", self.db):
+            pass
+        rule = IsDescendantOf(["I0610", 0])
+        self.assertEqual(self.filter_with_rule(rule), res)
+        self.assertFalse(rule.prepare_reused)
+
+    def test_rule_order(self):
+        """Test that rules are reordered by cost and selectivity"""
+        alive = ProbablyAlive(["2000"])
+        married = MultipleMarriages([])
+        filter_ = GenericFilter()
+        filter_.set_rules([alive, married])
+        res = filter_.apply(self.db)
+        self.assertEqual(filter_.rule_order, [married, alive])
+        self.assertEqual(
+            set(res),
+            set(self.filter_with_rule(ProbablyAlive(["2000"])))
+            & set(self.filter_with_rule(MultipleMarriages([]))),
+        )
+        stats = filter_.get_rule_stats()
+        self.assertEqual([stat[0] for stat in stats], [married, alive])
+        self.assertEqual(stats[0][1], len(self.db.get_person_handles()) // 16)
+        filter_.set_logical_op("or")
+        self.assertEqual(
+            set(filter_.apply(self.db)),
+            set(self.filter_with_rule(ProbablyAlive(["2000"])))
+            | set(self.filter_with_rule(MultipleMarriages([]))),
+        )
+        self.assertEqual(filter_.rule_order, [alive, married])
+
     def test_IsMoreThanNthGenerationDescendantOf(self):
         """Test the rule"""
         rule = IsMoreThanNthGenerationDescendantOf(["I0610", 3])
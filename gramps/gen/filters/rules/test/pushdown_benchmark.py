@@ -0,0 +1,103 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the filter rules evaluated by the database.
+
+Imports the example data.gramps tree, copies its people until it is scaled
+up, and compares applying filters with and without the conditions of their
+rules evaluated in SQL.  Run with::
+
+    python3 -m gramps.gen.filters.rules.test.pushdown_benchmark [COPIES]
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import sys
+from time import perf_counter
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ....const import ROOT_DIR
+from ....db import DbTxn
+from ....db.utils import import_as_dict
+from ....filters import GenericFilter
+from ....user import User
+from ....utils.id import create_id
+from ..person import ChangedSince, HasNameOf, HasTag, IsFemale, IsMale, RegExpIdOf
+
+DATA = os.path.join(os.path.dirname(ROOT_DIR), "example", "gramps", "data.gramps")
+
+FILTERS = (
+    ("male", [IsMale([])]),
+    ("female, ID", [IsFemale([]), RegExpIdOf(["I001"])]),
+    ("tag", [HasTag(["tag1"])]),
+    ("changed", [ChangedSince(["1990-01-01", ""])]),
+    ("male, name", [IsMale([]), HasNameOf(["", "Smith"] + [""] * 9)]),
+)
+
+
+def scale(db, copies):
+    """
+    Add copies of each person of the database, with new handles and IDs.
+    """
+    people = list(db.iter_people())
+    with DbTxn("Scale", db, batch=True) as trans:
+        for index in range(copies):
+            for person in people:
+                person.handle = create_id()
+                person.gramps_id = "%s-%d" % (person.gramps_id.split("-")[0], index)
+                db.add_person(person, trans)
+
+
+def main(copies=500):
+    """
+    Apply each filter with and without the database evaluating the rules.
+    """
+    db = import_as_dict(DATA, User())
+    scale(db, copies)
+    print("%d people" % db.get_number_of_people())
+    for label, rules in FILTERS:
+        timings = []
+        for pushdown in (False, True):
+            gfilter = GenericFilter()
+            for rule in rules:
+                gfilter.add_rule(rule)
+            if not pushdown:
+                gfilter.select_handles = lambda db: None
+            start = perf_counter()
+            count = len(gfilter.apply(db))
+            timings.append(perf_counter() - start)
+        print(
+            "%-11s: %d matches, %.3f seconds in Python, %.3f seconds in SQL"
+            % (label, count, timings[0], timings[1])
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
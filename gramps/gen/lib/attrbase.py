@@ -28,6 +28,7 @@ AttributeRootBase class for Gramps.
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from .baseobj import mixin_new, standalone
 from .attribute import Attribute, AttributeRoot
 from .const import EQUAL, IDENTICAL
 from .srcattribute import SrcAttribute
@@ -43,6 +44,9 @@ class AttributeRootBase:
     Base class for attribute-aware objects.
     """
 
+    __slots__ = ()
+    __new__ = mixin_new
+
     _CLASS = AttributeRoot
 
     def __init__(self, source=None):
@@ -158,6 +162,8 @@ class AttributeBase(AttributeRootBase):
     Base class for an Attribute list.
     """
 
+    __slots__ = ()
+
     _CLASS = Attribute
 
 
@@ -171,4 +177,42 @@ class SrcAttributeBase(AttributeRootBase):
     Base class for a SrcAttribute list.
     """
 
+    __slots__ = ()
+
     _CLASS = SrcAttribute
+
+
+# -------------------------------------------------------------------------
+#
+# _StandaloneAttributeRootBase
+#
+# -------------------------------------------------------------------------
+@standalone(AttributeRootBase)
+class _StandaloneAttributeRootBase(AttributeRootBase):
+    """
+    An AttributeRootBase on its own, with its attributes in a dictionary.
+    """
+
+
+# -------------------------------------------------------------------------
+#
+# _StandaloneAttributeBase
+#
+# -------------------------------------------------------------------------
+@standalone(AttributeBase)
+class _StandaloneAttributeBase(AttributeBase):
+    """
+    An AttributeBase on its own, with its attributes in a dictionary.
+    """
+
+
+# -------------------------------------------------------------------------
+#
+# _StandaloneSrcAttributeBase
+#
+# -------------------------------------------------------------------------
+@standalone(SrcAttributeBase)
+class _StandaloneSrcAttributeBase(SrcAttributeBase):
+    """
+    A SrcAttributeBase on its own, with its attributes in a dictionary.
+    """
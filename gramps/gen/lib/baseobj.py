@@ -31,6 +31,81 @@ Base Object class for Gramps
 import re
 from abc import ABCMeta, abstractmethod
 
+# Public slot names of each class, and whether its instances have a __dict__
+_SLOTS = {}
+
+
+def get_slots(cls):
+    """
+    Return the names of the public attributes that a class and its bases
+    keep in slots, and whether its instances also have a dictionary of
+    attributes.
+
+    :param cls: The class of the objects.
+    :type cls: type
+    :returns: Returns a tuple of the slot names and a boolean.
+    :rtype: tuple
+    """
+    try:
+        return _SLOTS[cls]
+    except KeyError:
+        pass
+    names = []
+    has_dict = False
+    for klass in reversed(cls.__mro__[:-1]):
+        slots = klass.__dict__.get("__slots__")
+        if slots is None:
+            has_dict = True
+            continue
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if not name.startswith("_") and name not in names:
+                names.append(name)
+    result = _SLOTS[cls] = (tuple(names), has_dict)
+    return result
+
+
+# Subclasses keeping their attributes in a dictionary of the base classes
+# mixed into secondary objects, by base class
+_STANDALONE = {}
+
+
+def mixin_new(cls, *args, **kwargs):
+    """
+    Create an object of a class derived from a base class mixed into
+    secondary objects.
+
+    Such a base class has no slots of its own, as the attributes it sets
+    are kept in the slots of the secondary objects, so an object of the
+    base class itself is created from its standalone subclass, which keeps
+    them in a dictionary.
+
+    :param cls: The class of the object.
+    :type cls: type
+    :returns: Returns the new object.
+    :rtype: object
+    """
+    return object.__new__(_STANDALONE.get(cls, cls))
+
+
+def standalone(mixin):
+    """
+    Return a class decorator registering the standalone subclass of a base
+    class mixed into secondary objects.
+
+    :param mixin: The base class.
+    :type mixin: type
+    :returns: Returns the class decorator.
+    :rtype: function
+    """
+
+    def register(cls):
+        _STANDALONE[mixin] = cls
+        return cls
+
+    return register
+
 
 # -------------------------------------------------------------------------
 #
@@ -46,6 +121,8 @@ class BaseObject(metaclass=ABCMeta):
     searching through all available information.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def serialize(self):
         """
@@ -62,9 +139,9 @@ class BaseObject(metaclass=ABCMeta):
         """
         Get the current object state as a dictionary.
 
-        By default this returns the public attributes of the instance.  This
-        method can be overridden if the class requires other attributes or
-        properties to be saved.
+        By default this returns the public attributes of the instance, held
+        in its slots or its dictionary.  This method can be overridden if the
+        class requires other attributes or properties to be saved.
 
         This method is called to provide the information required to serialize
         the object.
@@ -73,11 +150,17 @@ class BaseObject(metaclass=ABCMeta):
                   of the object.
         :rtype: dict
         """
-        attr_dict = dict(
-            (key, value)
-            for key, value in self.__dict__.items()
-            if not key.startswith("_")
-        )
+        slots, has_dict = get_slots(self.__class__)
+        attr_dict = {}
+        for key in slots:
+            try:
+                attr_dict[key] = getattr(self, key)
+            except AttributeError:
+                pass
+        if has_dict:
+            for key, value in self.__dict__.items():
+                if not key.startswith("_"):
+                    attr_dict[key] = value
         attr_dict["_class"] = self.__class__.__name__
         return attr_dict
 
@@ -97,7 +180,11 @@ class BaseObject(metaclass=ABCMeta):
                           the object.
         :type attr_dict: dict
         """
-        self.__dict__.update(attr_dict)
+        if get_slots(self.__class__)[0]:
+            for key, value in attr_dict.items():
+                setattr(self, key, value)
+        else:
+            self.__dict__.update(attr_dict)
 
     def matches_string(self, pattern, case_sensitive=False):
         """
@@ -89,6 +89,15 @@ class Citation(
         self.confidence = Citation.CONF_NORMAL  #  4
         SrcAttributeBase.__init__(self)  #  8
 
+    @classmethod
+    def get_index_fields(cls):
+        """
+        Return the fields that the database indexes.
+        """
+        return super().get_index_fields() + [
+            ("date_sortval", "$.date.sortval", "integer")
+        ]
+
     @classmethod
     def get_schema(cls):
         """
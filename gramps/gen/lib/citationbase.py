@@ -34,6 +34,14 @@ import logging
 LOG = logging.getLogger(".citation")
 
 
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .baseobj import mixin_new, standalone
+
+
 # -------------------------------------------------------------------------
 #
 # CitationBase
@@ -55,6 +63,9 @@ class CitationBase:
     class. I.e. SourceRef = CitationBase + Citation
     """
 
+    __slots__ = ()
+    __new__ = mixin_new
+
     def __init__(self, source=None):
         """
         Create a new CitationBase, copying from source if not None.
@@ -252,6 +263,13 @@ class CitationBase:
             item.replace_citation_references(old_handle, new_handle)
 
 
+@standalone(CitationBase)
+class _StandaloneCitationBase(CitationBase):
+    """
+    A CitationBase on its own, with its attributes in a dictionary.
+    """
+
+
 class IndirectCitationBase:
     """
     Citation management logic for objects that don't have citations
@@ -27,6 +27,7 @@ DateBase class for Gramps.
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from .baseobj import mixin_new, standalone
 from .date import Date
 
 
@@ -40,6 +41,9 @@ class DateBase:
     Base class for storing date information.
     """
 
+    __slots__ = ()
+    __new__ = mixin_new
+
     def __init__(self, source=None):
         """
         Create a new DateBase, copying from source if not None.
@@ -90,3 +94,15 @@ class DateBase:
         :type date: :class:`~.date.Date`
         """
         self.date = date
+
+
+# -------------------------------------------------------------------------
+#
+# _StandaloneDateBase
+#
+# -------------------------------------------------------------------------
+@standalone(DateBase)
+class _StandaloneDateBase(DateBase):
+    """
+    A DateBase on its own, with its attributes in a dictionary.
+    """
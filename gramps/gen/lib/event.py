@@ -158,6 +158,16 @@ class Event(
         self.__description = attr_dict.pop("description")
         super().set_object_state(attr_dict)
 
+    @classmethod
+    def get_index_fields(cls):
+        """
+        Return the fields that the database indexes.
+        """
+        return super().get_index_fields() + [
+            ("date_sortval", "$.date.sortval", "integer"),
+            ("type_value", "$.type.value", "integer"),
+        ]
+
     @classmethod
     def get_schema(cls):
         """
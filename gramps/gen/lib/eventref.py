@@ -59,6 +59,15 @@ class EventRef(
     to the referenced event.
     """
 
+    __slots__ = (
+        "private",
+        "citation_list",
+        "note_list",
+        "attribute_list",
+        "ref",
+        "__role",
+    )
+
     def __init__(self, source=None):
         """
         Create a new EventRef instance, copying from the source if present.
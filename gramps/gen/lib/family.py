@@ -143,6 +143,13 @@ class Family(
             self.private,
         )
 
+    @classmethod
+    def get_index_fields(cls):
+        """
+        Return the fields that the database indexes.
+        """
+        return super().get_index_fields() + [("type_value", "$.type.value", "integer")]
+
     @classmethod
     def get_schema(cls):
         """
@@ -23,6 +23,13 @@
 LocationBase class for Gramps.
 """
 
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .baseobj import mixin_new, standalone
+
 
 # -------------------------------------------------------------------------
 #
@@ -34,6 +41,9 @@ class LocationBase:
     Base class for all things Address.
     """
 
+    __slots__ = ()
+    __new__ = mixin_new
+
     def __init__(self, source=None):
         """
         Create a LocationBase object, copying from the source object if it
@@ -189,3 +199,15 @@ class LocationBase:
     def get_county(self):
         """Return the county name of the LocationBase object."""
         return self.county
+
+
+# -------------------------------------------------------------------------
+#
+# _StandaloneLocationBase
+#
+# -------------------------------------------------------------------------
+@standalone(LocationBase)
+class _StandaloneLocationBase(LocationBase):
+    """
+    A LocationBase on its own, with its attributes in a dictionary.
+    """
@@ -126,6 +126,15 @@ class Media(CitationBase, NoteBase, DateBase, AttributeBase, PrimaryObject):
             self.private,
         )
 
+    @classmethod
+    def get_index_fields(cls):
+        """
+        Return the fields that the database indexes.
+        """
+        return super().get_index_fields() + [
+            ("date_sortval", "$.date.sortval", "integer")
+        ]
+
     @classmethod
     def get_schema(cls):
         """
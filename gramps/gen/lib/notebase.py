@@ -33,6 +33,14 @@ import logging
 LOG = logging.getLogger(".note")
 
 
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .baseobj import mixin_new, standalone
+
+
 # -------------------------------------------------------------------------
 #
 # NoteBase
@@ -47,6 +55,9 @@ class NoteBase:
     as a note_list attribute of the NoteBase object.
     """
 
+    __slots__ = ()
+    __new__ = mixin_new
+
     def __init__(self, source=None):
         """
         Create a new NoteBase, copying from source if not None.
@@ -223,3 +234,15 @@ class NoteBase:
 
         for item in self.get_note_child_list():
             item.replace_note_references(old_handle, new_handle)
+
+
+# -------------------------------------------------------------------------
+#
+# _StandaloneNoteBase
+#
+# -------------------------------------------------------------------------
+@standalone(NoteBase)
+class _StandaloneNoteBase(NoteBase):
+    """
+    A NoteBase on its own, with its attributes in a dictionary.
+    """
@@ -130,6 +130,13 @@ class Place(CitationBase, NoteBase, MediaBase, UrlBase, PrimaryObject):
             self.private,
         )
 
+    @classmethod
+    def get_index_fields(cls):
+        """
+        Return the fields that the database indexes.
+        """
+        return super().get_index_fields() + [("name_value", "$.name.value", "string")]
+
     @classmethod
     def get_schema(cls):
         """
@@ -22,6 +22,13 @@
 PlaceBase class for Gramps.
 """
 
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .baseobj import mixin_new, standalone
+
 
 # -------------------------------------------------------------------------
 #
@@ -33,6 +40,9 @@ class PlaceBase:
     Base class for place-aware objects.
     """
 
+    __slots__ = ()
+    __new__ = mixin_new
+
     def __init__(self, source=None):
         """
         Initialize a PlaceBase.
@@ -67,3 +77,15 @@ class PlaceBase:
         :rtype: str
         """
         return self.place
+
+
+# -------------------------------------------------------------------------
+#
+# _StandalonePlaceBase
+#
+# -------------------------------------------------------------------------
+@standalone(PlaceBase)
+class _StandalonePlaceBase(PlaceBase):
+    """
+    A PlaceBase on its own, with its attributes in a dictionary.
+    """
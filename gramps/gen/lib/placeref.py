@@ -50,6 +50,8 @@ class PlaceRef(RefBase, DateBase, SecondaryObject):
     in the place hierarchy.
     """
 
+    __slots__ = ("ref", "date")
+
     def __init__(self, source=None):
         """
         Create a new PlaceRef instance, copying from the source if present.
@@ -23,6 +23,13 @@
 PrivacyBase Object class for Gramps.
 """
 
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .baseobj import mixin_new, standalone
+
 
 # -------------------------------------------------------------------------
 #
@@ -34,6 +41,9 @@ class PrivacyBase:
     Base class for privacy-aware objects.
     """
 
+    __slots__ = ()
+    __new__ = mixin_new
+
     def __init__(self, source=None):
         """
         Initialize a PrivacyBase.
@@ -90,3 +100,15 @@ class PrivacyBase:
         :rtype: bool
         """
         self.private = self.private or other.private
+
+
+# -------------------------------------------------------------------------
+#
+# _StandalonePrivacyBase
+#
+# -------------------------------------------------------------------------
+@standalone(PrivacyBase)
+class _StandalonePrivacyBase(PrivacyBase):
+    """
+    A PrivacyBase on its own, with its attributes in a dictionary.
+    """
@@ -42,6 +42,8 @@ class RefBase(metaclass=ABCMeta):
     Any *Ref* classes should derive from this class.
     """
 
+    __slots__ = ()
+
     def __init__(self, source=None):
         if source:
             self.ref = source.ref
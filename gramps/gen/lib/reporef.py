@@ -51,6 +51,8 @@ class RepoRef(SecondaryObject, PrivacyBase, NoteBase, RefBase):
     Repository reference class.
     """
 
+    __slots__ = ("private", "note_list", "ref", "call_number", "media_type")
+
     def __init__(self, source=None):
         PrivacyBase.__init__(self, source)
         NoteBase.__init__(self, source)
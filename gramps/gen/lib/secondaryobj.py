@@ -48,6 +48,8 @@ class SecondaryObject(BaseObject):
     database.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def serialize(self):
         """
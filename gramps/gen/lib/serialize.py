@@ -31,6 +31,8 @@ Serialization utilities for Gramps.
 import json
 import pickle
 import logging
+from collections import Counter
+from functools import partial
 
 # ------------------------------------------------------------------------
 #
@@ -42,49 +44,174 @@ import gramps.gen.lib as lib
 LOG = logging.getLogger(".serialize")
 
 
+# Accessor methods of the objects answered by DataDict from the data, by the
+# key of the value they return
+ACCESSORS = {
+    "get_alternate_names": "alternate_names",
+    "get_attribute_list": "attribute_list",
+    "get_change_time": "change",
+    "get_child_ref_list": "child_ref_list",
+    "get_citation_list": "citation_list",
+    "get_description": "description",
+    "get_event_ref_list": "event_ref_list",
+    "get_family_handle_list": "family_list",
+    "get_father_handle": "father_handle",
+    "get_first_name": "first_name",
+    "get_gender": "gender",
+    "get_gramps_id": "gramps_id",
+    "get_handle": "handle",
+    "get_media_list": "media_list",
+    "get_mother_handle": "mother_handle",
+    "get_note_list": "note_list",
+    "get_parent_family_handle_list": "parent_family_list",
+    "get_person_ref_list": "person_ref_list",
+    "get_primary_name": "primary_name",
+    "get_privacy": "private",
+    "get_reference_handle": "ref",
+    "get_surname_list": "surname_list",
+    "get_tag_list": "tag_list",
+    "get_title": "title",
+}
+
+# Keys of the values that the accessors return as objects, like those of the
+# objects themselves, created from the data of the value only
+OBJECT_KEYS = {
+    "alternate_names",
+    "attribute_list",
+    "child_ref_list",
+    "event_ref_list",
+    "media_list",
+    "person_ref_list",
+    "primary_name",
+    "surname_list",
+}
+
+# Accessor methods of the event references in the event reference list, by
+# the key of their index
+EVENT_REF_ACCESSORS = {
+    "get_birth_ref": "birth_ref_index",
+    "get_death_ref": "death_ref_index",
+}
+
+# Number of objects created from a DataDict, by class name and attribute
+_MATERIALIZED = Counter()
+
+
+def get_materialize_stats():
+    """
+    Return the number of objects created by DataDict to look up an
+    attribute, by (class name, attribute) tuple.
+    """
+    return dict(_MATERIALIZED)
+
+
+def reset_materialize_stats():
+    """
+    Reset the numbers returned by get_materialize_stats.
+    """
+    _MATERIALIZED.clear()
+
+
+def _wrap(value):
+    """
+    Wrap a plain dict or list of data.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return DataDict(value)
+    if value_type is list:
+        return DataList(value)
+    return value
+
+
 class DataDict(dict):
     """
     A wrapper around a data dict that also provides an
     object interface.
+
+    Nested dicts and lists are wrapped when first accessed, and replace the
+    plain values, so that each is only wrapped once.  The accessor methods
+    in ACCESSORS return the data, or for the keys in OBJECT_KEYS, the
+    objects created from the data of the value, as the accessors of the
+    objects do.  Other attributes are looked up on the object created from
+    the data, which is counted.
     """
 
     def __str__(self):
-        if "_object" not in self:
-            self["_object"] = from_dict(self)
-        return str(self["_object"])
+        return str(self.__get_object("__str__"))
 
     def __getattr__(self, key):
         if key.startswith("_"):
             raise AttributeError("can't use this API to access hidden attributes")
 
         if key in self:
-            value = self[key]
-        else:
-            if "_object" not in self:
-                self["_object"] = from_dict(self)
+            return self.__get_value(key)
+        if ACCESSORS.get(key) in self:
+            if ACCESSORS[key] in OBJECT_KEYS:
+                return partial(self.__get_objects, ACCESSORS[key])
+            return partial(self.__get_value, ACCESSORS[key])
+        if EVENT_REF_ACCESSORS.get(key) in self and "event_ref_list" in self:
+            return partial(self.__get_event_ref, EVENT_REF_ACCESSORS[key])
+        return getattr(self.__get_object(key), key)
+
+    def __get_value(self, key):
+        value = self[key]
+        wrapped = _wrap(value)
+        if wrapped is not value:
+            self[key] = wrapped
+        return wrapped
+
+    def __get_objects(self, key):
+        if "_object" in self:
             return getattr(self["_object"], key)
-
-        if isinstance(value, dict):
-            return DataDict(value)
-        elif isinstance(value, list):
-            return DataList(value)
-        else:
-            return value
+        try:
+            objects = self.__dict__["objects"]
+        except KeyError:
+            objects = self.__dict__["objects"] = {}
+        if key not in objects:
+            objects[key] = _from_data(self[key])
+        return objects[key]
+
+    def __get_event_ref(self, index_key):
+        index = self[index_key]
+        event_ref_list = self.__get_objects("event_ref_list")
+        if 0 <= index < len(event_ref_list):
+            return event_ref_list[index]
+        return None
+
+    def __get_object(self, key):
+        if "_object" not in self:
+            class_name = self.get("_class")
+            _MATERIALIZED[(class_name, key)] += 1
+            LOG.debug("DataDict: %s object created for %r", class_name, key)
+            obj = from_dict(self)
+            # Share the objects already returned by the accessors
+            for attribute, value in self.__dict__.pop("objects", {}).items():
+                setattr(obj, attribute, value)
+            self["_object"] = obj
+        return self["_object"]
 
 
 class DataList(list):
     """
     A wrapper around a data list.
+
+    Nested dicts and lists are wrapped when first accessed, and replace the
+    plain items.
     """
 
     def __getitem__(self, position):
         value = super().__getitem__(position)
-        if isinstance(value, dict):
-            return DataDict(value)
-        elif isinstance(value, list):
+        if isinstance(position, slice):
             return DataList(value)
-        else:
-            return value
+        wrapped = _wrap(value)
+        if wrapped is not value:
+            super().__setitem__(position, wrapped)
+        return wrapped
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
 
 
 def __object_hook(obj_dict):
@@ -123,28 +250,231 @@ def from_json(data):
     return json.loads(data, object_hook=__object_hook)
 
 
+# JSON schema types of the values that are copied as they are
+SCALAR_TYPES = {"boolean", "integer", "null", "number", "string"}
+
+# Converters of the objects of each class, to and from dictionaries
+_TO_DICT = {}
+_FROM_DICT = {}
+
+
+def _is_scalar(schema):
+    """
+    Return True if the values of a property schema are scalars.
+    """
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        return all(item in SCALAR_TYPES for item in schema_type)
+    return schema_type in SCALAR_TYPES
+
+
+def _get_expressions(cls, access, convert):
+    """
+    Return the expressions converting the properties of the schema of a
+    class, keyed by property name, or None if the class has no schema.
+
+    The access format gives the expression reading a property from its key.
+    Scalars are copied, lists of scalars are copied with list(), and other
+    values are converted by the named function.
+    """
+    try:
+        properties = cls.get_schema()["properties"]
+    except (AttributeError, KeyError):
+        return None
+    expressions = {}
+    for key, schema in properties.items():
+        value = access.format(key=key)
+        if key == "_class" or _is_scalar(schema):
+            expressions[key] = value
+        elif schema.get("type") == "array" and _is_scalar(schema.get("items", {})):
+            expressions[key] = f"list({value})"
+        else:
+            expressions[key] = f"{convert}({value})"
+    return expressions
+
+
+def _make_function(source, namespace):
+    """
+    Compile a converter function named convert.
+    """
+    exec(source, namespace)  # pylint: disable=exec-used
+    return namespace["convert"]
+
+
+def _object_to_data(obj):
+    """
+    Convert an object, of a class without a schema, into a dictionary.
+    """
+    return {key: _to_data(value) for key, value in obj.get_object_state().items()}
+
+
+def _make_to_dict(cls):
+    """
+    Return a function converting an object of the class into a dictionary.
+
+    The dictionary is built directly from the properties of the schema,
+    unless the state of the object has other attributes.  The state of the
+    objects of classes with the default get_object_state is read from their
+    slots, when they are those of the schema, or from their attributes, when
+    they have no private ones.
+    """
+    expressions = _get_expressions(cls, "state[{key!r}]", "to_data")
+    if expressions is None:
+        return _object_to_data
+    items = ", ".join(f"{key!r}: {value}" for key, value in expressions.items())
+    source = "def convert(obj):\n"
+    default_state = cls.get_object_state is lib.baseobj.BaseObject.get_object_state
+    slots, has_dict = lib.baseobj.get_slots(cls)
+    if default_state and not has_dict and set(slots) == set(expressions) - {"_class"}:
+        attributes = _get_expressions(cls, "obj.{key}", "to_data")
+        attributes["_class"] = repr(cls.__name__)
+        attributes = ", ".join(f"{key!r}: {value}" for key, value in attributes.items())
+        source += (
+            "    try:\n"
+            f"        return {{{attributes}}}\n"
+            "    except AttributeError:\n"
+            "        pass\n"
+        )
+    elif default_state and not slots:
+        expressions["_class"] = repr(cls.__name__)
+        attributes = ", ".join(
+            f"{key!r}: {value}" for key, value in expressions.items()
+        )
+        source += (
+            "    state = obj.__dict__\n"
+            f"    if len(state) == {len(expressions) - 1}:\n"
+            "        try:\n"
+            f"            return {{{attributes}}}\n"
+            "        except KeyError:\n"
+            "            pass\n"
+        )
+    source += (
+        "    state = obj.get_object_state()\n"
+        f"    if len(state) == {len(expressions)}:\n"
+        "        try:\n"
+        f"            return {{{items}}}\n"
+        "        except KeyError:\n"
+        "            pass\n"
+        "    return {key: to_data(value) for key, value in state.items()}\n"
+    )
+    return _make_function(source, {"to_data": _to_data})
+
+
+def _to_data(value):
+    """
+    Convert a value into the value that a JSON round trip would give.
+    """
+    value_type = type(value)
+    if (
+        value_type is str
+        or value_type is int
+        or value is None
+        or value_type is bool
+        or value_type is float
+    ):
+        return value
+    if value_type is list or value_type is tuple:
+        return [_to_data(item) for item in value]
+    converter = _TO_DICT.get(value_type)
+    if converter is None:
+        if isinstance(value, dict):
+            return {str(key): _to_data(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [_to_data(item) for item in value]
+        for scalar in (str, int, float):
+            if isinstance(value, scalar):
+                return scalar(value)
+        converter = _TO_DICT[value_type] = _make_to_dict(value_type)
+    return converter(value)
+
+
+def _make_from_dict(class_name):
+    """
+    Return a function converting a dictionary into an object of the class.
+
+    The state of the object is built directly from the properties of the
+    schema, unless the dictionary has other keys.
+    """
+    cls = lib.__dict__[class_name]
+    generic = (
+        "    obj.set_object_state(\n"
+        "        {key: from_data(value) for key, value in data.items()"
+        " if not key.startswith('_')}\n"
+        "    )\n"
+        "    return obj\n"
+    )
+    expressions = _get_expressions(cls, "data[{key!r}]", "from_data")
+    if expressions is None:
+        source = "def convert(data):\n    obj = new(cls)\n" + generic
+    else:
+        del expressions["_class"]
+        items = ", ".join(f"{key!r}: {value}" for key, value in expressions.items())
+        source = (
+            "def convert(data):\n"
+            "    obj = new(cls)\n"
+            f"    if len(data) == {len(expressions) + 1}:\n"
+            "        try:\n"
+            f"            state = {{{items}}}\n"
+            "        except KeyError:\n"
+            "            pass\n"
+            "        else:\n"
+            "            obj.set_object_state(state)\n"
+            "            return obj\n" + generic
+        )
+    return _make_function(
+        source, {"from_data": _from_data, "new": object.__new__, "cls": cls}
+    )
+
+
+def _from_data(value):
+    """
+    Convert a value of a dictionary into the value that a JSON round trip
+    would give, with the dictionaries of objects converted into objects.
+    """
+    value_type = type(value)
+    if value_type is list:
+        return [_from_data(item) for item in value]
+    if value_type is dict or isinstance(value, dict):
+        class_name = value.get("_class")
+        if class_name is None:
+            return {key: _from_data(item) for key, item in value.items()}
+        converter = _FROM_DICT.get(class_name)
+        if converter is None:
+            converter = _FROM_DICT[class_name] = _make_from_dict(class_name)
+        return converter(value)
+    if isinstance(value, (list, tuple)):
+        return [_from_data(item) for item in value]
+    return value
+
+
 def to_dict(obj):
     """
     Convert a Gramps object into a struct.
 
+    The result is the same as a JSON round trip, without encoding and
+    decoding the JSON string.
+
     :param obj: The object to be serialized.
     :type obj: object
     :returns: A dictionary.
     :rtype: dict
     """
-    return json.loads(to_json(obj))
+    return _to_data(obj)
 
 
 def from_dict(dict):
     """
     Convert a dictionary into a Gramps object.
 
+    The result is the same as a JSON round trip, without encoding and
+    decoding the JSON string.
+
     :param dict: The dictionary to be unserialized.
     :type dict: dict
     :returns: A Gramps object.
     :rtype: object
     """
-    return from_json(json.dumps(dict))
+    return _from_data(dict)
 
 
 class BlobSerializer:
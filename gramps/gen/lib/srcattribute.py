@@ -46,6 +46,8 @@ class SrcAttribute(AttributeRoot):
     Used to store descriptive information.
     """
 
+    __slots__ = ()
+
     def __init__(self, source=None):
         """
         Create a new Attribute object, copying from the source if provided.
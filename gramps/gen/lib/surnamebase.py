@@ -27,6 +27,7 @@ SurnameBase class for Gramps.
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from .baseobj import mixin_new, standalone
 from ..const import GRAMPS_LOCALE as glocale
 from .const import EQUAL, IDENTICAL
 from .surname import Surname
@@ -44,6 +45,9 @@ class SurnameBase:
     Base class for surname-aware objects.
     """
 
+    __slots__ = ()
+    __new__ = mixin_new
+
     def __init__(self, source=None):
         """
         Initialize a SurnameBase.
@@ -256,3 +260,15 @@ class SurnameBase:
             if conn:
                 connl.append(conn)
         return connl
+
+
+# -------------------------------------------------------------------------
+#
+# _StandaloneSurnameBase
+#
+# -------------------------------------------------------------------------
+@standalone(SurnameBase)
+class _StandaloneSurnameBase(SurnameBase):
+    """
+    A SurnameBase on its own, with its attributes in a dictionary.
+    """
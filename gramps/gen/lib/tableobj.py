@@ -165,3 +165,12 @@ class TableObject(BaseObject):
             if schema_type in ("string", "integer", "number", "boolean"):
                 result.append((key.lower(), schema_type, value.get("maxLength")))
         return result
+
+    @classmethod
+    def get_index_fields(cls):
+        """
+        Return the fields that the database indexes, as (name, path, type)
+        tuples.  The path is that of a JSON value of the object, for which
+        the database adds a column, or None for a secondary field.
+        """
+        return [("change", None, "integer")]
@@ -0,0 +1,55 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" unittest for the base classes mixed into secondary objects """
+
+import copy
+import pickle
+import unittest
+
+from .. import Name
+from ..attrbase import AttributeBase
+from ..notebase import NoteBase
+from ..privacybase import PrivacyBase
+
+
+class StandaloneTest(unittest.TestCase):
+    def test_pickle(self):
+        for cls in (AttributeBase, NoteBase, PrivacyBase):
+            obj = cls()
+            self.assertIsInstance(obj, cls)
+            clone = pickle.loads(pickle.dumps(obj))
+            self.assertIs(type(clone), type(obj))
+            self.assertEqual(clone.__dict__, obj.__dict__)
+
+    def test_copy(self):
+        obj = NoteBase()
+        obj.add_note("handle")
+        self.assertEqual(copy.deepcopy(obj).get_note_list(), ["handle"])
+
+    def test_secondary(self):
+        name = Name()
+        self.assertIs(type(name), Name)
+        self.assertFalse(hasattr(name, "__dict__"))
+        self.assertIs(type(pickle.loads(pickle.dumps(name))), Name)
+
+
+if __name__ == "__main__":
+    unittest.main()
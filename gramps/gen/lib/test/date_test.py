@@ -410,7 +410,13 @@ class ParserDateTest(BaseDateTest):
                     "dateval fails is_equal in format %d:\n"
                     "   '%s' != '%s'\n"
                     "   '%s' != '%s'\n"
-                    % (index, dateval, ndate, dateval.__dict__, ndate.__dict__),
+                    % (
+                        index,
+                        dateval,
+                        ndate,
+                        dateval.get_object_state(),
+                        ndate.get_object_state(),
+                    ),
                 )
 
     def test_basic(self):
@@ -562,8 +568,8 @@ class MatchDateTest(BaseDateTest):
                 d1,
                 ("did not match" if expected else "matched"),
                 d2,
-                date1.__dict__,
-                date2.__dict__,
+                date1.get_object_state(),
+                date2.get_object_state(),
             ),
         )
 
@@ -0,0 +1,154 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the memory used by the secondary objects.
+
+Loads people of the example tree with all their events, and reports for
+each class of secondary object the bytes used by an object keeping its
+attributes in slots, and by the same object keeping them in a dictionary,
+as it did before the classes declared slots.  Run with::
+
+    python3 -m gramps.gen.lib.test.memory_benchmark [PEOPLE]
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import sys
+import tracemalloc
+from collections import defaultdict
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib.baseobj import BaseObject, get_slots
+from gramps.gen.lib.serialize import from_dict, to_dict
+from gramps.gen.user import User
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "example.gramps")
+
+
+def get_attributes(obj):
+    """
+    Return the attributes held in the slots of an object, with their
+    mangled names.
+    """
+    attributes = {}
+    for klass in type(obj).__mro__:
+        for name in klass.__dict__.get("__slots__", ()):
+            if name.startswith("__"):
+                name = "_%s%s" % (klass.__name__.lstrip("_"), name)
+            if hasattr(obj, name):
+                attributes[name] = getattr(obj, name)
+    return attributes
+
+
+def dict_size(obj):
+    """
+    Return the bytes used by an object of a class without slots, holding
+    the same attributes as the given object in its dictionary.
+    """
+    replica = type(type(obj).__name__, (), {})()
+    replica.__dict__.update(get_attributes(obj))
+    return sys.getsizeof(replica) + sys.getsizeof(replica.__dict__)
+
+
+def walk(value, sizes):
+    """
+    Add the sizes of the secondary objects found in a value, with and
+    without slots, to a dictionary keyed by class name.
+    """
+    if isinstance(value, list):
+        for item in value:
+            walk(item, sizes)
+    elif isinstance(value, BaseObject):
+        if get_slots(type(value)) != ((), True):
+            size = sizes[type(value).__name__]
+            size[0] += 1
+            size[1] += dict_size(value)
+            size[2] += sys.getsizeof(value)
+        for item in value.get_object_state().values():
+            walk(item, sizes)
+
+
+def load(db, count):
+    """
+    Return the dictionaries of the first people of a database and of all
+    their events.
+    """
+    people = []
+    events = {}
+    for person in db.iter_people():
+        if len(people) == count:
+            break
+        people.append(to_dict(person))
+        for event_ref in person.get_event_ref_list():
+            handle = event_ref.ref
+            if handle not in events:
+                events[handle] = to_dict(db.get_event_from_handle(handle))
+    return people + list(events.values())
+
+
+def main(count=None):
+    """
+    Run the benchmark for a number of people, all if None.
+    """
+    db = import_as_dict(EXAMPLE, User())
+    dicts = load(db, count)
+
+    tracemalloc.start()
+    objs = [from_dict(data) for data in dicts]
+    loaded = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    sizes = defaultdict(lambda: [0, 0, 0])
+    walk(objs, sizes)
+    print(
+        "%d objects loaded in %d bytes, %d bytes each"
+        % (len(objs), loaded, loaded // len(objs))
+    )
+    print("%-14s %8s %12s %12s" % ("Class", "Objects", "Dict bytes", "Slot bytes"))
+    total = [0, 0, 0]
+    for name, size in sorted(sizes.items()):
+        print(
+            "%-14s %8d %12d %12d"
+            % (name, size[0], size[1] // size[0], size[2] // size[0])
+        )
+        total = [value + item for value, item in zip(total, size)]
+    print(
+        "%-14s %8d %12d %12d"
+        % ("All", total[0], total[1] // total[0], total[2] // total[0])
+    )
+    print(
+        "Slots save %d bytes, %.0f%% of the size of the secondary objects"
+        % (total[1] - total[2], 100 * (total[1] - total[2]) / total[1])
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,104 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the conversions between objects and dictionaries.
+
+Compares to_dict and from_dict with a JSON round trip, for the people,
+families and events of the example tree.  Run with::
+
+    python3 -m gramps.gen.lib.test.serialize_benchmark [ROUNDS]
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import json
+import os
+import sys
+from time import perf_counter
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib.serialize import from_dict, from_json, to_dict, to_json
+from gramps.gen.user import User
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "example.gramps")
+
+
+def json_to_dict(obj):
+    """
+    Convert an object into a dictionary with a JSON round trip.
+    """
+    return json.loads(to_json(obj))
+
+
+def json_from_dict(data):
+    """
+    Convert a dictionary into an object with a JSON round trip.
+    """
+    return from_json(json.dumps(data))
+
+
+def measure(func, values, rounds):
+    """
+    Return the number of conversions per second made by a function.
+    """
+    start = perf_counter()
+    for _ in range(rounds):
+        for value in values:
+            func(value)
+    return rounds * len(values) / (perf_counter() - start)
+
+
+def main(rounds=5):
+    """
+    Run the benchmark for each object type.
+    """
+    db = import_as_dict(EXAMPLE, User())
+    for obj_type, objs in (
+        ("Person", list(db.iter_people())),
+        ("Family", list(db.iter_families())),
+        ("Event", list(db.iter_events())),
+    ):
+        dicts = [to_dict(obj) for obj in objs]
+        size = sum(len(json.dumps(data)) for data in dicts) // len(dicts)
+        print("%s: %d objects, %d bytes of JSON each" % (obj_type, len(objs), size))
+        for label, func, values in (
+            ("to_dict, JSON", json_to_dict, objs),
+            ("to_dict", to_dict, objs),
+            ("from_dict, JSON", json_from_dict, dicts),
+            ("from_dict", from_dict, dicts),
+        ):
+            print(
+                "    %-16s %8.0f conversions/sec"
+                % (label, measure(func, values, rounds))
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
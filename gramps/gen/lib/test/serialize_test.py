@@ -18,8 +18,9 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 #
 
-""" Unittest for to_json, from_json """
+""" Unittest for to_json, from_json, to_dict, from_dict """
 
+import json
 import os
 import unittest
 
@@ -27,18 +28,42 @@ from ...const import DATA_DIR
 from ...db.utils import import_as_dict
 from ...user import User
 from .. import (
+    Address,
+    Attribute,
+    ChildRef,
     Citation,
+    Date,
     Event,
+    EventRef,
     Family,
+    LdsOrd,
+    Location,
     Media,
+    MediaRef,
+    Name,
     Note,
     Person,
+    PersonRef,
     Place,
+    PlaceName,
+    PlaceRef,
+    RepoRef,
     Repository,
     Source,
+    SrcAttribute,
+    StyledText,
+    StyledTextTag,
+    Surname,
     Tag,
+    Url,
+)
+from ..serialize import (
+    from_dict,
+    from_json,
+    get_materialize_stats,
+    to_dict,
+    to_json,
 )
-from ..serialize import from_json, to_json
 
 TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
 EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
@@ -111,6 +136,48 @@ class TagCheck(unittest.TestCase, BaseCheck):
         self.object = self.cls()
 
 
+class SecondaryCheck(unittest.TestCase):
+    classes = (
+        Address,
+        Attribute,
+        ChildRef,
+        Date,
+        EventRef,
+        LdsOrd,
+        Location,
+        MediaRef,
+        Name,
+        PersonRef,
+        PlaceName,
+        PlaceRef,
+        RepoRef,
+        SrcAttribute,
+        StyledText,
+        StyledTextTag,
+        Surname,
+        Url,
+    )
+
+    def test_slots(self):
+        for cls in self.classes:
+            with self.subTest(cls=cls.__name__):
+                obj = cls()
+                self.assertFalse(hasattr(obj, "__dict__"))
+                state = obj.get_object_state()
+                del state["_class"]
+                obj2 = cls.__new__(cls)
+                obj2.set_object_state(state)
+                self.assertEqual(obj.serialize(), obj2.serialize())
+
+    def test_from_json(self):
+        for cls in self.classes:
+            with self.subTest(cls=cls.__name__):
+                obj = cls()
+                self.assertEqual(to_dict(obj), json.loads(to_json(obj)))
+                self.assertEqual(obj.serialize(), from_json(to_json(obj)).serialize())
+                self.assertEqual(obj.serialize(), from_dict(to_dict(obj)).serialize())
+
+
 class DatabaseCheck(unittest.TestCase):
     maxDiff = None
 
@@ -128,6 +195,14 @@ def generate_cases(obj, data):
     name = "test_serialize_%s_%s" % (obj.__class__.__name__, obj.handle)
     setattr(DatabaseCheck, name, test)
 
+    def test_dict(self):
+        obj_dict = to_dict(obj)
+        self.assertEqual(obj_dict, json.loads(json_data))
+        self.assertEqual(obj.serialize(), from_dict(obj_dict).serialize())
+
+    name = "test_dict_%s_%s" % (obj.__class__.__name__, obj.handle)
+    setattr(DatabaseCheck, name, test_dict)
+
     def test_data(self):
         class_name = obj.__class__.__name__
         assert isinstance(data, dict), "Ensure that the data is a dict"
@@ -137,10 +212,29 @@ def generate_cases(obj, data):
             if (len(data.parent_family_list)) > 0:
                 # Get a handle:
                 assert isinstance(data.parent_family_list[0], str), "Test list access"
-
+            assert data.primary_name is data.primary_name, "Test wrapper cache"
+            assert isinstance(data.get_primary_name(), Name), "Test accessor type"
+            assert data.get_primary_name() is data.get_primary_name()
+            assert (
+                data.get_primary_name().get_first_name()
+                == obj.get_primary_name().get_first_name()
+            ), "Test accessor call"
+            birth_ref = obj.get_birth_ref()
+            if birth_ref is None:
+                assert data.get_birth_ref() is None, "Test event accessor call"
+            else:
+                assert data.get_birth_ref().ref == birth_ref.ref, "Test event accessor"
+            for event_ref in data.get_event_ref_list():
+                assert isinstance(event_ref, EventRef), "Test accessor type"
+            assert [ref.ref for ref in data.get_event_ref_list()] == [
+                ref["ref"] for ref in data["event_ref_list"]
+            ]
+
+        assert data.get_handle() == data["handle"], "Test accessor call"
         assert "_object" not in data.keys(), "Object not created"
-        assert data.get_handle() == data["handle"], "Test method call"
+        assert data.serialize() == obj.serialize(), "Test method call"
         assert "_object" in data.keys(), "Object created"
+        assert get_materialize_stats()[(class_name, "serialize")] > 0
         assert data["_object"].handle == data["handle"], "Object is correct"
         assert (
             data["_object"].__class__.__name__ == class_name
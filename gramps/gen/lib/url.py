@@ -57,6 +57,8 @@ class Url(SecondaryObject, PrivacyBase):
     allowing gramps to store information about internet resources.
     """
 
+    __slots__ = ("private", "path", "desc", "type")
+
     def __init__(self, source=None):
         """Create a new URL instance, copying from the source if present."""
         PrivacyBase.__init__(self, source)
@@ -45,7 +45,7 @@ from ..lib import (
     Note,
     Tag,
 )
-from ..utils.alive import probably_alive
+from ..utils.alive import probably_alive_many
 from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 
@@ -138,8 +138,11 @@ class LivingProxyDb(ProxyDbBase):
         """
         Protected version of iter_people
         """
+        living = probably_alive_many(
+            None, self.db, self.current_date, self.years_after_death
+        )
         for person in filter(None, self.db.iter_people()):
-            if self.__is_living(person):
+            if person.handle in living:
                 if self.mode == self.MODE_EXCLUDE_ALL:
                     continue
                 else:
@@ -257,9 +260,8 @@ class LivingProxyDb(ProxyDbBase):
         Returns False if the person is not considered living.
         """
         person_handle = person.get_handle()
-        unfil_person = self.get_unfiltered_person(person_handle)
-        return probably_alive(
-            unfil_person, self.db, self.current_date, self.years_after_death
+        return person_handle in probably_alive_many(
+            [person_handle], self.db, self.current_date, self.years_after_death
         )
 
     def __remove_living_from_family(self, family):
@@ -36,6 +36,7 @@ import types
 #
 # -------------------------------------------------------------------------
 from ..db.base import DbReadBase, DbWriteBase
+from ..db.dbconst import CHUNKSIZE
 from ..lib import (
     Citation,
     Event,
@@ -49,6 +50,7 @@ from ..lib import (
     Tag,
 )
 from ..const import GRAMPS_LOCALE as glocale
+from ..errors import HandleError
 
 
 class ProxyCursor:
@@ -561,6 +563,112 @@ class ProxyDbBase(DbReadBase):
         """
         return self.gfilter(self.include_tag, self.db.get_tag_from_handle(handle))
 
+    def __get_from_handles(self, obj_type, method, handles):
+        """
+        Helper function to get a list of objects, reading them into the
+        cache of the base database in bulk, one chunk at a time.
+        """
+        handles = list(handles)
+        objects = []
+        for start in range(0, len(handles), CHUNKSIZE):
+            chunk = handles[start : start + CHUNKSIZE]
+            self.basedb.prefetch_handles(obj_type, chunk)
+            objects.extend(method(handle) for handle in chunk)
+        return objects
+
+    def __get_raw_data_many(self, obj_type, method, handles):
+        """
+        Helper function to get a list of raw objects, reading them into the
+        cache of the base database in bulk, one chunk at a time.  The list
+        holds None for each object that is missing or filtered out.
+        """
+        handles = list(handles)
+        data = []
+        for start in range(0, len(handles), CHUNKSIZE):
+            chunk = handles[start : start + CHUNKSIZE]
+            self.basedb.prefetch_handles(obj_type, chunk)
+            for handle in chunk:
+                try:
+                    obj = method(handle)
+                except HandleError:
+                    obj = None
+                data.append(None if obj is None else obj.serialize())
+        return data
+
+    def get_people_from_handles(self, handles):
+        """
+        Finds the Person objects in the database from the passed gramps
+        handles.  The list holds None for each Person filtered out.
+        """
+        return self.__get_from_handles("Person", self.get_person_from_handle, handles)
+
+    def get_families_from_handles(self, handles):
+        """
+        Finds the Family objects in the database from the passed gramps
+        handles.  The list holds None for each Family filtered out.
+        """
+        return self.__get_from_handles("Family", self.get_family_from_handle, handles)
+
+    def get_events_from_handles(self, handles):
+        """
+        Finds the Event objects in the database from the passed gramps
+        handles.  The list holds None for each Event filtered out.
+        """
+        return self.__get_from_handles("Event", self.get_event_from_handle, handles)
+
+    def get_sources_from_handles(self, handles):
+        """
+        Finds the Source objects in the database from the passed gramps
+        handles.  The list holds None for each Source filtered out.
+        """
+        return self.__get_from_handles("Source", self.get_source_from_handle, handles)
+
+    def get_citations_from_handles(self, handles):
+        """
+        Finds the Citation objects in the database from the passed gramps
+        handles.  The list holds None for each Citation filtered out.
+        """
+        return self.__get_from_handles(
+            "Citation", self.get_citation_from_handle, handles
+        )
+
+    def get_places_from_handles(self, handles):
+        """
+        Finds the Place objects in the database from the passed gramps
+        handles.  The list holds None for each Place filtered out.
+        """
+        return self.__get_from_handles("Place", self.get_place_from_handle, handles)
+
+    def get_media_from_handles(self, handles):
+        """
+        Finds the Media objects in the database from the passed gramps
+        handles.  The list holds None for each Media filtered out.
+        """
+        return self.__get_from_handles("Media", self.get_media_from_handle, handles)
+
+    def get_repositories_from_handles(self, handles):
+        """
+        Finds the Repository objects in the database from the passed gramps
+        handles.  The list holds None for each Repository filtered out.
+        """
+        return self.__get_from_handles(
+            "Repository", self.get_repository_from_handle, handles
+        )
+
+    def get_notes_from_handles(self, handles):
+        """
+        Finds the Note objects in the database from the passed gramps
+        handles.  The list holds None for each Note filtered out.
+        """
+        return self.__get_from_handles("Note", self.get_note_from_handle, handles)
+
+    def get_tags_from_handles(self, handles):
+        """
+        Finds the Tag objects in the database from the passed gramps
+        handles.  The list holds None for each Tag filtered out.
+        """
+        return self.__get_from_handles("Tag", self.get_tag_from_handle, handles)
+
     def get_person_from_gramps_id(self, val):
         """
         Finds a Person in the database from the passed Gramps ID.
@@ -832,6 +940,40 @@ class ProxyDbBase(DbReadBase):
     def get_raw_tag_data(self, handle):
         return self.get_tag_from_handle(handle).serialize()
 
+    def get_raw_person_data_many(self, handles):
+        return self.__get_raw_data_many("Person", self.get_person_from_handle, handles)
+
+    def get_raw_family_data_many(self, handles):
+        return self.__get_raw_data_many("Family", self.get_family_from_handle, handles)
+
+    def get_raw_event_data_many(self, handles):
+        return self.__get_raw_data_many("Event", self.get_event_from_handle, handles)
+
+    def get_raw_source_data_many(self, handles):
+        return self.__get_raw_data_many("Source", self.get_source_from_handle, handles)
+
+    def get_raw_citation_data_many(self, handles):
+        return self.__get_raw_data_many(
+            "Citation", self.get_citation_from_handle, handles
+        )
+
+    def get_raw_place_data_many(self, handles):
+        return self.__get_raw_data_many("Place", self.get_place_from_handle, handles)
+
+    def get_raw_media_data_many(self, handles):
+        return self.__get_raw_data_many("Media", self.get_media_from_handle, handles)
+
+    def get_raw_repository_data_many(self, handles):
+        return self.__get_raw_data_many(
+            "Repository", self.get_repository_from_handle, handles
+        )
+
+    def get_raw_note_data_many(self, handles):
+        return self.__get_raw_data_many("Note", self.get_note_from_handle, handles)
+
+    def get_raw_tag_data_many(self, handles):
+        return self.__get_raw_data_many("Tag", self.get_tag_from_handle, handles)
+
     def has_person_handle(self, handle):
         """
         Returns True if the handle exists in the current Person database.
@@ -1534,9 +1534,19 @@ class RelationshipCalculator:
         of first contains loops, and parents
         will be looked up anyway an stored if common. At end the doubles
         are filtered out
+
+        When the database has a genealogy graph, parents are looked up in
+        it, and are passed to the recursive calls by handle.
         """
-        if person is None or not person.handle:
+        graph = db.get_genealogy_graph()
+        if isinstance(person, str):
+            handle = person
+            if not graph.has_person(handle):
+                return
+        elif person is None or not person.handle:
             return
+        else:
+            handle = person.handle
 
         if depth > self.__max_depth:
             self.__max_depth_reached = True
@@ -1550,23 +1560,23 @@ class RelationshipCalculator:
         store = True  # normally we store all parents
         if stoprecursemap:
             store = False  # but not if a stop map given
-            if person.handle in stoprecursemap:
+            if handle in stoprecursemap:
                 commonancestor = True
                 store = True
 
         # add person to the map, take into account that person can be obtained
         # from different sides
-        if person.handle in pmap:
+        if handle in pmap:
             # person is already a grandparent in another branch, we already have
             # had lookup of all parents, we call that a crosslink
             if not stoprecursemap:
                 self.__crosslinks = True
-            pmap[person.handle][0] += [rel_str]
-            pmap[person.handle][1] += [rel_fam]
+            pmap[handle][0] += [rel_str]
+            pmap[handle][1] += [rel_fam]
             # check if there is no loop father son of his son, ...
             # loop means person is twice reached, same rel_str in begin
-            for rel1 in pmap[person.handle][0]:
-                for rel2 in pmap[person.handle][0]:
+            for rel1 in pmap[handle][0]:
+                for rel2 in pmap[handle][0]:
                     if len(rel1) < len(rel2) and rel1 == rel2[: len(rel1)]:
                         # loop, keep one message in storage!
                         self.__loop_detected = True
@@ -1577,13 +1587,15 @@ class RelationshipCalculator:
                                 "Person %(person)s connects to himself via %(relation)s"
                             )
                             % {
-                                "person": person.get_primary_name().get_name(),
+                                "person": db.get_person_from_handle(handle)
+                                .get_primary_name()
+                                .get_name(),
                                 "relation": rel2[len(rel1) :],
                             }
                         ]
                         return
         elif store:
-            pmap[person.handle] = [[rel_str], [rel_fam]]
+            pmap[handle] = [[rel_str], [rel_fam]]
 
         # having added person to the pmap, we only look up recursively to
         # parents if this person is not common relative
@@ -1592,29 +1604,39 @@ class RelationshipCalculator:
             # don't continue search, great speedup!
             return
 
-        family_handles = []
-        main = person.get_main_parents_family_handle()
-        if main:
-            family_handles = [main]
+        if isinstance(person, str):
+            parent_family_handles = graph.get_parent_family_handles(handle)
+        else:
+            parent_family_handles = person.get_parent_family_handle_list()
+        family_handles = parent_family_handles[:1]
         if self.__all_families:
-            family_handles = person.get_parent_family_handle_list()
+            family_handles = parent_family_handles
 
         try:
             parentstodo = {}
             fam = 0
             for family_handle in family_handles:
                 rel_fam_new = rel_fam + [fam]
-                family = db.get_family_from_handle(family_handle)
-                if not family:
-                    continue
+                if graph is not None:
+                    if not graph.has_family(family_handle):
+                        continue
+                    fhandle = graph.get_father_handle(family_handle)
+                    mhandle = graph.get_mother_handle(family_handle)
+                    child_refs = graph.get_child_refs(family_handle)
+                else:
+                    family = db.get_family_from_handle(family_handle)
+                    if not family:
+                        continue
+                    fhandle = family.father_handle
+                    mhandle = family.mother_handle
+                    child_refs = [
+                        (ref.ref, ref.get_father_relation(), ref.get_mother_relation())
+                        for ref in family.get_child_ref_list()
+                    ]
                 # obtain childref for this person
                 childrel = [
-                    (ref.get_mother_relation(), ref.get_father_relation())
-                    for ref in family.get_child_ref_list()
-                    if ref.ref == person.handle
+                    (mrel, frel) for (ref, frel, mrel) in child_refs if ref == handle
                 ]
-                fhandle = family.father_handle
-                mhandle = family.mother_handle
                 for data in [
                     (
                         fhandle,
@@ -1630,7 +1652,10 @@ class RelationshipCalculator:
                     ),
                 ]:
                     if data[0] and data[0] not in parentstodo:
-                        persontodo = db.get_person_from_handle(data[0])
+                        if graph is not None:
+                            persontodo = data[0]
+                        else:
+                            persontodo = db.get_person_from_handle(data[0])
                         if data[3] == ChildRefType.BIRTH:
                             addstr = data[1]
                         elif not self.__only_birth:
@@ -1660,11 +1685,7 @@ class RelationshipCalculator:
                     # family without parents, add brothers for orig person
                     # other person has recusemap, and will stop when seeing
                     # the brother.
-                    child_list = [
-                        ref.ref
-                        for ref in family.get_child_ref_list()
-                        if ref.ref != person.handle
-                    ]
+                    child_list = [ref for (ref, _, _) in child_refs if ref != handle]
                     addstr = self.REL_SIBLING
                     for chandle in child_list:
                         if chandle in pmap:
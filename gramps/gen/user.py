@@ -40,6 +40,8 @@ class UserBase(metaclass=ABCMeta):
         self._fileout = sys.stderr  # redirected to mocks by unit tests
         self.uistate = uistate
         self.dbstate = dbstate
+        # Number of processes the actions may use, None for the settings
+        self.jobs = None
 
     @abstractmethod
     def begin_progress(self, title, message, steps):
@@ -31,6 +31,7 @@ privacy in reports and exports.
 #
 # -------------------------------------------------------------------------
 import logging
+import weakref
 
 LOG = logging.getLogger(".gen.utils.alive")
 
@@ -39,6 +40,7 @@ LOG = logging.getLogger(".gen.utils.alive")
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from ..db.dbconst import CHUNKSIZE
 from ..display.name import displayer as name_displayer
 from ..lib.date import Date, Today
 from ..errors import DatabaseError
@@ -702,16 +704,113 @@ def probably_alive_range(
     """
     # First, find the real database to use all people
     # for determining alive status:
-    from ..proxy.proxybase import ProxyDbBase
-
-    basedb = db
-    while isinstance(basedb, ProxyDbBase):
-        basedb = basedb.db
+    basedb = _get_base_db(db)
     # Now, we create a wrapper for doing work:
     pb = ProbablyAlive(basedb, max_sib_age_diff, max_age_prob_alive, avg_generation_gap)
     return pb.probably_alive_range(person)
 
 
+def _get_base_db(db):
+    """
+    Return the database behind any proxies.
+    """
+    from ..proxy.proxybase import ProxyDbBase
+
+    while isinstance(db, ProxyDbBase):
+        db = db.db
+    return db
+
+
+# -------------------------------------------------------------------------
+#
+# probably_alive_many
+#
+# -------------------------------------------------------------------------
+# Estimated birth and death dates of the people of a database, by database,
+# with the state of the database and the parameters they were estimated with
+_RANGES = weakref.WeakKeyDictionary()
+
+
+def _get_ranges(db, params):
+    """
+    Return a dictionary to keep the estimated birth and death dates of the
+    people of a database, by handle, kept until the database changes.
+    """
+    changes = getattr(db, "has_changed", None)
+    if not isinstance(changes, int) or getattr(db, "transaction", None):
+        return {}
+    state = (db.get_dbid(), changes, params)
+    ranges = _RANGES.get(db)
+    if ranges is None or ranges[0] != state:
+        ranges = _RANGES[db] = (state, {})
+    return ranges[1]
+
+
+def probably_alive_many(
+    handles,
+    db,
+    current_date=None,
+    limit=0,
+    max_sib_age_diff=None,
+    max_age_prob_alive=None,
+    avg_generation_gap=None,
+):
+    """
+    Return the set of the handles of the people who may be alive on
+    current_date, of the given handles, or of all the people if None.
+
+    The result is the same as probably_alive for each person, but the
+    estimated birth and death dates of the people are computed once, in
+    bulk, and kept for all the calls with the same parameters until the
+    database changes.
+
+    :param handles: handles of the people to check, or None for everyone
+    :param current_date: a date object that is not estimated or modified
+                         (defaults to today)
+    :param limit: number of years to check beyond death_date
+    :param max_sib_age_diff: maximum sibling age difference, in years
+    :param max_age_prob_alive: maximum age of a person, in years
+    :param avg_generation_gap: average generation gap, in years
+    """
+    basedb = _get_base_db(db)
+    if max_sib_age_diff is None:
+        max_sib_age_diff = _MAX_SIB_AGE_DIFF
+    if max_age_prob_alive is None:
+        max_age_prob_alive = _MAX_AGE_PROB_ALIVE
+    if avg_generation_gap is None:
+        avg_generation_gap = _AVG_GENERATION_GAP
+    ranges = _get_ranges(
+        basedb, (max_sib_age_diff, max_age_prob_alive, avg_generation_gap)
+    )
+    if handles is None:
+        handles = basedb.get_person_handles()
+    else:
+        handles = list(handles)
+    missing = [handle for handle in handles if handle not in ranges]
+    if missing:
+        pb = ProbablyAlive(
+            basedb, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
+        )
+        for start in range(0, len(missing), CHUNKSIZE):
+            chunk = missing[start : start + CHUNKSIZE]
+            for handle, person in zip(chunk, basedb.get_people_from_handles(chunk)):
+                ranges[handle] = pb.probably_alive_range(person)[:2]
+    if current_date is None:
+        current_date = Today()
+    alive = set()
+    for handle in handles:
+        birth, death = ranges[handle]
+        if not birth or not death:
+            # no evidence, must consider alive
+            alive.add(handle)
+            continue
+        if limit:
+            death = death + limit
+        if current_date.match(birth, ">=") and current_date.match(death, "<="):
+            alive.add(handle)
+    return alive
+
+
 def update_constants():
     """
     Used to update the constants that are cached in this module.
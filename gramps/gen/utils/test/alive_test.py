@@ -0,0 +1,108 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for probably_alive_many.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ...const import DATA_DIR
+from ...db import DbTxn
+from ...db.utils import import_as_dict
+from ...lib import Date, Event, EventRef, EventType
+from ...proxy import LivingProxyDb
+from ...user import User
+from ..alive import probably_alive, probably_alive_many
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "example.gramps")
+
+
+class ProbablyAliveManyTest(unittest.TestCase):
+    """
+    Tests of probably_alive_many.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def __get_alive(self, date, limit=0):
+        return {
+            person.handle
+            for person in self.db.iter_people()
+            if probably_alive(person, self.db, date, limit)
+        }
+
+    def test_same_as_probably_alive(self):
+        for year, limit in ((1900, 0), (1950, 10), (2000, 0)):
+            date = Date(year, 1, 1)
+            self.assertEqual(
+                probably_alive_many(None, self.db, date, limit),
+                self.__get_alive(date, limit),
+            )
+        handles = self.db.get_person_handles()[:100]
+        date = Date(1900, 1, 1)
+        self.assertEqual(
+            probably_alive_many(handles, self.db, date),
+            self.__get_alive(date) & set(handles),
+        )
+
+    def test_living_proxy(self):
+        date = Date()
+        date.set_year(1950)
+        proxy = LivingProxyDb(self.db, LivingProxyDb.MODE_EXCLUDE_ALL, 1950)
+        self.assertEqual(
+            {person.handle for person in proxy.iter_people()},
+            set(self.db.get_person_handles()) - self.__get_alive(date),
+        )
+
+    def test_change(self):
+        date = Date(2000, 1, 1)
+        alive = probably_alive_many(None, self.db, date)
+        handle = sorted(alive)[0]
+        person = self.db.get_person_from_handle(handle)
+        with DbTxn("Add death", self.db) as trans:
+            event = Event()
+            event.set_type(EventType.DEATH)
+            event.set_date_object(Date(1990, 1, 1))
+            self.db.add_event(event, trans)
+            event_ref = EventRef()
+            event_ref.ref = event.handle
+            person.set_death_ref(event_ref)
+            self.db.commit_person(person, trans)
+        self.assertEqual(probably_alive_many(None, self.db, date), alive - {handle})
+        self.db.undo()
+        self.assertEqual(probably_alive_many(None, self.db, date), alive)
+
+
+if __name__ == "__main__":
+    unittest.main()
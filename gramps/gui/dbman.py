@@ -63,7 +63,13 @@ from .ddtargets import DdTargets
 from gramps.gen.recentfiles import rename_filename, remove_filename
 from .glade import Glade
 from gramps.gen.db.exceptions import DbException
-from gramps.gen.db.utils import make_database, open_database
+from gramps.gen.db.utils import (
+    DB_PROFILES,
+    get_profile_from_path,
+    make_database,
+    open_database,
+    set_profile_for_path,
+)
 from gramps.gen.config import config
 from .listmodel import ListModel
 from gramps.gen.constfunc import win
@@ -185,6 +191,7 @@ class DbManager(CLIDbManager, ManagedWindow):
             "rename_btn",
             "convert_btn",
             "repair_btn",
+            "profile_btn",
             "rcs_btn",
             "msg",
             "close_btn",
@@ -251,6 +258,7 @@ class DbManager(CLIDbManager, ManagedWindow):
         self.info_btn.connect("clicked", self.__info_db)
         self.close_btn.connect("clicked", self.__close_db)
         self.repair_btn.connect("clicked", self.__repair_db)
+        self.profile_btn.connect("clicked", self.__profile_db)
         self.selection.connect("changed", self.__selection_changed)
         self.dblist.connect("button-press-event", self.__button_press)
         self.dblist.connect("key-press-event", self.__key_press)
@@ -320,6 +328,7 @@ class DbManager(CLIDbManager, ManagedWindow):
             self.close_btn.set_sensitive(False)
             self.rcs_btn.set_sensitive(False)
             self.repair_btn.set_sensitive(False)
+            self.profile_btn.set_sensitive(False)
             self.remove_btn.set_sensitive(False)
             return
 
@@ -368,6 +377,9 @@ class DbManager(CLIDbManager, ManagedWindow):
 
         self.rename_btn.set_sensitive(True)
         self.info_btn.set_sensitive(True)
+        self.profile_btn.set_sensitive(
+            not is_rev and store.get_value(node, BACKEND_COL) != UNAVAILABLE
+        )
         self.remove_btn.set_sensitive(True)
         self.new_btn.set_sensitive(True)
 
@@ -948,6 +960,46 @@ class DbManager(CLIDbManager, ManagedWindow):
         summary = self.get_dbdir_summary(dirname, name)
         Information(self.uistate, summary, track=self.track)
 
+    def __profile_db(self, obj):
+        """
+        Select the tuning profile used when the database is opened.
+        """
+        store, node = self.selection.get_selected()
+        name = store[node][NAME_COL]
+        dirname = store[node][PATH_COL]
+
+        dialog = Gtk.Dialog(title=_("Tuning profile"), transient_for=self.top)
+        dialog.set_modal(True)
+        dialog.add_button(_("_Cancel"), Gtk.ResponseType.CANCEL)
+        dialog.add_button(_("_OK"), Gtk.ResponseType.OK)
+        dialog.set_default_response(Gtk.ResponseType.OK)
+        label = Gtk.Label(
+            label=_(
+                "Tuning profile of the '%s' Family Tree.\n"
+                "The profile is used when the Family Tree is next opened."
+            )
+            % name
+        )
+        combo = Gtk.ComboBoxText()
+        for profile, profile_name in DB_PROFILES.items():
+            combo.append(profile, profile_name)
+        combo.set_active_id(get_profile_from_path(dirname))
+        vbox = dialog.get_content_area()
+        vbox.set_spacing(6)
+        vbox.set_border_width(12)
+        vbox.pack_start(label, False, False, 0)
+        vbox.pack_start(combo, False, False, 0)
+        dialog.show_all()
+
+        if dialog.run() == Gtk.ResponseType.OK:
+            try:
+                set_profile_for_path(dirname, combo.get_active_id())
+            except OSError as msg:
+                ErrorDialog(
+                    _("Could not set the tuning profile"), str(msg), parent=self.top
+                )
+        dialog.destroy()
+
     def __repair_db(self, obj):
         """
         Start the repair process by calling the start_editing option on
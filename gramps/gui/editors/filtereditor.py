@@ -1065,7 +1065,9 @@ class EditFilter(ManagedWindow):
 #
 # -------------------------------------------------------------------------
 class ShowResults(ManagedWindow):
-    def __init__(self, db, uistate, track, handle_list, filtname, namespace):
+    def __init__(
+        self, db, uistate, track, handle_list, filtname, namespace, rule_list=None
+    ):
         ManagedWindow.__init__(self, uistate, track, self)
 
         self.db = db
@@ -1103,8 +1105,44 @@ class ShowResults(ManagedWindow):
             name, gid = self.get_name_id(handle)
             model.append(row=[name, gid])
 
+        if rule_list:
+            self.add_rule_stats(rule_list)
+
         self.show()
 
+    def add_rule_stats(self, rule_list):
+        """
+        Show the time each rule of the filter spent preparing, and the
+        measured time and matches of its applies, in the order the rules
+        were applied.
+        """
+        lines = []
+        for rule in rule_list:
+            values = {"rule": rule.name, "seconds": rule.prepare_time}
+            if rule.apply_count:
+                values["micro"] = 1e6 * rule.apply_time / rule.apply_count
+                values["percent"] = 100 * rule.apply_matches / rule.apply_count
+                if rule.prepare_reused:
+                    line = _(
+                        "%(rule)s: prepared results reused, "
+                        "%(micro).1f microseconds per object, "
+                        "%(percent).0f%% matched"
+                    )
+                else:
+                    line = _(
+                        "%(rule)s: prepared in %(seconds).3f seconds, "
+                        "%(micro).1f microseconds per object, "
+                        "%(percent).0f%% matched"
+                    )
+            elif rule.prepare_reused:
+                line = _("%(rule)s: prepared results reused")
+            else:
+                line = _("%(rule)s: prepared in %(seconds).3f seconds")
+            lines.append(line % values)
+        label = Gtk.Label(label="\n".join(lines), halign=Gtk.Align.START)
+        label.show()
+        self.get_widget("dialog-vbox4").pack_start(label, False, False, 6)
+
     def get_name_id(self, handle):
         if self.namespace == "Person":
             person = self.db.get_person_from_handle(handle)
@@ -1324,6 +1362,7 @@ class FilterEditor(ManagedWindow):
                 handle_list,
                 filt.get_name(),
                 self.namespace,
+                filt.rule_order,
             )
 
     def delete_filter(self, obj):
@@ -53,6 +53,7 @@ It keeps a FlatNodeMap, and obtains data from database as needed
 # -------------------------------------------------------------------------
 import logging
 import bisect
+import re
 from time import perf_counter
 
 _LOG = logging.getLogger(".gui.basetreemodel")
@@ -62,6 +63,7 @@ _LOG = logging.getLogger(".gui.basetreemodel")
 # GNOME/GTK modules
 #
 # -------------------------------------------------------------------------
+from gi.repository import GLib
 from gi.repository import GObject
 from gi.repository import Gtk
 
@@ -72,6 +74,7 @@ from gi.repository import Gtk
 # -------------------------------------------------------------------------
 from gramps.gen.filters import SearchFilter, ExactSearchFilter
 from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.config import config
 from .basemodel import BaseModel
 from ...user import User
 from gramps.gen.proxy.cache import CacheProxyDb
@@ -84,6 +87,9 @@ from gramps.gen.proxy.cache import CacheProxyDb
 
 UEMPTY = ""
 
+# Search texts looked up in the full-text index of the database
+TEXT_SEARCH = re.compile(r"\w{3,}")
+
 
 class FlatNodeMap:
     """
@@ -449,6 +455,16 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             so as to have localized sort
     """
 
+    # Class name of the objects, if they are in the full-text index of the
+    # database, and the columns whose values are part of their indexed text
+    text_type = None
+    text_columns = ()
+    # Class name of the objects, if the database may store their sort keys,
+    # and the class names of the other objects read by the sort function of
+    # each column
+    sort_key_type = None
+    sort_key_depends = {}
+
     def __init__(
         self,
         db,
@@ -484,6 +500,9 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # get the function that maps data to sort_keys
         self.sort_func = lambda x: glocale.sort_key(self.smap[col](x))
         self.sort_col = scol
+        self.sort_key_col = col
+        self._sort_key_queue = []
+        self._sort_key_source = None
         self.skip = skip
         self._in_build = False
 
@@ -502,6 +521,9 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         Unset all elements that prevent garbage collection
         """
         BaseModel.destroy(self)
+        if self._sort_key_source is not None:
+            GLib.source_remove(self._sort_key_source)
+            self._sort_key_source = None
         self.db = None
         self.sort_func = None
         if self.node_map:
@@ -519,6 +541,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # you reattach the model to the treeview so that the treeview updates
           with the new entries
         """
+        self.search_col = None
         if search:
             if search[0]:
                 # following is None if no data given in filter sidebar
@@ -530,6 +553,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                     col = search[1][0]
                     text = search[1][1]
                     inv = search[1][2]
+                    self.search_col = col
                     func = lambda x: self._get_value(x, col) or UEMPTY
                     if search[2]:
                         self.search = ExactSearchFilter(func, text, inv)
@@ -567,18 +591,95 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         return None
 
+    def get_sort_key_view(self):
+        """
+        Return the name under which the database stores the sort keys of
+        the sort column, or None if they are not stored.  The name changes
+        with the locale and the display formats, which the keys depend on.
+        """
+        if self.sort_key_type is None:
+            return None
+        return "%s:%d:%s:%s:%s:%s" % (
+            self.__class__.__name__,
+            self.sort_key_col,
+            glocale.get_collation(),
+            config.get("preferences.name-format"),
+            config.get("preferences.date-format"),
+            config.get("preferences.place-format"),
+        )
+
+    def store_sort_keys(self, keys, complete=False):
+        """
+        Store (sort_key, handle) tuples of the sort column in the database.
+        """
+        view = self.get_sort_key_view()
+        if view is not None:
+            self.db.set_sort_keys(
+                self.sort_key_type,
+                view,
+                keys,
+                self.sort_key_depends.get(self.sort_key_col, ()),
+                complete,
+            )
+
+    def queue_sort_keys(self, keys):
+        """
+        Store (sort_key, handle) tuples of the sort column in the database
+        once the application is idle, together with the other rows changed
+        by then.
+        """
+        if self.sort_key_type is None:
+            return
+        self._sort_key_queue.extend(keys)
+        if self._sort_key_source is None:
+            self._sort_key_source = GLib.idle_add(self._flush_sort_keys)
+
+    def _flush_sort_keys(self):
+        """
+        Store the queued sort keys, unless the database was closed since.
+        """
+        self._sort_key_source = None
+        keys, self._sort_key_queue = self._sort_key_queue, []
+        if self.db is not None and self.db.is_open():
+            self.store_sort_keys(keys)
+        return False
+
     def sort_keys(self):
         """
         Return the (sort_key, handle) list of all data that can maximally
         be shown.
         This list is sorted ascending, via localized string sort.
+
+        The keys stored by the database are used, and only the missing ones
+        are computed, and stored for the next time.
         """
-        # use cursor as a context manager
-        with self.gen_cursor() as cursor:
-            # loop over database and store the sort field, and the handle
-            srt_keys = [(self.sort_func(data), key) for key, data in cursor]
-            srt_keys.sort()
-            return srt_keys
+        stored = None
+        view = self.get_sort_key_view()
+        if view is not None:
+            stored = self.db.get_sort_keys(
+                self.sort_key_type,
+                view,
+                self.sort_key_depends.get(self.sort_key_col, ()),
+            )
+        if stored:
+            srt_keys = []
+            missing = []
+            for handle in self.db.method("get_%s_handles", self.sort_key_type)():
+                sort_key = stored.get(handle)
+                if sort_key is None:
+                    sort_key = self.sort_func(self.map(handle))
+                    missing.append((sort_key, handle))
+                srt_keys.append((sort_key, handle))
+            self.store_sort_keys(missing)
+        else:
+            # use cursor as a context manager
+            with self.gen_cursor() as cursor:
+                # loop over database and store the sort field, and the handle
+                srt_keys = [(self.sort_func(data), key) for key, data in cursor]
+            if stored is not None:
+                self.store_sort_keys(srt_keys, complete=True)
+        srt_keys.sort()
+        return srt_keys
 
     def _rebuild_search(self, ignore=None):
         """function called when view must be build, given a search text
@@ -591,10 +692,12 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             if not allkeys:
                 allkeys = self.sort_keys()
             if self.search and self.search.text:
+                handles = self._search_text()
                 dlist = [
                     h
                     for h in allkeys
-                    if self.search.match(h[1], self.db)
+                    if (handles is None or h[1] in handles)
+                    and self.search.match(h[1], self.db)
                     and h[1] not in self.skip
                     and h[1] != ignore
                 ]
@@ -613,6 +716,25 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             self.node_map.clear_map()
         self._in_build = False
 
+    def _search_text(self):
+        """
+        Return the handles of the objects found by the full-text index of
+        the database for the text in the top search bar, or None if the
+        index can't be used.  Only single words are looked up, as the
+        column values may differ from the indexed text in whitespace.
+        """
+        if (
+            self.text_type is None
+            or self.search_col not in self.text_columns
+            or self.search.invert
+            or not TEXT_SEARCH.fullmatch(self.search.text)
+        ):
+            return None
+        matches = self.db.search_text(self.search.text, [self.text_type])
+        if matches is None:
+            return None
+        return {handle for _, handle in matches}
+
     def _rebuild_filter(self, ignore=None):
         """function called when view must be build, given filter options
         in the filter sidebar
@@ -655,6 +777,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             return  # row is already displayed
         data = self.map(handle)
         insert_val = (self.sort_func(data), handle)
+        self.queue_sort_keys([insert_val])
         if not self.search or (self.search and self.search.match(handle, self.db)):
             # row needs to be added to the model
             insert_path = self.node_map.insert(insert_val)
@@ -691,6 +814,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             self.add_row_by_handle(handle)
         else:
             # the row is visible in the view, is changed, but the order is fixed
+            self.queue_sort_keys([(newsortkey, handle)])
             path = self.node_map.get_path_from_handle(handle)
             node = self.do_get_iter(path)[1]
             self.row_changed(path, node)
@@ -55,6 +55,9 @@ from gramps.gen.lib import Note, NoteType, StyledText
 class NoteModel(FlatBaseModel):
     """ """
 
+    text_type = "Note"
+    text_columns = (0, 1)
+
     def __init__(
         self,
         db,
@@ -561,6 +561,21 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
     Listed people model.
     """
 
+    sort_key_type = "Person"
+    sort_key_depends = {
+        3: ("Event",),
+        4: ("Event", "Place"),
+        5: ("Event",),
+        6: ("Event", "Place"),
+        7: ("Family", "Person"),
+        8: ("Family",),
+        9: ("Family",),
+        10: ("Family",),
+        11: ("Note",),
+        13: ("Tag",),
+        15: ("Tag",),
+    }
+
     def __init__(
         self,
         db,
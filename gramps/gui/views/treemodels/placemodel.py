@@ -276,6 +276,9 @@ class PlaceListModel(PlaceBaseModel, FlatBaseModel):
     Flat place model.  (Original code in PlaceBaseModel).
     """
 
+    text_type = "Place"
+    text_columns = (0, 1, 11)
+
     def __init__(
         self,
         db,
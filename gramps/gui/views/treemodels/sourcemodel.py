@@ -51,6 +51,9 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 class SourceModel(FlatBaseModel):
+    text_type = "Source"
+    text_columns = (0, 1, 2, 3, 4)
+
     def __init__(
         self,
         db,
@@ -30,7 +30,10 @@ Database API interface
 # -------------------------------------------------------------------------
 import logging
 import json
+import pickle
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
@@ -40,15 +43,23 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # ------------------------------------------------------------------------
 from gramps.gen.db.dbconst import (
+    ARRAYSIZE,
+    BATCHSIZE,
+    CHUNKSIZE,
+    CLASS_TO_KEY_MAP,
     DBLOGNAME,
+    DBMODE_R,
+    FAMILY_KEY,
     KEY_TO_CLASS_MAP,
     KEY_TO_NAME_MAP,
+    PERSON_KEY,
     REFERENCE_KEY,
     TXNADD,
     TXNDEL,
     TXNUPD,
 )
 from gramps.gen.db.generic import DbGeneric
+from gramps.gen.db.utils import get_dbid_from_path, make_database
 from gramps.gen.lib import (
     Citation,
     Event,
@@ -68,6 +79,66 @@ from gramps.gen.updatecallback import UpdateCallback
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
+# Unloaded database used by a worker process of a parallel rebuild, or
+# read-only database used by a worker process of map_data
+_WORKER_DB = None
+# Function and context of the worker processes of map_data
+_WORKER_CONTEXT = None
+
+# Classes of the objects in the full-text index
+TEXT_INDEX_CLASSES = ("Citation", "Note", "Person", "Place", "Source")
+
+# Number of list views whose sort keys are kept, the most recently stored
+SORT_KEY_VIEWS = 32
+
+
+def _init_worker(serializer):
+    """
+    Initialize a worker process of a parallel rebuild.
+    """
+    global _WORKER_DB
+    _WORKER_DB = DBAPI()
+    _WORKER_DB.serializer = serializer
+
+
+def _call_worker(method_name, *args):
+    """
+    Call a method of the database of a worker process.
+    """
+    return getattr(_WORKER_DB, method_name)(*args)
+
+
+def _init_map_worker(directory, context):
+    """
+    Initialize a worker process of map_data, opening the database in the
+    directory read-only.
+    """
+    global _WORKER_DB, _WORKER_CONTEXT
+    _WORKER_DB = make_database(get_dbid_from_path(directory))
+    _WORKER_DB.load(directory, mode=DBMODE_R, update=False)
+    _WORKER_CONTEXT = pickle.loads(context)
+
+
+def _call_map_worker(rows):
+    """
+    Call the function of a worker process of map_data on serialized rows.
+    """
+    function, context = _WORKER_CONTEXT
+    string_to_data = _WORKER_DB.serializer.string_to_data
+    rows = [(handle, string_to_data(data)) for handle, data in rows]
+    return function(_WORKER_DB, context, rows)
+
+
+def _get_text_data(obj):
+    """
+    Return the text data of an object and its child objects, as searched
+    by matches_string.
+    """
+    result = [item for item in obj.get_text_data_list() if item]
+    for child in obj.get_text_data_child_list():
+        result.extend(_get_text_data(child))
+    return result
+
 
 # -------------------------------------------------------------------------
 #
@@ -79,9 +150,54 @@ class DBAPI(DbGeneric):
     Database backends class for DB-API 2.0 databases
     """
 
+    def __init__(self, directory=None):
+        # Objects committed in a batch transaction, waiting to be written
+        self._pending = {}
+        self._pending_ids = {}
+        self._pending_count = 0
+        # Handles of tables that were empty when the batch transaction began
+        self._batch_handles = {}
+        # Objects whose references are written when the batch is closed
+        self._deferred = {}
+        self._deferred_stale = set()
+        self._secondary_fields = {}
+        # Columns of the indexed JSON paths, by class name and path
+        self._index_columns = {}
+        # Whether the full-text index is maintained
+        self._text_index = False
+        # Whether the sort keys of the list views are stored
+        self._sort_keys = False
+        # Classes whose views were invalidated in the current transaction
+        self._sort_key_classes = set()
+        self.batch_size = BATCHSIZE
+        self.defer_references = True
+        super().__init__(directory)
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
+    def _get_thread_reader(self):
+        """
+        Return the connection used for reads by the calling thread.
+
+        Backends with a pool of read-only connections return one of them
+        for threads other than the one that loaded the database.
+        """
+        return self.dbapi
+
+    def _get_reader(self, flush=True):
+        """
+        Return the connection used for reads by the calling thread.
+
+        Reads on the primary connection first write the buffered commits of
+        a batch transaction, unless flush is False.  Reads on a reader
+        connection only see committed data.
+        """
+        reader = self._get_thread_reader()
+        if flush and reader is self.dbapi:
+            self._flush_pending()
+        return reader
+
     def use_json_data(self):
         """
         A DBAPI level method for testing if the
@@ -238,15 +354,176 @@ class DBAPI(DbGeneric):
         self.dbapi.execute("CREATE INDEX place_enclosed_by ON place(enclosed_by)")
         self.dbapi.execute("CREATE INDEX place_gramps_id ON place(gramps_id)")
         self.dbapi.execute("CREATE INDEX tag_name ON tag(name)")
-        self.dbapi.execute("CREATE INDEX reference_ref_handle ON reference(ref_handle)")
+        self._create_reference_indexes()
         self.dbapi.execute("CREATE INDEX family_gramps_id ON family(gramps_id)")
         self.dbapi.execute("CREATE INDEX event_gramps_id ON event(gramps_id)")
         self.dbapi.execute("CREATE INDEX repository_gramps_id ON repository(gramps_id)")
         self.dbapi.execute("CREATE INDEX note_gramps_id ON note(gramps_id)")
-        self.dbapi.execute("CREATE INDEX reference_obj_handle ON reference(obj_handle)")
 
         self.dbapi.commit()
 
+    def _create_indexes(self, rebuild=False):
+        self._index_columns = {}
+        for obj_key, class_name in KEY_TO_CLASS_MAP.items():
+            table = KEY_TO_NAME_MAP[obj_key]
+            obj_class = self._get_table_func(class_name, "class_func")
+            columns = self._index_columns[class_name] = {}
+            for field, path, schema_type in obj_class.get_index_fields():
+                if path is not None:
+                    if not self._add_json_column(table, field, path, schema_type):
+                        continue
+                    columns[path] = field
+                if self.readonly:
+                    continue
+                index = f"{table}_{field}"
+                if rebuild:
+                    self.dbapi.execute(f"DROP INDEX IF EXISTS {index}")
+                self.dbapi.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} ON {table}({field})"
+                )
+        self._text_index = self._create_text_index(rebuild)
+        self._sort_keys = self._create_sort_key_tables()
+        if not self.readonly:
+            self.dbapi.commit()
+
+    def _add_json_column(self, table, field, path, schema_type):
+        """
+        Add a column to a table with the value of the JSON path of its
+        objects, unless it exists, and return True, or return False if the
+        backend does not support such columns.
+        """
+        return False
+
+    def _create_text_index(self, rebuild):
+        """
+        Create the full-text index of the objects in TEXT_INDEX_CLASSES,
+        unless it exists, or refill it if rebuild is True.  Return True if
+        the index is maintained, or False if the backend does not support it.
+        """
+        return False
+
+    def _create_sort_key_tables(self):
+        """
+        Create the tables of the sort keys stored for the list views, unless
+        they exist.  Return True if the sort keys can be read.
+        """
+        if not self.dbapi.table_exists("sort_key"):
+            if self.readonly:
+                return False
+            self.dbapi.execute(
+                "CREATE TABLE sort_key "
+                "("
+                "view TEXT, "
+                "handle VARCHAR(50), "
+                "change INTEGER, "
+                "sort_key TEXT, "
+                "PRIMARY KEY (view, handle)"
+                ")"
+            )
+            self.dbapi.execute(
+                "CREATE TABLE sort_key_view "
+                "("
+                "view TEXT PRIMARY KEY, "
+                "depends TEXT, "
+                "stored INTEGER"
+                ")"
+            )
+        elif not self.dbapi.column_exists("sort_key_view", "stored"):
+            if self.readonly:
+                return False
+            # Earlier tables kept the keys of the removed views
+            self.dbapi.execute("ALTER TABLE sort_key_view ADD COLUMN stored INTEGER")
+            self.dbapi.execute(
+                "DELETE FROM sort_key WHERE view NOT IN (SELECT view FROM sort_key_view)"
+            )
+        if not self.readonly:
+            self.dbapi.execute(
+                "CREATE INDEX IF NOT EXISTS sort_key_handle ON sort_key(handle)"
+            )
+        return True
+
+    def _remove_sort_keys(self, class_name, handles):
+        """
+        Remove the stored sort keys of the objects, and the views that depend
+        on objects of their class, with their sort keys, once per transaction.
+        """
+        if not self._sort_keys or self.readonly:
+            return
+        self.dbapi.executemany(
+            "DELETE FROM sort_key WHERE handle = ?", [[handle] for handle in handles]
+        )
+        if self.transaction is not None:
+            if class_name in self._sort_key_classes:
+                return
+            self._sort_key_classes.add(class_name)
+        depends = f'%"{class_name}"%'
+        self.dbapi.execute(
+            "DELETE FROM sort_key WHERE view IN "
+            "(SELECT view FROM sort_key_view WHERE depends LIKE ?)",
+            [depends],
+        )
+        self.dbapi.execute("DELETE FROM sort_key_view WHERE depends LIKE ?", [depends])
+
+    def _prune_sort_keys(self, view):
+        """
+        Remove the views, with their sort keys, but the given view and the
+        others of the SORT_KEY_VIEWS most recently stored.
+        """
+        self.dbapi.execute(
+            "SELECT view FROM sort_key_view WHERE view != ? ORDER BY stored DESC",
+            [view],
+        )
+        views = [[row[0]] for row in self.dbapi.fetchall()[SORT_KEY_VIEWS - 1 :]]
+        self.dbapi.executemany("DELETE FROM sort_key WHERE view = ?", views)
+        self.dbapi.executemany("DELETE FROM sort_key_view WHERE view = ?", views)
+
+    def _get_text(self, obj):
+        """
+        Return the text of an object in the full-text index, or None if it
+        is not indexed.
+        """
+        if not self._text_index:
+            return None
+        if obj.__class__.__name__ not in TEXT_INDEX_CLASSES:
+            return None
+        return "\n".join(_get_text_data(obj)).upper()
+
+    def _get_text_rows(self, class_name, rows):
+        """
+        Given a class name and a list of handles and serialized objects,
+        return the rows of the full-text index for the objects.
+        """
+        obj_class = self._get_table_func(class_name, "class_func")
+        result = []
+        for handle, data in rows:
+            obj = self.serializer.string_to_object(obj_class, data)
+            result.append((class_name, handle, "\n".join(_get_text_data(obj)).upper()))
+        return result
+
+    def _update_text(self, rows):
+        """
+        Write (class name, handle, text) rows to the full-text index.
+        """
+
+    def _remove_text(self, rows):
+        """
+        Remove the (class name, handle) rows from the full-text index.
+        """
+
+    def _create_reference_indexes(self):
+        """
+        Create the indexes of the reference table.
+        """
+        self.dbapi.execute("CREATE INDEX reference_ref_handle ON reference(ref_handle)")
+        self.dbapi.execute("CREATE INDEX reference_obj_handle ON reference(obj_handle)")
+
+    def _drop_reference_indexes(self):
+        """
+        Drop the indexes of the reference table.
+        """
+        self.dbapi.execute("DROP INDEX reference_ref_handle")
+        self.dbapi.execute("DROP INDEX reference_obj_handle")
+
     def _close(self):
         self.dbapi.close()
 
@@ -274,6 +551,7 @@ class DBAPI(DbGeneric):
         Executes a db ROLLBACK;
         """
         if self.transaction is None:
+            self.clear_cache()
             self.dbapi.rollback()
 
     def _collation(self, locale):
@@ -301,7 +579,15 @@ class DBAPI(DbGeneric):
             # Aborting the session completely will become impossible.
             self.abort_possible = False
         self.transaction = transaction
+        self._sort_key_classes = set()
         self.dbapi.begin()
+        if transaction.batch and self.batch_size:
+            # Remember which tables start out empty, so that objects
+            # committed to them can skip the existence check.
+            for obj_key, table in KEY_TO_NAME_MAP.items():
+                self.dbapi.execute(f"SELECT 1 FROM {table} LIMIT 1")
+                if self.dbapi.fetchone() is None:
+                    self._batch_handles[obj_key] = set()
         return transaction
 
     def transaction_commit(self, transaction):
@@ -316,7 +602,12 @@ class DBAPI(DbGeneric):
         )
 
         action = {TXNADD: "-add", TXNUPD: "-update", TXNDEL: "-delete", None: "-delete"}
+        self._flush_pending()
+        self._update_deferred_references()
+        self._batch_handles = {}
         self.dbapi.commit()
+        # Count the commit before the signals, for their handlers
+        self.has_changed += 1  # Also gives commits since startup
         if not transaction.batch:
             # Now, emit signals:
             # do deletes and adds first
@@ -349,12 +640,16 @@ class DBAPI(DbGeneric):
         self.undodb.commit(transaction, msg)
         self._after_commit(transaction)
         transaction.clear()
-        self.has_changed += 1  # Also gives commits since startup
 
     def transaction_abort(self, transaction):
         """
         Executed after a batch operation abort.
         """
+        self._clear_pending()
+        self._batch_handles = {}
+        self._deferred = {}
+        self._deferred_stale = set()
+        self.clear_cache()
         self.dbapi.rollback()
         self.transaction = None
         transaction.clear()
@@ -441,6 +736,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_pending()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM person "
@@ -461,6 +757,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_pending()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT family.handle "
@@ -488,6 +785,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Event in the
         database.
         """
+        self._flush_pending()
         self.dbapi.execute("SELECT handle FROM event")
         return [row[0] for row in self.dbapi.fetchall()]
 
@@ -501,6 +799,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_pending()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM citation "
@@ -521,6 +820,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_pending()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM source "
@@ -541,6 +841,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_pending()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM place "
@@ -556,6 +857,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Repository in
         the database.
         """
+        self._flush_pending()
         self.dbapi.execute("SELECT handle FROM repository")
         return [row[0] for row in self.dbapi.fetchall()]
 
@@ -569,6 +871,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_pending()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM media "
@@ -584,6 +887,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Note in the
         database.
         """
+        self._flush_pending()
         self.dbapi.execute("SELECT handle FROM note")
         return [row[0] for row in self.dbapi.fetchall()]
 
@@ -597,6 +901,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_pending()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM tag "
@@ -613,6 +918,7 @@ class DBAPI(DbGeneric):
 
         If no such Tag exists, None is returned.
         """
+        self._flush_pending()
         self.dbapi.execute(
             f"SELECT {self.serializer.data_field} FROM tag WHERE name = ?", [name]
         )
@@ -622,6 +928,7 @@ class DBAPI(DbGeneric):
         return None
 
     def _get_number_of(self, obj_key):
+        self._flush_pending()
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT count(1) FROM {table}")
         row = self.dbapi.fetchone()
@@ -665,6 +972,11 @@ class DBAPI(DbGeneric):
         """
         old_data = None
         obj.change = int(change_time or time.time())
+        self._update_genealogy_graph(obj)
+        if trans.batch and self.batch_size:
+            old_data = self._buffer_commit(obj, obj_key)
+            self.invalidate_cache(obj_key, obj.handle)
+            return old_data
         table = KEY_TO_NAME_MAP[obj_key]
 
         if self._has_handle(obj_key, obj.handle):
@@ -680,7 +992,12 @@ class DBAPI(DbGeneric):
                 f"INSERT INTO {table} (handle, {self.serializer.data_field}) VALUES (?, ?)",
                 [obj.handle, self.serializer.object_to_string(obj)],
             )
+        self.invalidate_cache(obj_key, obj.handle)
         self._update_secondary_values(obj)
+        text = self._get_text(obj)
+        if text is not None:
+            self._update_text([(obj.__class__.__name__, obj.handle, text)])
+        self._remove_sort_keys(obj.__class__.__name__, [obj.handle])
         self._update_backlinks(obj, trans)
         if not trans.batch:
             if old_data:
@@ -690,13 +1007,204 @@ class DBAPI(DbGeneric):
 
         return old_data
 
+    def _buffer_commit(self, obj, obj_key):
+        """
+        Buffer an object committed in a batch transaction.
+
+        The object is serialized immediately, but written to the database
+        together with other buffered objects by :meth:`_flush_pending`.
+        Returns the previous data of the object, or None if it is new.
+        """
+        handle = obj.handle
+        pending = self._pending.setdefault(obj_key, {})
+        pending_ids = self._pending_ids.setdefault(obj_key, {})
+        row = pending.get(handle)
+        if row is not None:
+            old_data = self.serializer.string_to_data(row[0])
+            exists = row[5]
+            if pending_ids.get(row[1]) == handle:
+                del pending_ids[row[1]]
+        else:
+            handles = self._batch_handles.get(obj_key)
+            if handles is not None and handle not in handles:
+                old_data = None
+            else:
+                old_data = self._get_raw_data(obj_key, handle)
+            exists = old_data is not None
+            self._pending_count += 1
+        if obj_key in self._batch_handles:
+            self._batch_handles[obj_key].add(handle)
+
+        if self.defer_references:
+            deferred = self._deferred.setdefault(obj_key, set())
+            if exists and handle not in deferred:
+                self._deferred_stale.add(handle)
+            deferred.add(handle)
+            references = None
+        else:
+            references = set(obj.get_referenced_handles_recursively())
+
+        gramps_id = getattr(obj, "gramps_id", None)
+        fields, values = self._get_secondary_values(obj)
+        pending[handle] = (
+            self.serializer.object_to_string(obj),
+            gramps_id,
+            fields,
+            values,
+            references,
+            exists,
+            self._get_text(obj),
+        )
+        if gramps_id is not None:
+            pending_ids[gramps_id] = handle
+
+        if self._pending_count >= self.batch_size:
+            self._flush_pending()
+        return old_data
+
+    def _flush_pending(self):
+        """
+        Write the objects buffered by a batch transaction to the database.
+
+        Objects, their secondary values and their references are written
+        with one bulk statement per table.
+        """
+        if not self._pending_count:
+            return
+        references = []
+        texts = []
+        for obj_key, pending in self._pending.items():
+            if not pending:
+                continue
+            table = KEY_TO_NAME_MAP[obj_key]
+            obj_class = KEY_TO_CLASS_MAP[obj_key]
+            inserts = []
+            updates = []
+            for handle, row in pending.items():
+                data, _, fields, values, refs, exists, text = row
+                if exists:
+                    updates.append([data] + values + [handle])
+                else:
+                    inserts.append([data] + values)
+                if text is not None:
+                    texts.append((obj_class, handle, text))
+                if refs is None:
+                    continue
+                for ref_class_name, ref_handle in refs:
+                    references.append([handle, obj_class, ref_handle, ref_class_name])
+            columns = [self.serializer.data_field] + fields
+            if inserts:
+                self.dbapi.executemany(
+                    f'INSERT INTO {table} ({", ".join(columns)}) '
+                    f'VALUES ({", ".join("?" * len(columns))})',
+                    inserts,
+                )
+            self._remove_sort_keys(obj_class, [update[-1] for update in updates])
+            if updates:
+                sets = ", ".join(f"{column} = ?" for column in columns)
+                self.dbapi.executemany(
+                    f"UPDATE {table} SET {sets} WHERE handle = ?", updates
+                )
+                self.dbapi.executemany(
+                    "DELETE FROM reference WHERE obj_handle = ?",
+                    [
+                        [update[-1]]
+                        for update in updates
+                        if pending[update[-1]][4] is not None
+                    ],
+                )
+        if references:
+            self.dbapi.executemany(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES(?, ?, ?, ?)",
+                references,
+            )
+        if texts:
+            self._update_text(texts)
+        self._clear_pending()
+
+    def _clear_pending(self):
+        """
+        Discard the objects buffered by a batch transaction.
+        """
+        self._pending = {}
+        self._pending_ids = {}
+        self._pending_count = 0
+
+    def _update_deferred_references(self):
+        """
+        Write the references of the objects committed by a batch transaction
+        while references were deferred.
+
+        The objects are read back in one pass, like
+        :meth:`reindex_reference_map` does for the whole database.  When the
+        new references outnumber the existing ones, the reference indexes
+        are dropped during the bulk insert and recreated afterwards.
+        """
+        if not self._deferred:
+            return
+        self._flush_pending()
+        if self._deferred_stale:
+            self.dbapi.executemany(
+                "DELETE FROM reference WHERE obj_handle = ?",
+                [[handle] for handle in self._deferred_stale],
+            )
+        self.dbapi.execute("SELECT count(1) FROM reference")
+        existing = self.dbapi.fetchone()[0]
+        deferred = sum(len(handles) for handles in self._deferred.values())
+        rebuild_indexes = deferred > existing
+        if rebuild_indexes:
+            self._drop_reference_indexes()
+
+        for obj_key, handles in self._deferred.items():
+            table = KEY_TO_NAME_MAP[obj_key]
+            obj_class = KEY_TO_CLASS_MAP[obj_key]
+            class_func = self._get_table_func(obj_class, "class_func")
+            handles = list(handles)
+            for start in range(0, len(handles), CHUNKSIZE):
+                chunk = handles[start : start + CHUNKSIZE]
+                self.dbapi.execute(
+                    f"SELECT {self.serializer.data_field} FROM {table} "
+                    f'WHERE handle IN ({", ".join("?" * len(chunk))})',
+                    chunk,
+                )
+                references = []
+                for row in self.dbapi.fetchall():
+                    obj = self.serializer.string_to_object(class_func, row[0])
+                    for ref_class_name, ref_handle in set(
+                        obj.get_referenced_handles_recursively()
+                    ):
+                        references.append(
+                            [obj.handle, obj_class, ref_handle, ref_class_name]
+                        )
+                if references:
+                    self.dbapi.executemany(
+                        "INSERT INTO reference "
+                        "(obj_handle, obj_class, ref_handle, ref_class) "
+                        "VALUES(?, ?, ?, ?)",
+                        references,
+                    )
+
+        if rebuild_indexes:
+            self._create_reference_indexes()
+        self._deferred = {}
+        self._deferred_stale = set()
+
     def _commit_raw(self, data, obj_key):
         """
         Commit a serialized primary object to the database, storing the
         changes as part of the transaction.
         """
+        self._flush_pending()
         table = KEY_TO_NAME_MAP[obj_key]
         handle = data["handle"]
+        if obj_key in self._batch_handles:
+            self._batch_handles[obj_key].add(handle)
+        self.invalidate_cache(obj_key, handle)
+        if obj_key in (PERSON_KEY, FAMILY_KEY):
+            # Raw data may be in an older format, so the graph is rebuilt
+            self._genealogy_graph = None
 
         if self._has_handle(obj_key, handle):
             # update the object:
@@ -710,6 +1218,7 @@ class DBAPI(DbGeneric):
                 f"INSERT INTO {table} (handle, {self.serializer.data_field}) VALUES (?, ?)",
                 [handle, self.serializer.data_to_string(data)],
             )
+        self._remove_sort_keys(KEY_TO_CLASS_MAP[obj_key], [handle])
 
     def _update_backlinks(self, obj, transaction):
         if not transaction.batch:
@@ -779,12 +1288,22 @@ class DBAPI(DbGeneric):
     def _do_remove(self, handle, transaction, obj_key):
         if self.readonly or not handle:
             return
+        self._flush_pending()
+        if obj_key in self._batch_handles:
+            self._batch_handles[obj_key].discard(handle)
+        if obj_key in self._deferred:
+            self._deferred[obj_key].discard(handle)
         if self._has_handle(obj_key, handle):
             data = self._get_raw_data(obj_key, handle)
             obj_class = KEY_TO_CLASS_MAP[obj_key]
             self._remove_backlinks(obj_class, handle, transaction)
             table = KEY_TO_NAME_MAP[obj_key]
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
+            if self._text_index:
+                self._remove_text([(obj_class, handle)])
+            self._remove_sort_keys(obj_class, [handle])
+            self._remove_genealogy_graph(obj_key, handle)
+            self.invalidate_cache(obj_key, handle)
             if not transaction.batch:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
@@ -824,11 +1343,14 @@ class DBAPI(DbGeneric):
 
             result_list = list(find_backlink_handles(handle))
         """
-        self.dbapi.execute(
+        reader = self._get_reader()
+        if reader is self.dbapi:
+            self._update_deferred_references()
+        reader.execute(
             "SELECT obj_class, obj_handle FROM reference WHERE ref_handle = ?",
             [handle],
         )
-        rows = self.dbapi.fetchall()
+        rows = reader.fetchall()
         for row in rows:
             if (include_classes is None) or (row[0] in include_classes):
                 yield (row[0], row[1])
@@ -837,6 +1359,7 @@ class DBAPI(DbGeneric):
         """
         Returns first person in the database
         """
+        self._flush_pending()
         handle = self.get_default_handle()
         person = None
         if handle:
@@ -849,13 +1372,146 @@ class DBAPI(DbGeneric):
             return self.get_person_from_handle(row[0])
         return None
 
+    def select_handles(self, obj_type, conditions, order_by=None):
+        obj_key = CLASS_TO_KEY_MAP[obj_type]
+        where = []
+        args = []
+        for field, operator, value in conditions:
+            sql = self._get_condition_sql(obj_type, field, operator)
+            if sql is None:
+                return None
+            where.append(sql)
+            args.append(value)
+        table = KEY_TO_NAME_MAP[obj_key]
+        sql = f"SELECT handle FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if order_by is not None:
+            order_sql = self._get_field_sql(obj_type, order_by)
+            if order_sql is None:
+                return None
+            sql += f" ORDER BY {order_sql}"
+        reader = self._get_reader()
+        reader.execute(sql, args)
+        return [row[0] for row in reader.fetchall()]
+
+    def search_text(self, query, obj_types=None):
+        """
+        Return a list of (class name, handle) tuples of the objects whose
+        text may contain the query, or None if the full-text index can't
+        answer it.  Only objects in TEXT_INDEX_CLASSES are indexed.
+        """
+        return None
+
+    def get_genealogy_graph(self):
+        self._flush_pending()
+        return super().get_genealogy_graph()
+
+    def get_sort_keys(self, obj_type, view, depends=()):
+        """
+        Return a dictionary of the sort keys stored for a view, keyed by
+        handle, or None if they are not stored.
+
+        The keys of an object are removed when it is committed, and those of
+        a view when an object of one of its dependency types is committed.
+        The change time of the objects is also checked, for the changes
+        made while the keys were not maintained.
+        """
+        if not self._sort_keys:
+            return None
+        self._flush_pending()
+        obj_key = CLASS_TO_KEY_MAP[obj_type]
+        table = KEY_TO_NAME_MAP[obj_key]
+        reader = self._get_reader()
+        reader.execute("SELECT depends FROM sort_key_view WHERE view = ?", [view])
+        row = reader.fetchone()
+        if row is None or json.loads(row[0]) != sorted(depends):
+            return {}
+        reader.execute(
+            "SELECT sort_key.handle, sort_key.sort_key FROM sort_key "
+            f"JOIN {table} ON {table}.handle = sort_key.handle "
+            f"AND {table}.change = sort_key.change "
+            "WHERE sort_key.view = ?",
+            [view],
+        )
+        return dict(reader.fetchall())
+
+    def set_sort_keys(self, obj_type, view, keys, depends=(), complete=False):
+        """
+        Store sort keys of a view, with the change times of their objects.
+        The keys of all the objects replace those of a view that is not
+        valid, and other keys are only stored while the view is valid.
+        """
+        if not self._sort_keys or self.readonly or not keys:
+            return
+        self._flush_pending()
+        obj_key = CLASS_TO_KEY_MAP[obj_type]
+        table = KEY_TO_NAME_MAP[obj_key]
+        self._txn_begin()
+        self.dbapi.execute("SELECT depends FROM sort_key_view WHERE view = ?", [view])
+        row = self.dbapi.fetchone()
+        if row is not None and json.loads(row[0]) == sorted(depends):
+            self.dbapi.executemany(
+                "DELETE FROM sort_key WHERE view = ? AND handle = ?",
+                [[view, handle] for _, handle in keys],
+            )
+        elif complete:
+            self.dbapi.execute("DELETE FROM sort_key WHERE view = ?", [view])
+            self.dbapi.execute("DELETE FROM sort_key_view WHERE view = ?", [view])
+            # The views are numbered in the order they are stored
+            self.dbapi.execute(
+                "INSERT INTO sort_key_view (view, depends, stored) "
+                "SELECT ?, ?, COALESCE(MAX(stored), 0) + 1 FROM sort_key_view",
+                [view, json.dumps(sorted(depends))],
+            )
+            self._prune_sort_keys(view)
+            # The view is invalidated by the next changes of the transaction
+            self._sort_key_classes.difference_update(depends)
+        else:
+            keys = []
+        self.dbapi.executemany(
+            "INSERT INTO sort_key (view, handle, change, sort_key) "
+            f"SELECT ?, handle, change, ? FROM {table} WHERE handle = ?",
+            [[view, sort_key, handle] for sort_key, handle in keys],
+        )
+        self._txn_commit()
+
+    def _get_field_sql(self, obj_type, field):
+        """
+        Return the SQL expression for a field of select_handles, or None if
+        it is not supported.  Only secondary columns, and the columns of the
+        indexed JSON paths, are supported here.
+        """
+        columns = self._index_columns.get(obj_type, {})
+        if field in columns:
+            return columns[field]
+        if field in self._get_secondary_fields(obj_type):
+            return field
+        if field in columns.values():
+            return field
+        return None
+
+    def _get_condition_sql(self, obj_type, field, operator):
+        """
+        Return the SQL expression, with one parameter, for a condition of
+        select_handles, or None if it is not supported.  Only comparisons are
+        supported here.
+        """
+        if operator not in ("=", "!=", "<", "<=", ">", ">="):
+            return None
+        sql = self._get_field_sql(obj_type, field)
+        if sql is None:
+            return None
+        return f"{sql} {operator} ?"
+
     def _iter_handles(self, obj_key):
         """
         Return an iterator over handles in the database
         """
+        reader = self._get_reader()
         table = KEY_TO_NAME_MAP[obj_key]
-        self.dbapi.execute(f"SELECT handle FROM {table}")
-        rows = self.dbapi.fetchall()
+        reader.execute(f"SELECT handle FROM {table}")
+        rows = reader.fetchall()
         for row in rows:
             yield row[0]
 
@@ -863,8 +1519,9 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over raw data in the database.
         """
+        reader = self._get_reader()
         table = KEY_TO_NAME_MAP[obj_key]
-        with self.dbapi.cursor() as cursor:
+        with reader.cursor() as cursor:
             cursor.execute(f"SELECT handle, {self.serializer.data_field} FROM {table}")
             rows = cursor.fetchmany()
             while rows:
@@ -876,157 +1533,323 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over raw data in the place hierarchy.
         """
+        reader = self._get_reader()
         to_do = [""]
         while to_do:
             handle = to_do.pop()
-            self.dbapi.execute(
+            reader.execute(
                 f"SELECT handle, {self.serializer.data_field} FROM place WHERE enclosed_by = ?",
                 [handle],
             )
-            rows = self.dbapi.fetchall()
+            rows = reader.fetchall()
             for row in rows:
                 to_do.append(row[0])
                 yield (row[0], self.serializer.string_to_data(row[1]))
 
-    def reindex_reference_map(self, callback):
+    def reindex_reference_map(self, callback, workers=1):
         """
         Reindex all primary records in the database.
+
+        With more than one worker the objects are deserialized, and their
+        references found, by a pool of worker processes.  The reference
+        table is always written by this process.
+
+        Return the number of objects indexed.
         """
+        self._flush_pending()
+        self._deferred = {}
+        self._deferred_stale = set()
         self._txn_begin()
         self.dbapi.execute("DELETE FROM reference")
-        total = 0
-        for tbl in (
-            "people",
-            "families",
-            "events",
-            "places",
-            "sources",
-            "citations",
-            "media",
-            "repositories",
-            "notes",
-            "tags",
-        ):
-            total += self.method("get_number_of_%s", tbl)()
+        self._drop_reference_indexes()
+        total = self._get_primary_total()
         UpdateCallback.__init__(self, callback)
         self.set_total(total)
-        primary_table = (
-            (self.get_person_cursor, Person),
-            (self.get_family_cursor, Family),
-            (self.get_event_cursor, Event),
-            (self.get_place_cursor, Place),
-            (self.get_source_cursor, Source),
-            (self.get_citation_cursor, Citation),
-            (self.get_media_cursor, Media),
-            (self.get_repository_cursor, Repository),
-            (self.get_note_cursor, Note),
-            (self.get_tag_cursor, Tag),
-        )
-        # Now we use the functions and classes defined above
-        # to loop through each of the primary object tables.
-        for cursor_func, class_func in primary_table:
-            logging.info("Rebuilding %s reference map", class_func.__name__)
-            with cursor_func() as cursor:
-                for _, val in cursor:
-                    obj = self.serializer.data_to_object(class_func, val)
-                    references = set(obj.get_referenced_handles_recursively())
-                    # handle addition of new references
-                    for ref_class_name, ref_handle in references:
-                        self.dbapi.execute(
-                            "INSERT INTO reference "
-                            "(obj_handle, obj_class, ref_handle, ref_class) "
-                            "VALUES (?, ?, ?, ?)",
-                            [
-                                obj.handle,
-                                obj.__class__.__name__,
-                                ref_handle,
-                                ref_class_name,
-                            ],
-                        )
-                    self.update()
+        done = 0
+        for _, count, rows in self._map_primary_data("_get_reference_rows", workers):
+            self.dbapi.executemany(
+                "INSERT INTO reference "
+                "(obj_handle, obj_class, ref_handle, ref_class) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            done += count
+            self.update(done)
+        self._create_reference_indexes()
         self._txn_commit()
+        return total
 
-    def rebuild_secondary(self, callback=None):
+    def rebuild_secondary(self, callback=None, workers=1):
         """
         Rebuild secondary indices
+
+        With more than one worker the objects are deserialized, and their
+        secondary values found, by a pool of worker processes.
+
+        Return the number of objects updated.
         """
+        self._flush_pending()
         if self.readonly:
-            return
+            return 0
 
-        total = 0
-        for tbl in (
-            "people",
-            "families",
-            "events",
-            "places",
-            "sources",
-            "citations",
-            "media",
-            "repositories",
-            "notes",
-            "tags",
-        ):
-            total += self.method("get_number_of_%s", tbl)()
+        total = self._get_primary_total()
         UpdateCallback.__init__(self, callback)
         self.set_total(total)
 
         # First, expand blob to individual fields:
         self._txn_begin()
-        for obj_type in (
-            "Person",
-            "Family",
-            "Event",
-            "Place",
-            "Repository",
-            "Source",
-            "Citation",
-            "Media",
-            "Note",
-            "Tag",
+        done = 0
+        for obj_key, count, (fields, rows) in self._map_primary_data(
+            "_get_secondary_rows", workers
         ):
-            for handle in self.method("get_%s_handles", obj_type)():
-                obj = self.method("get_%s_from_handle", obj_type)(handle)
-                self._update_secondary_values(obj)
-                self.update()
+            if rows:
+                sets = ", ".join(f"{field} = ?" for field in fields)
+                table = KEY_TO_NAME_MAP[obj_key]
+                self.dbapi.executemany(
+                    f"UPDATE {table} SET {sets} WHERE handle = ?", rows
+                )
+            done += count
+            self.update(done)
         self._txn_commit()
 
+        self._create_indexes(rebuild=True)
+
         # Next, rebuild stats:
         gstats = self.get_gender_stats()
         self.genderStats = GenderStats(gstats)
+        return total
+
+    def _get_primary_total(self):
+        """
+        Return the number of primary objects in the database.
+        """
+        return sum(self._get_number_of(obj_key) for obj_key in KEY_TO_CLASS_MAP)
+
+    def _map_primary_data(self, method_name, workers):
+        """
+        Apply a method to the serialized objects of each primary table, a
+        chunk at a time.  Yield the primary key, the number of objects and
+        the result of each chunk, in order.
+
+        The chunks are read by handle so that the tables may be updated
+        between them.  With more than one worker, the method is called in
+        a pool of worker processes, each holding an unloaded database, with
+        a bounded number of chunks in flight.
+        """
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.serializer,),
+            )
+        else:
+            executor = None
+        try:
+            for obj_key, class_name in KEY_TO_CLASS_MAP.items():
+                LOG.info("Rebuilding %s table", class_name)
+                queue = deque()
+                for rows in self._iter_raw_chunks(obj_key):
+                    if executor is None:
+                        method = getattr(self, method_name)
+                        yield obj_key, len(rows), method(class_name, rows)
+                        continue
+                    future = executor.submit(
+                        _call_worker, method_name, class_name, rows
+                    )
+                    queue.append((len(rows), future))
+                    if len(queue) > 2 * workers:
+                        count, future = queue.popleft()
+                        yield obj_key, count, future.result()
+                while queue:
+                    count, future = queue.popleft()
+                    yield obj_key, count, future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def map_data(self, obj_type, function, context, workers, ordered=False):
+        if (
+            workers < 2
+            or self.transaction is not None
+            or self._directory in (None, ":memory:")
+        ):
+            return None
+        try:
+            context = pickle.dumps((function, context))
+        except (pickle.PicklingError, TypeError, AttributeError) as err:
+            LOG.debug("Can't map %s data in workers: %s", obj_type, err)
+            return None
+        return self._iter_map_data(
+            CLASS_TO_KEY_MAP[obj_type], context, workers, ordered
+        )
+
+    def _iter_map_data(self, obj_key, context, workers, ordered):
+        """
+        Yield the results of map_data, sending chunks of serialized rows to
+        a pool of worker processes, with a bounded number of chunks in
+        flight.
+        """
+        self._flush_pending()
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_map_worker,
+            initargs=(self._directory, context),
+        )
+        reader = self._get_reader()
+        table = KEY_TO_NAME_MAP[obj_key]
+        try:
+            queue = deque()
+            with reader.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT handle, {self.serializer.data_field} FROM {table}"
+                    + (" ORDER BY handle" if ordered else "")
+                )
+                rows = cursor.fetchmany()
+                while rows:
+                    queue.append(executor.submit(_call_map_worker, rows))
+                    if len(queue) > 2 * workers:
+                        yield queue.popleft().result()
+                    rows = cursor.fetchmany()
+            while queue:
+                yield queue.popleft().result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _iter_raw_chunks(self, obj_key):
+        """
+        Return an iterator over lists of handles and serialized objects,
+        read in handle order.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        handle = ""
+        while True:
+            self.dbapi.execute(
+                f"SELECT handle, {self.serializer.data_field} FROM {table} "
+                f"WHERE handle > ? ORDER BY handle LIMIT {ARRAYSIZE}",
+                [handle],
+            )
+            rows = self.dbapi.fetchall()
+            if not rows:
+                break
+            yield rows
+            handle = rows[-1][0]
+
+    def _get_reference_rows(self, class_name, rows):
+        """
+        Given a class name and a list of handles and serialized objects,
+        return the rows of the reference table for the objects.
+        """
+        obj_class = self._get_table_func(class_name, "class_func")
+        result = []
+        for handle, data in rows:
+            obj = self.serializer.string_to_object(obj_class, data)
+            for ref_class_name, ref_handle in set(
+                obj.get_referenced_handles_recursively()
+            ):
+                result.append((handle, class_name, ref_handle, ref_class_name))
+        return result
+
+    def _get_secondary_rows(self, class_name, rows):
+        """
+        Given a class name and a list of handles and serialized objects,
+        return the names of the secondary fields and, for each object, their
+        values followed by its handle.
+        """
+        obj_class = self._get_table_func(class_name, "class_func")
+        fields = []
+        result = []
+        for handle, data in rows:
+            obj = self.serializer.string_to_object(obj_class, data)
+            fields, values = self._get_secondary_values(obj)
+            result.append(values + [handle])
+        return fields, result
 
     def _has_handle(self, obj_key, handle):
+        reader = self._get_reader(flush=False)
+        if reader is self.dbapi:
+            if handle in self._pending.get(obj_key, ()):
+                return True
+            if obj_key in self._batch_handles:
+                return handle in self._batch_handles[obj_key]
         table = KEY_TO_NAME_MAP[obj_key]
-        self.dbapi.execute(f"SELECT 1 FROM {table} WHERE handle = ?", [handle])
-        return self.dbapi.fetchone() is not None
+        reader.execute(f"SELECT 1 FROM {table} WHERE handle = ?", [handle])
+        return reader.fetchone() is not None
 
     def _has_gramps_id(self, obj_key, gramps_id):
         table = KEY_TO_NAME_MAP[obj_key]
+        reader = self._get_reader(flush=False)
+        if reader is not self.dbapi:
+            reader.execute(f"SELECT 1 FROM {table} WHERE gramps_id = ?", [gramps_id])
+            return reader.fetchone() is not None
+        pending = self._pending.get(obj_key)
+        if pending:
+            # Buffered objects take precedence over the stored ones.
+            if gramps_id in self._pending_ids[obj_key]:
+                return True
+            self.dbapi.execute(
+                f"SELECT handle FROM {table} WHERE gramps_id = ?", [gramps_id]
+            )
+            return any(row[0] not in pending for row in self.dbapi.fetchall())
         self.dbapi.execute(f"SELECT 1 FROM {table} WHERE gramps_id = ?", [gramps_id])
         return self.dbapi.fetchone() is not None
 
     def _get_gramps_ids(self, obj_key):
+        self._flush_pending()
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT gramps_id FROM {table}")
         return [row[0] for row in self.dbapi.fetchall()]
 
-    def _get_raw_data(self, obj_key, handle):
+    def _get_raw_string(self, obj_key, handle):
+        reader = self._get_reader(flush=False)
+        if reader is self.dbapi:
+            row = self._pending.get(obj_key, {}).get(handle)
+            if row is not None:
+                return row[0]
         table = KEY_TO_NAME_MAP[obj_key]
-        self.dbapi.execute(
+        reader.execute(
             f"SELECT {self.serializer.data_field} FROM {table} WHERE handle = ?",
             [handle],
         )
-        row = self.dbapi.fetchone()
+        row = reader.fetchone()
         if row:
-            return self.serializer.string_to_data(row[0])
+            return row[0]
         return None
 
+    def _get_raw_strings(self, obj_key, handles):
+        reader = self._get_reader(flush=False)
+        strings = {}
+        if reader is self.dbapi and self._pending.get(obj_key):
+            pending = self._pending[obj_key]
+            for handle in handles:
+                row = pending.get(handle)
+                if row is not None:
+                    strings[handle] = row[0]
+            handles = [handle for handle in handles if handle not in strings]
+        table = KEY_TO_NAME_MAP[obj_key]
+        data_field = self.serializer.data_field
+        for start in range(0, len(handles), CHUNKSIZE):
+            chunk = handles[start : start + CHUNKSIZE]
+            reader.execute(
+                f"SELECT handle, {data_field} FROM {table} "
+                f'WHERE handle IN ({", ".join("?" * len(chunk))})',
+                chunk,
+            )
+            strings.update(reader.fetchall())
+        return strings
+
     def _get_raw_from_id_data(self, obj_key, gramps_id):
+        reader = self._get_reader(flush=False)
+        if reader is self.dbapi and self._pending.get(obj_key):
+            handle = self._pending_ids[obj_key].get(gramps_id)
+            if handle is not None:
+                return self._get_raw_data(obj_key, handle)
+            self._flush_pending()
         table = KEY_TO_NAME_MAP[obj_key]
-        self.dbapi.execute(
+        reader.execute(
             f"SELECT {self.serializer.data_field} FROM {table} WHERE gramps_id = ?",
             [gramps_id],
         )
-        row = self.dbapi.fetchone()
+        row = reader.fetchone()
         if row:
             return self.serializer.string_to_data(row[0])
         return None
@@ -1059,6 +1882,7 @@ class DBAPI(DbGeneric):
         """
         Helper method to undo a reference map entry
         """
+        self._flush_pending()
         if data is None:
             self.dbapi.execute(
                 "DELETE FROM reference WHERE obj_handle = ? AND ref_handle = ?",
@@ -1076,10 +1900,14 @@ class DBAPI(DbGeneric):
         """
         Helper method to undo/redo the changes made
         """
+        self._flush_pending()
         cls = KEY_TO_CLASS_MAP[obj_key]
         table = cls.lower()
         if data is None:
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
+            if self._text_index:
+                self._remove_text([(cls, handle)])
+            self._remove_genealogy_graph(obj_key, handle)
         else:
             if self._has_handle(obj_key, handle):
                 self.dbapi.execute(
@@ -1093,11 +1921,17 @@ class DBAPI(DbGeneric):
                 )
             obj = from_dict(data)
             self._update_secondary_values(obj)
+            self._update_genealogy_graph(obj)
+            text = self._get_text(obj)
+            if text is not None:
+                self._update_text([(cls, handle, text)])
+        self._remove_sort_keys(cls, [handle])
 
     def get_surname_list(self):
         """
         Return the list of locale-sorted surnames contained in the database.
         """
+        self._flush_pending()
         self.dbapi.execute("SELECT DISTINCT surname FROM person ORDER BY surname")
         surname_list = []
         for row in self.dbapi.fetchall():
@@ -1144,37 +1978,53 @@ class DBAPI(DbGeneric):
                         f"ALTER TABLE {table_name} ADD COLUMN {field} {sql_type}"
                     )
 
-    def _update_secondary_values(self, obj):
+    def _get_secondary_fields(self, table):
         """
-        Given a primary object update its secondary field values
-        in the database.
-        Does not commit.
+        Return the names of the secondary fields of a primary object class,
+        not including the derived fields.
+        """
+        if table not in self._secondary_fields:
+            # The fields are derived from the schema, which is costly to build
+            obj_class = self._get_table_func(table, "class_func")
+            self._secondary_fields[table] = [
+                field[0] for field in obj_class.get_secondary_fields()
+            ]
+        return self._secondary_fields[table]
+
+    def _get_secondary_values(self, obj):
+        """
+        Given a primary object return the names of its secondary fields,
+        including the derived fields, and their values.
         """
         table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
-        values = []
-        for field in fields:
-            sets.append(f"{field} = ?")
-            values.append(getattr(obj, field))
+        fields = list(self._get_secondary_fields(table))
+        values = [getattr(obj, field) for field in fields]
 
         # Derived fields
         if table == "Person":
             given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
-            values.append(given_name)
-            sets.append("surname = ?")
-            values.append(surname)
+            fields += ["given_name", "surname"]
+            values += [given_name, surname]
         if table == "Place":
             handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
+            fields.append("enclosed_by")
             values.append(handle)
 
+        return fields, self._sql_cast_list(values)
+
+    def _update_secondary_values(self, obj):
+        """
+        Given a primary object update its secondary field values
+        in the database.
+        Does not commit.
+        """
+        fields, values = self._get_secondary_values(obj)
         if len(values) > 0:
-            table_name = table.lower()
+            sets = ", ".join(f"{field} = ?" for field in fields)
+            table_name = obj.__class__.__name__.lower()
             self.dbapi.execute(
-                f'UPDATE {table_name} SET {", ".join(sets)} where handle = ?',
-                self._sql_cast_list(values) + [obj.handle],
+                f"UPDATE {table_name} SET {sets} where handle = ?",
+                values + [obj.handle],
             )
 
     def _sql_cast_list(self, values):
@@ -32,20 +32,52 @@ import logging
 import os
 import re
 import sqlite3
+import threading
+import weakref
+from pathlib import Path
 
 # -------------------------------------------------------------------------
 #
 # Gramps modules
 #
 # -------------------------------------------------------------------------
+from gramps.gen.config import config
 from gramps.gen.const import GRAMPS_LOCALE as glocale
-from gramps.gen.db.dbconst import ARRAYSIZE
-from gramps.plugins.db.dbapi.dbapi import DBAPI
+from gramps.gen.db.dbconst import ARRAYSIZE, CLASS_TO_KEY_MAP, KEY_TO_NAME_MAP
+from gramps.gen.db.utils import DB_PROFILES, get_profile_from_path
+from gramps.plugins.db.dbapi.dbapi import DBAPI, TEXT_INDEX_CLASSES
 
 _ = glocale.translation.gettext
 
+LOG = logging.getLogger(".sqlite")
+
 sqlite3.paramstyle = "qmark"
 
+# Number of prepared statements kept by a connection
+STATEMENT_CACHE = 256
+
+# JSON paths allowed in the conditions of select_handles
+JSON_PATH = re.compile(r"\$(\.\w+)+")
+
+# Pragmas set when a connection is opened, and while a batch transaction is
+# in progress, for each tuning profile.  The journal mode is persistent, so
+# the default profile resets it.
+PROFILES = {
+    "default": {
+        "open": {"journal_mode": "DELETE"},
+        "batch": {},
+    },
+    "performance": {
+        "open": {
+            "journal_mode": "WAL",
+            "mmap_size": 268435456,
+            "cache_size": -65536,
+            "temp_store": "MEMORY",
+        },
+        "batch": {"synchronous": "NORMAL"},
+    },
+}
+
 
 # -------------------------------------------------------------------------
 #
@@ -57,6 +89,14 @@ class SQLite(DBAPI):
     SQLite interface.
     """
 
+    def __init__(self, directory=None):
+        # Tuning profile, and the pragmas to restore after a batch
+        self.profile = "default"
+        self._saved_pragmas = {}
+        # Read-only connections used by other threads
+        self._readers = None
+        super().__init__(directory)
+
     def get_summary(self):
         """
         Return a dictionary of information about this database backend.
@@ -66,6 +106,7 @@ class SQLite(DBAPI):
             {
                 _("Database version"): sqlite3.sqlite_version,
                 _("Database module location"): sqlite3.__file__,
+                _("Tuning profile"): DB_PROFILES.get(self.profile, self.profile),
             }
         )
         return summary
@@ -73,9 +114,230 @@ class SQLite(DBAPI):
     def _initialize(self, directory, username, password):
         if directory == ":memory:":
             path_to_db = ":memory:"
+            self.profile = config.get("database.profile")
         else:
             path_to_db = os.path.join(directory, "sqlite.db")
-        self.dbapi = Connection(path_to_db)
+            self.profile = get_profile_from_path(directory)
+        self.dbapi = Connection(path_to_db, cached_statements=STATEMENT_CACHE)
+        pragmas = PROFILES.get(self.profile, PROFILES["default"])["open"]
+        if self.readonly or directory == ":memory:":
+            # The journal mode can't be changed without write access
+            pragmas = {k: v for k, v in pragmas.items() if k != "journal_mode"}
+        self.dbapi.set_pragmas(pragmas)
+        # Readers don't block the writer, or each other, only with a WAL
+        journal_mode = self.dbapi.get_pragmas(["journal_mode"])["journal_mode"]
+        if journal_mode == "wal":
+            pragmas = {k: v for k, v in pragmas.items() if k != "journal_mode"}
+            self._readers = ReaderPool(path_to_db, pragmas)
+
+    def _close(self):
+        if self._text_index and not self.readonly:
+            # The index is known to be complete until another writer changes
+            # the objects
+            self._set_metadata("text_index_state", self.__get_text_state())
+        if self._readers is not None:
+            self._readers.close()
+            self._readers = None
+        super()._close()
+
+    def _get_thread_reader(self):
+        if self._readers is None or threading.get_ident() == self._main_thread:
+            return self.dbapi
+        return self._readers.get()
+
+    def _add_json_column(self, table, field, path, schema_type):
+        if self.serializer.data_field != "json_data":
+            return False
+        if sqlite3.sqlite_version_info < (3, 31, 0):
+            # Generated columns are not supported
+            return False
+        # Generated columns are hidden from pragma_table_info
+        self.dbapi.execute(
+            f"SELECT COUNT(*) FROM pragma_table_xinfo('{table}') WHERE name = ?",
+            [field],
+        )
+        if self.dbapi.fetchone()[0] == 0:
+            if self.readonly:
+                return False
+            sql_type = self._sql_type(schema_type, None)
+            self.dbapi.execute(
+                f"ALTER TABLE {table} ADD COLUMN {field} {sql_type} "
+                f"GENERATED ALWAYS AS (json_extract(json_data, '{path}')) VIRTUAL"
+            )
+        return True
+
+    def __get_text_state(self):
+        """
+        Return the number of objects and the last change time of each class
+        in the full-text index, which change whenever any writer, even one
+        that does not maintain the index, adds, changes or removes objects.
+        """
+        state = {}
+        for class_name in TEXT_INDEX_CLASSES:
+            table = KEY_TO_NAME_MAP[CLASS_TO_KEY_MAP[class_name]]
+            self.dbapi.execute(f"SELECT COUNT(*), MAX(change) FROM {table}")
+            state[class_name] = list(self.dbapi.fetchone())
+        return state
+
+    def _create_text_index(self, rebuild):
+        if self.dbapi.table_exists("text_index"):
+            try:
+                # The index can't be read without the FTS5 module
+                self.dbapi.execute(
+                    "SELECT rowid FROM text_index WHERE text_index MATCH 'abc' LIMIT 1"
+                )
+            except sqlite3.OperationalError:
+                LOG.warning("The full-text index is not supported by SQLite")
+                return False
+            if self._get_metadata("text_index_state", None) != self.__get_text_state():
+                # The objects were changed without maintaining the index,
+                # or the database was not closed
+                if self.readonly:
+                    return False
+                rebuild = True
+        else:
+            if self.readonly:
+                return False
+            try:
+                # Trigram tokens match any substring of three or more
+                # characters, not just whole words
+                self.dbapi.execute(
+                    "CREATE VIRTUAL TABLE text_index "
+                    "USING fts5(text, tokenize='trigram')"
+                )
+            except sqlite3.OperationalError:
+                LOG.warning("The full-text index is not supported by SQLite")
+                return False
+            self.dbapi.execute(
+                "CREATE TABLE text_handle "
+                "("
+                "id INTEGER PRIMARY KEY, "
+                "obj_class TEXT, "
+                "handle VARCHAR(50), "
+                "UNIQUE (obj_class, handle)"
+                ")"
+            )
+            # Objects of an older schema are indexed once upgraded
+            version = int(self._get_metadata("version", default="0"))
+            rebuild = version == self.VERSION[0]
+        if rebuild and not self.readonly:
+            self.dbapi.execute("DELETE FROM text_index")
+            self.dbapi.execute("DELETE FROM text_handle")
+            for class_name in TEXT_INDEX_CLASSES:
+                obj_key = CLASS_TO_KEY_MAP[class_name]
+                for rows in self._iter_raw_chunks(obj_key):
+                    self._update_text(self._get_text_rows(class_name, rows))
+        if not self.readonly:
+            # Until the database is closed, the index is not known to be
+            # complete
+            self._set_metadata("text_index_state", None, use_txn=False)
+        return True
+
+    def _update_text(self, rows):
+        self.dbapi.executemany(
+            "INSERT OR IGNORE INTO text_handle (obj_class, handle) VALUES (?, ?)",
+            [row[:2] for row in rows],
+        )
+        self.dbapi.executemany(
+            "INSERT OR REPLACE INTO text_index (rowid, text) "
+            "SELECT id, ? FROM text_handle WHERE obj_class = ? AND handle = ?",
+            [(text, class_name, handle) for class_name, handle, text in rows],
+        )
+
+    def _remove_text(self, rows):
+        self.dbapi.executemany(
+            "DELETE FROM text_index WHERE rowid IN "
+            "(SELECT id FROM text_handle WHERE obj_class = ? AND handle = ?)",
+            rows,
+        )
+        self.dbapi.executemany(
+            "DELETE FROM text_handle WHERE obj_class = ? AND handle = ?", rows
+        )
+
+    def search_text(self, query, obj_types=None):
+        # Trigrams can't match fewer than three characters, and the objects
+        # are indexed with their text data joined by newlines
+        if not self._text_index or len(query) < 3 or "\n" in query:
+            return None
+        if obj_types is None:
+            obj_types = TEXT_INDEX_CLASSES
+        elif any(obj_type not in TEXT_INDEX_CLASSES for obj_type in obj_types):
+            return None
+        # Search for the query as a phrase, with its quotes escaped
+        args = ['"%s"' % query.upper().replace('"', '""')]
+        sql = (
+            "SELECT text_handle.obj_class, text_handle.handle FROM text_index "
+            "JOIN text_handle ON text_handle.id = text_index.rowid "
+            "WHERE text_index MATCH ?"
+        )
+        if len(obj_types) < len(TEXT_INDEX_CLASSES):
+            sql += " AND text_handle.obj_class IN (%s)" % ", ".join(
+                "?" * len(obj_types)
+            )
+            args.extend(obj_types)
+        reader = self._get_reader()
+        reader.execute(sql, args)
+        return [tuple(row) for row in reader.fetchall()]
+
+    def __is_json_path(self, field):
+        return (
+            self.serializer.data_field == "json_data"
+            and JSON_PATH.fullmatch(field) is not None
+        )
+
+    def _get_field_sql(self, obj_type, field):
+        sql = super()._get_field_sql(obj_type, field)
+        if sql is None and self.__is_json_path(field):
+            # JSON1 functions on the serialized object
+            sql = f"json_extract(json_data, '{field}')"
+        return sql
+
+    def _get_condition_sql(self, obj_type, field, operator):
+        if operator == "CONTAINS":
+            if not self.__is_json_path(field):
+                return None
+            return (
+                f"EXISTS (SELECT 1 FROM json_each(json_data, '{field}') "
+                "WHERE value = ?)"
+            )
+        if operator == "REGEXP":
+            sql = self._get_field_sql(obj_type, field)
+            if sql is None:
+                return None
+            return f"COALESCE({sql}, '') REGEXP ?"
+        return super()._get_condition_sql(obj_type, field, operator)
+
+    def transaction_begin(self, transaction):
+        """
+        Set the batch pragmas of the tuning profile before a batch
+        transaction begins.
+        """
+        if transaction.batch:
+            pragmas = PROFILES.get(self.profile, PROFILES["default"])["batch"]
+            self._saved_pragmas = self.dbapi.get_pragmas(pragmas)
+            self.dbapi.set_pragmas(pragmas)
+        return super().transaction_begin(transaction)
+
+    def transaction_commit(self, transaction):
+        """
+        Restore the pragmas changed for a batch transaction after it is
+        committed.
+        """
+        super().transaction_commit(transaction)
+        self.__restore_pragmas()
+
+    def transaction_abort(self, transaction):
+        """
+        Restore the pragmas changed for a batch transaction after it is
+        aborted.
+        """
+        super().transaction_abort(transaction)
+        self.__restore_pragmas()
+
+    def __restore_pragmas(self):
+        if self._saved_pragmas:
+            self.dbapi.set_pragmas(self._saved_pragmas)
+            self._saved_pragmas = {}
 
 
 # -------------------------------------------------------------------------
@@ -103,6 +365,8 @@ class Connection:
         :type kwargs: list
         """
         self.log = logging.getLogger(".sqlite")
+        # Checked once, rather than on each statement
+        self.__debug = self.log.isEnabledFor(logging.DEBUG)
         self.__connection = sqlite3.connect(*args, **kwargs)
         self.__cursor = self.__connection.cursor()
         self.__connection.create_function("regexp", 2, regexp)
@@ -135,9 +399,50 @@ class Connection:
         :param kwargs: arguments to be passed to the sqlite3 execute statement
         :type kwargs: list
         """
-        self.log.debug(args)
+        if self.__debug:
+            self.log.debug(args)
         self.__cursor.execute(*args, **kwargs)
 
+    def executemany(self, *args, **kwargs):
+        """
+        Executes an SQL statement against all parameter sequences.
+
+        :param args: arguments to be passed to the sqlite3 executemany
+                     statement
+        :type args: list
+        :param kwargs: arguments to be passed to the sqlite3 executemany
+                       statement
+        :type kwargs: list
+        """
+        if self.__debug:
+            self.log.debug(args[0])
+        self.__cursor.executemany(*args, **kwargs)
+
+    def set_pragmas(self, pragmas):
+        """
+        Set the value of pragmas.
+
+        :param pragmas: values of the pragmas, by name.
+        :type pragmas: dict
+        """
+        for pragma, value in pragmas.items():
+            self.execute(f"PRAGMA {pragma} = {value}")
+
+    def get_pragmas(self, pragmas):
+        """
+        Return the current value of pragmas.
+
+        :param pragmas: names of the pragmas.
+        :type pragmas: iterable
+        :returns: values of the pragmas, by name.
+        :rtype: dict
+        """
+        values = {}
+        for pragma in pragmas:
+            self.execute(f"PRAGMA {pragma}")
+            values[pragma] = self.fetchone()[0]
+        return values
+
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
@@ -222,6 +527,63 @@ class Connection:
         return Cursor(self.__connection)
 
 
+# -------------------------------------------------------------------------
+#
+# ReaderPool class
+#
+# -------------------------------------------------------------------------
+class ReaderPool:
+    """
+    Read-only connections to a database, one for each thread that reads
+    from it.
+
+    A connection is opened the first time a thread reads and is closed when
+    the thread ends, or when the pool is closed.
+    """
+
+    def __init__(self, path, pragmas):
+        """
+        :param path: path of the database file.
+        :type path: str
+        :param pragmas: values of the pragmas set on each connection.
+        :type pragmas: dict
+        """
+        self.__uri = Path(path).absolute().as_uri() + "?mode=ro"
+        self.__pragmas = pragmas
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__connections = weakref.WeakSet()
+
+    def get(self):
+        """
+        Return the connection of the calling thread.
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            # Only used by this thread, but closed by the pool
+            connection = Connection(
+                self.__uri,
+                uri=True,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE,
+            )
+            connection.set_pragmas(self.__pragmas)
+            self.__local.connection = connection
+            with self.__lock:
+                self.__connections.add(connection)
+        return connection
+
+    def close(self):
+        """
+        Close all the connections.
+        """
+        with self.__lock:
+            for connection in list(self.__connections):
+                connection.close()
+            self.__connections.clear()
+        self.__local = threading.local()
+
+
 # -------------------------------------------------------------------------
 #
 # Cursor class
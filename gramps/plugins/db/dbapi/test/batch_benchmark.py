@@ -0,0 +1,142 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the commits made by a batch transaction.
+
+Compares writing the objects one row at a time with the buffered bulk
+writes, with and without deferred references.  Run with::
+
+    python3 -m gramps.plugins.db.dbapi.test.batch_benchmark [PEOPLE]
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.dbconst import BATCHSIZE
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    ChildRef,
+    Date,
+    Event,
+    EventRef,
+    EventType,
+    Family,
+    Person,
+    Surname,
+)
+
+
+def add_person(db, index, trans):
+    """
+    Add a person with a birth event.
+    """
+    event = Event()
+    event.set_type(EventType.BIRTH)
+    event.set_date_object(Date(1800 + index % 200, 1 + index % 12, 1))
+    event.set_description("Birth of person %d" % index)
+    db.add_event(event, trans)
+    person = Person()
+    person.set_gender(Person.MALE if index % 2 else Person.FEMALE)
+    person.primary_name.first_name = "Given%d" % (index % 500)
+    surname = Surname()
+    surname.set_surname("Surname%d" % (index % 1000))
+    person.primary_name.set_surname_list([surname])
+    event_ref = EventRef()
+    event_ref.ref = event.handle
+    person.add_event_ref(event_ref)
+    db.add_person(person, trans)
+    return person
+
+
+def run(db, people):
+    """
+    Add a generated tree in one batch transaction and return the number of
+    commits made.
+
+    Every third person is the child of a family formed by the two people
+    added before.
+    """
+    count = 0
+    with DbTxn("Benchmark", db, batch=True) as trans:
+        for index in range(0, people - 2, 3):
+            mother = add_person(db, index, trans)
+            father = add_person(db, index + 1, trans)
+            child = add_person(db, index + 2, trans)
+            family = Family()
+            family.set_father_handle(father.handle)
+            family.set_mother_handle(mother.handle)
+            child_ref = ChildRef()
+            child_ref.ref = child.handle
+            family.add_child_ref(child_ref)
+            db.add_family(family, trans)
+            father.add_family_handle(family.handle)
+            db.commit_person(father, trans)
+            mother.add_family_handle(family.handle)
+            db.commit_person(mother, trans)
+            child.add_parent_family_handle(family.handle)
+            db.commit_person(child, trans)
+            count += 10
+    return count
+
+
+def main(people=10000):
+    """
+    Run the benchmark with and without buffered batch commits and deferred
+    references.
+    """
+    for label, batch_size, defer_references in (
+        ("row by row", 0, False),
+        ("buffered", BATCHSIZE, False),
+        ("deferred", BATCHSIZE, True),
+    ):
+        dirpath = tempfile.mkdtemp()
+        try:
+            db = make_database("sqlite")
+            db.load(dirpath)
+            db.batch_size = batch_size
+            db.defer_references = defer_references
+            start = perf_counter()
+            count = run(db, people)
+            elapsed = perf_counter() - start
+            db.close()
+        finally:
+            shutil.rmtree(dirpath)
+        print(
+            "%-10s: %d commits in %.2f seconds, %.0f rows/sec"
+            % (label, count, elapsed, count / elapsed)
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
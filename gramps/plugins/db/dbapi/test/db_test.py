@@ -23,20 +23,33 @@
 # Standard python modules
 #
 # -------------------------------------------------------------------------
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
 import unittest
+from unittest.mock import Mock, patch
 
 # -------------------------------------------------------------------------
 #
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from gramps.gen.db import DbTxn
-from gramps.gen.db.utils import make_database
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn, NOTE_KEY
+from gramps.gen.db.dbconst import ARRAYSIZE, CHUNKSIZE, DBBACKEND
+from gramps.gen.db.exceptions import DbVersionError
+from gramps.gen.errors import HandleError
+from gramps.gen.db.utils import make_database, set_profile_for_path
 from gramps.gen.lib import (
+    ChildRef,
+    ChildRefType,
     Person,
     Family,
     Event,
     Place,
+    PlaceRef,
     Repository,
     Source,
     Citation,
@@ -45,7 +58,16 @@ from gramps.gen.lib import (
     Tag,
     Researcher,
     Surname,
+    Date,
+    EventType,
 )
+from gramps.gen.filters import GenericFilterFactory
+from gramps.gen.filters.rules.note import MatchesSubstringOf, NotePrivate
+from gramps.gen.filters.rules.place import PlacePrivate
+from gramps.gen.filters.rules.person import IsSpouseOfFilterMatch
+from gramps.gen.proxy import PrivateProxyDb
+from gramps.gen.user import User
+from gramps.plugins.db.dbapi import dbapi
 
 
 # -------------------------------------------------------------------------
@@ -899,5 +921,959 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved["Mary"], (1, 3, 1))
 
 
+# -------------------------------------------------------------------------
+#
+# DbBatchTest class
+#
+# -------------------------------------------------------------------------
+class DbBatchTest(unittest.TestCase):
+    """
+    Tests of the buffered writes made by batch transactions.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def __add_family(self, trans, surname):
+        father = Person()
+        father.gender = Person.MALE
+        surname1 = Surname()
+        surname1.surname = surname
+        father.primary_name.set_surname_list([surname1])
+        self.db.add_person(father, trans)
+        family = Family()
+        family.set_father_handle(father.handle)
+        self.db.add_family(family, trans)
+        father.add_family_handle(family.handle)
+        self.db.commit_person(father, trans)
+        return father, family
+
+    def test_read_buffered(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            father, family = self.__add_family(trans, "Smith")
+            self.assertTrue(self.db.has_person_handle(father.handle))
+            self.assertTrue(self.db.has_person_gramps_id(father.gramps_id))
+            person = self.db.get_person_from_handle(father.handle)
+            self.assertEqual(person.family_list, [family.handle])
+            person = self.db.get_person_from_gramps_id(father.gramps_id)
+            self.assertEqual(person.handle, father.handle)
+            self.assertEqual(self.db.get_number_of_people(), 1)
+        self.assertEqual(self.db.get_number_of_families(), 1)
+
+    def test_commit(self):
+        self.db.batch_size = 3
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            pairs = [self.__add_family(trans, "Name%d" % i) for i in range(10)]
+        self.assertEqual(self.db.get_number_of_people(), 10)
+        self.assertEqual(self.db.get_number_of_families(), 10)
+        for father, family in pairs:
+            person = self.db.get_person_from_gramps_id(father.gramps_id)
+            self.assertEqual(person.family_list, [family.handle])
+            backlinks = list(self.db.find_backlink_handles(family.handle))
+            self.assertEqual(backlinks, [("Person", father.handle)])
+        surnames = set(self.db.get_surname_list())
+        self.assertEqual(surnames, {"Name%d" % i for i in range(10)})
+
+    def test_deferred_references(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            father, family = self.__add_family(trans, "Smith")
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            father.set_family_handle_list([])
+            self.db.commit_person(father, trans)
+            other, family2 = self.__add_family(trans, "Jones")
+            backlinks = list(self.db.find_backlink_handles(family2.handle))
+            self.assertEqual(backlinks, [("Person", other.handle)])
+            other.add_family_handle(family.handle)
+            self.db.commit_person(other, trans)
+        backlinks = list(self.db.find_backlink_handles(family.handle))
+        self.assertEqual(backlinks, [("Person", other.handle)])
+        backlinks = set(self.db.find_backlink_handles(family2.handle))
+        self.assertEqual(backlinks, {("Person", other.handle)})
+
+    def test_commit_many(self):
+        notes = [Note("note %d" % i) for i in range(5)]
+        for index, note in enumerate(notes):
+            note.set_handle("N%d" % index)
+            note.set_gramps_id(note.handle)
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            self.db.commit_many(notes, NOTE_KEY, trans)
+            notes[0].set("changed")
+            self.db.commit_many(notes[:1], NOTE_KEY, trans)
+        self.assertEqual(self.db.get_number_of_notes(), 5)
+        self.assertEqual(self.db.get_note_from_handle(notes[0].handle).get(), "changed")
+
+
+class DbRebuildTest(unittest.TestCase):
+    """
+    Tests of the rebuilds of the reference map and secondary columns.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add test objects", self.db) as trans:
+            for index in range(25):
+                person = Person()
+                surname = Surname()
+                surname.surname = "Name%d" % index
+                person.primary_name.set_surname_list([surname])
+                self.db.add_person(person, trans)
+                family = Family()
+                family.set_father_handle(person.handle)
+                self.db.add_family(family, trans)
+                person.add_family_handle(family.handle)
+                self.db.commit_person(person, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def __get_rows(self, sql):
+        self.db.dbapi.execute(sql)
+        return sorted(self.db.dbapi.fetchall())
+
+    def test_reindex_reference_map(self):
+        sql = "SELECT obj_handle, obj_class, ref_handle, ref_class FROM reference"
+        expected = self.__get_rows(sql)
+        self.assertEqual(len(expected), 50)
+        for workers in (1, 2):
+            self.assertEqual(self.db.reindex_reference_map(None, workers), 50)
+            self.assertEqual(self.__get_rows(sql), expected)
+
+    def test_rebuild_secondary(self):
+        sql = "SELECT handle, surname, gramps_id FROM person"
+        expected = self.__get_rows(sql)
+        for workers in (1, 2):
+            self.db.dbapi.execute("UPDATE person SET surname = '', gramps_id = ''")
+            self.db.dbapi.commit()
+            self.assertEqual(self.db.rebuild_secondary(None, workers), 50)
+            self.assertEqual(self.__get_rows(sql), expected)
+
+
+class DbCacheTest(unittest.TestCase):
+    """
+    Tests of the cache of objects read by handle.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.note = Note("original")
+        with DbTxn("Add note", self.db) as trans:
+            self.db.add_note(self.note, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def __get_text(self):
+        return self.db.get_note_from_handle(self.note.handle).get()
+
+    def test_hits(self):
+        self.assertEqual(self.__get_text(), "original")
+        self.assertEqual(
+            self.db.get_raw_note_data(self.note.handle)["text"]["string"], "original"
+        )
+        stats = self.db.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+
+    def test_disabled(self):
+        self.db.cache_size = 0
+        self.db.clear_cache()
+        self.__get_text()
+        self.__get_text()
+        stats = self.db.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (0, 2, 0))
+
+    def test_commit(self):
+        self.__get_text()
+        self.note.set("changed")
+        with DbTxn("Change note", self.db) as trans:
+            self.db.commit_note(self.note, trans)
+        self.assertEqual(self.__get_text(), "changed")
+        self.db.undo()
+        self.assertEqual(self.__get_text(), "original")
+        self.db.redo()
+        self.assertEqual(self.__get_text(), "changed")
+
+    def test_batch_commit(self):
+        self.__get_text()
+        with DbTxn("Change note", self.db, batch=True) as trans:
+            self.note.set("changed")
+            self.db.commit_note(self.note, trans)
+            self.assertEqual(self.__get_text(), "changed")
+            self.note.set("changed again")
+            self.db.commit_note(self.note, trans)
+        self.assertEqual(self.__get_text(), "changed again")
+
+    def test_remove(self):
+        self.__get_text()
+        with DbTxn("Remove note", self.db) as trans:
+            self.db.remove_note(self.note.handle, trans)
+        self.assertRaises(HandleError, self.db.get_note_from_handle, self.note.handle)
+        self.db.undo()
+        self.assertEqual(self.__get_text(), "original")
+
+
+class DbProfileTest(unittest.TestCase):
+    """
+    Tests of the SQLite tuning profiles.
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        self.db = make_database("sqlite")
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.dirpath)
+
+    def __get_pragma(self, pragma):
+        return self.db.dbapi.get_pragmas([pragma])[pragma]
+
+    def test_default(self):
+        self.db.load(self.dirpath)
+        self.assertEqual(self.db.profile, "default")
+        self.assertEqual(self.__get_pragma("journal_mode"), "delete")
+
+    def test_performance(self):
+        set_profile_for_path(self.dirpath, "performance")
+        self.db.load(self.dirpath)
+        self.assertEqual(self.__get_pragma("journal_mode"), "wal")
+        synchronous = self.__get_pragma("synchronous")
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            self.assertEqual(self.__get_pragma("synchronous"), 1)
+            self.db.add_note(Note("note"), trans)
+        self.assertEqual(self.__get_pragma("synchronous"), synchronous)
+        self.assertEqual(self.db.get_number_of_notes(), 1)
+
+
+class DbReaderTest(unittest.TestCase):
+    """
+    Tests of the reads made by other threads.
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        set_profile_for_path(self.dirpath, "performance")
+        self.db = make_database("sqlite")
+        self.db.load(self.dirpath)
+        self.notes = [Note("note %d" % index) for index in range(5)]
+        with DbTxn("Add notes", self.db) as trans:
+            for note in self.notes:
+                self.db.add_note(note, trans)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.dirpath)
+
+    def __run_thread(self, func):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(func()))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def __read(self):
+        return (
+            self.db._get_thread_reader() is self.db.dbapi,
+            sorted(note.get() for note in self.db.iter_notes()),
+            self.db.get_note_from_handle(self.notes[0].handle).get(),
+            self.db.has_note_gramps_id(self.notes[1].gramps_id),
+        )
+
+    def test_read(self):
+        self.db.clear_cache()
+        primary, texts, text, has_id = self.__run_thread(self.__read)
+        self.assertFalse(primary)
+        self.assertEqual(texts, ["note %d" % index for index in range(5)])
+        self.assertEqual(text, "note 0")
+        self.assertTrue(has_id)
+        self.assertEqual(self.db.get_cache_stats()["size"], 0)
+
+    def test_uncommitted(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            self.db.add_note(Note("new"), trans)
+            texts = self.__run_thread(self.__read)[1]
+            self.assertEqual(len(texts), 5)
+        texts = self.__run_thread(self.__read)[1]
+        self.assertEqual(len(texts), 6)
+
+
+class DbManyTest(unittest.TestCase):
+    """
+    Tests of reading many objects by handle in bulk.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.notes = [Note("note %d" % index) for index in range(CHUNKSIZE + 10)]
+        self.notes[1].set_privacy(True)
+        with DbTxn("Add notes", self.db) as trans:
+            for note in self.notes:
+                self.db.add_note(note, trans)
+        self.db.clear_cache()
+        self.handles = [note.handle for note in reversed(self.notes)]
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_objects(self):
+        notes = self.db.get_notes_from_handles(self.handles)
+        self.assertEqual(
+            [note.get() for note in notes],
+            ["note %d" % index for index in reversed(range(CHUNKSIZE + 10))],
+        )
+        stats = self.db.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (0, CHUNKSIZE + 10))
+        self.db.get_notes_from_handles(self.handles[:5] * 2)
+        self.assertEqual(self.db.get_cache_stats()["hits"], 5)
+
+    def test_missing(self):
+        self.assertRaises(
+            HandleError, self.db.get_notes_from_handles, [self.handles[0], "missing"]
+        )
+        data = self.db.get_raw_note_data_many(["missing", self.handles[0]])
+        self.assertIsNone(data[0])
+        self.assertEqual(data[1]["text"]["string"], "note %d" % (CHUNKSIZE + 9))
+
+    def test_batch(self):
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            note = Note("new")
+            self.db.add_note(note, trans)
+            notes = self.db.get_notes_from_handles([note.handle, self.handles[0]])
+            self.assertEqual(
+                [note.get() for note in notes], ["new", "note %d" % (CHUNKSIZE + 9)]
+            )
+
+    def test_proxy(self):
+        proxy = PrivateProxyDb(self.db)
+        notes = proxy.get_notes_from_handles(self.handles)
+        self.assertIsNone(notes[-2])
+        self.assertEqual(notes[-1].get(), "note 0")
+        self.assertEqual(self.db.get_cache_stats()["misses"], CHUNKSIZE + 10)
+        data = proxy.get_raw_note_data_many(self.handles + ["missing"])
+        self.assertEqual(data[:-3], [note.serialize() for note in notes[:-2]])
+        self.assertEqual(data[-3:], [None, notes[-1].serialize(), None])
+
+
+class DbSelectTest(unittest.TestCase):
+    """
+    Tests of selecting handles with conditions evaluated in SQL.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.tag = Tag()
+        self.tag.set_name("tag")
+        self.notes = [Note("note %d" % index) for index in range(4)]
+        with DbTxn("Add notes", self.db) as trans:
+            self.db.add_tag(self.tag, trans)
+            for index, note in enumerate(self.notes):
+                note.set_privacy(index % 2 == 1)
+                if index > 1:
+                    note.add_tag(self.tag.handle)
+                self.db.add_note(note, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def __select(self, conditions):
+        handles = [note.handle for note in self.notes]
+        return sorted(
+            handles.index(handle)
+            for handle in self.db.select_handles("Note", conditions)
+        )
+
+    def test_column(self):
+        self.assertEqual(self.__select([]), [0, 1, 2, 3])
+        self.assertEqual(self.__select([("private", "=", True)]), [1, 3])
+        self.assertEqual(
+            self.__select([("gramps_id", "REGEXP", "(?i)n000[12]")]), [1, 2]
+        )
+
+    def test_json(self):
+        conditions = [("$.tag_list", "CONTAINS", self.tag.handle)]
+        self.assertEqual(self.__select(conditions), [2, 3])
+        conditions.append(("private", "=", False))
+        self.assertEqual(self.__select(conditions), [2])
+
+    def test_unsupported(self):
+        self.assertIsNone(self.db.select_handles("Note", [("text", "=", "")]))
+        self.assertIsNone(self.db.select_handles("Note", [("$.x; --", "=", "")]))
+
+    def test_filter(self):
+        filt = GenericFilterFactory("Note")()
+        filt.add_rule(NotePrivate([]))
+        user = Mock(jobs=None)
+        handles = filt.apply(self.db, user=user)
+        self.assertCountEqual(handles, [self.notes[1].handle, self.notes[3].handle])
+        user.begin_progress.assert_called_once_with("Filter", "Applying ...", 2)
+        self.assertEqual(user.step_progress.call_count, 2)
+
+    def test_filter_tree(self):
+        # A child place is added before its parent
+        child = Place()
+        child.set_handle("A")
+        parent = Place()
+        parent.set_handle("B")
+        placeref = PlaceRef()
+        placeref.set_reference_handle(parent.handle)
+        child.add_placeref(placeref)
+        with DbTxn("Add places", self.db) as trans:
+            for place in (child, parent):
+                place.set_privacy(True)
+                self.db.add_place(place, trans)
+        filt = GenericFilterFactory("Place")()
+        filt.add_rule(PlacePrivate([]))
+        with patch.object(self.db, "select_handles") as select:
+            handles = filt.apply(self.db, tree=True)
+        select.assert_not_called()
+        self.assertEqual(handles, [parent.handle, child.handle])
+
+
+class DbIndexTest(unittest.TestCase):
+    """
+    Tests of the indexes of the fields declared by the object classes.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.events = []
+        with DbTxn("Add events", self.db) as trans:
+            for year in (1900, 1850, 1875):
+                event = Event()
+                event.set_type(EventType.BIRTH if year > 1860 else EventType.DEATH)
+                event.set_date_object(Date(year, 1, 1))
+                self.db.add_event(event, trans)
+                self.events.append(event.handle)
+
+    def tearDown(self):
+        self.db.close()
+
+    def __get_plan(self, sql):
+        self.db.dbapi.execute("EXPLAIN QUERY PLAN " + sql)
+        return " ".join(row[-1] for row in self.db.dbapi.fetchall())
+
+    def test_order_by(self):
+        handles = self.db.select_handles("Event", [], order_by="$.date.sortval")
+        self.assertEqual(handles, [self.events[1], self.events[2], self.events[0]])
+        handles = self.db.select_handles(
+            "Event", [("type_value", "=", EventType.BIRTH)], order_by="date_sortval"
+        )
+        self.assertEqual(handles, [self.events[2], self.events[0]])
+
+    def test_index(self):
+        self.assertIn(
+            "event_date_sortval",
+            self.__get_plan("SELECT handle FROM event WHERE date_sortval > 0"),
+        )
+        self.assertIn(
+            "person_change",
+            self.__get_plan("SELECT handle FROM person WHERE change > 0"),
+        )
+
+    def test_commit(self):
+        event = self.db.get_event_from_handle(self.events[0])
+        event.set_date_object(Date(1800, 1, 1))
+        with DbTxn("Change event", self.db) as trans:
+            self.db.commit_event(event, trans)
+        handles = self.db.select_handles("Event", [], order_by="date_sortval")
+        self.assertEqual(handles[0], self.events[0])
+        self.db.rebuild_secondary()
+        handles = self.db.select_handles(
+            "Event", [("$.date.sortval", "<", Date(1860, 1, 1).get_sort_value())]
+        )
+        self.assertEqual(sorted(handles), sorted(self.events[:2]))
+
+    def test_version(self):
+        # A database of a newer version is not changed
+        dirpath = tempfile.mkdtemp()
+        try:
+            db = make_database("sqlite")
+            db.load(dirpath)
+            db._set_metadata("version", str(db.VERSION[0] + 1))
+            db.dbapi.execute("DROP INDEX event_date_sortval")
+            db.dbapi.commit()
+            db.close()
+            db = make_database("sqlite")
+            self.assertRaises(DbVersionError, db.load, dirpath)
+            connection = sqlite3.connect(os.path.join(dirpath, "sqlite.db"))
+            indexes = connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            ).fetchall()
+            connection.close()
+            self.assertIn(("event_change",), indexes)
+            self.assertNotIn(("event_date_sortval",), indexes)
+        finally:
+            shutil.rmtree(dirpath)
+
+
+class DbTextTest(unittest.TestCase):
+    """
+    Tests of the full-text index.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add objects", self.db) as trans:
+            self.note = Note("The quick brown fox")
+            self.db.add_note(self.note, trans)
+            self.person = Person()
+            self.person.primary_name.set_first_name("Bartholomew")
+            self.db.add_person(self.person, trans)
+            self.source = Source()
+            self.source.set_title("Parish register of Brownsville")
+            self.db.add_source(self.source, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_search(self):
+        self.assertEqual(
+            self.db.search_text("bartholo"), [("Person", self.person.handle)]
+        )
+        self.assertEqual(
+            sorted(self.db.search_text("Brown")),
+            sorted([("Note", self.note.handle), ("Source", self.source.handle)]),
+        )
+        self.assertEqual(
+            self.db.search_text("brown", ["Source"]),
+            [("Source", self.source.handle)],
+        )
+        self.assertEqual(self.db.search_text("purple"), [])
+        self.assertIsNone(self.db.search_text("fo"))
+        self.assertIsNone(self.db.search_text("brown", ["Event"]))
+        self.assertIsNone(PrivateProxyDb(self.db).search_text("brown"))
+
+    def test_commit(self):
+        self.note.set("The lazy dog")
+        with DbTxn("Change note", self.db) as trans:
+            self.db.commit_note(self.note, trans)
+        self.assertEqual(self.db.search_text("quick"), [])
+        self.assertEqual(self.db.search_text("lazy"), [("Note", self.note.handle)])
+        with DbTxn("Add note", self.db, batch=True) as trans:
+            note = Note("A batch of notes")
+            self.db.add_note(note, trans)
+            self.assertEqual(self.db.search_text("batch"), [("Note", note.handle)])
+
+    def test_remove(self):
+        with DbTxn("Remove note", self.db) as trans:
+            self.db.remove_note(self.note.handle, trans)
+        self.assertEqual(self.db.search_text("quick"), [])
+        self.db.undo()
+        self.assertEqual(self.db.search_text("quick"), [("Note", self.note.handle)])
+
+    def test_existing(self):
+        dirpath = tempfile.mkdtemp()
+        try:
+            db = make_database("sqlite")
+            db.load(dirpath)
+            with DbTxn("Add note", db) as trans:
+                note = Note("The quick brown fox")
+                db.add_note(note, trans)
+            db.dbapi.execute("DROP TABLE text_index")
+            db.dbapi.execute("DROP TABLE text_handle")
+            db.dbapi.commit()
+            db.close()
+            db.load(dirpath)
+            self.assertEqual(db.search_text("quick"), [("Note", note.handle)])
+            db.close()
+        finally:
+            shutil.rmtree(dirpath)
+
+    def test_stale(self):
+        dirpath = tempfile.mkdtemp()
+        try:
+            db = make_database("sqlite")
+            db.load(dirpath)
+            with DbTxn("Add note", db) as trans:
+                note = Note("The quick brown fox")
+                db.add_note(note, trans)
+            db.close()
+            # A writer that does not maintain the index changes the note
+            connection = sqlite3.connect(os.path.join(dirpath, "sqlite.db"))
+            connection.execute(
+                "UPDATE note SET change = change + 1, "
+                "json_data = replace(json_data, 'quick', 'slow')"
+            )
+            connection.commit()
+            connection.close()
+            db.load(dirpath)
+            self.assertEqual(db.search_text("slow"), [("Note", note.handle)])
+            self.assertEqual(db.search_text("quick"), [])
+            db.close()
+        finally:
+            shutil.rmtree(dirpath)
+
+    def test_unsupported(self):
+        dirpath = tempfile.mkdtemp()
+        try:
+            db = make_database("sqlite")
+            db.load(dirpath)
+            # A table that can't be read as a full-text index, as without
+            # the FTS5 module
+            db.dbapi.execute("DROP TABLE text_index")
+            db.dbapi.execute("CREATE TABLE text_index (text TEXT)")
+            db.dbapi.commit()
+            db.close()
+            db.load(dirpath)
+            self.assertIsNone(db.search_text("quick"))
+            with DbTxn("Add note", db) as trans:
+                db.add_note(Note("The quick brown fox"), trans)
+            db.close()
+        finally:
+            shutil.rmtree(dirpath)
+
+
+class DbUndoTest(unittest.TestCase):
+    """
+    Tests of the undo history kept on disk.
+    """
+
+    def setUp(self):
+        self.size = config.get("database.undo-size")
+        self.delta = config.get("database.undo-delta")
+        self.dirpath = tempfile.mkdtemp()
+        self.db = make_database("sqlite")
+
+    def tearDown(self):
+        if self.db.is_open():
+            self.db.close()
+        shutil.rmtree(self.dirpath)
+        config.set("database.undo-size", self.size)
+        config.set("database.undo-delta", self.delta)
+
+    def __edit_note(self, count):
+        self.db.load(self.dirpath)
+        note = Note("text 0")
+        with DbTxn("Add note", self.db) as trans:
+            self.db.add_note(note, trans)
+        for index in range(1, count):
+            note.set("text %d" % index)
+            with DbTxn("Edit note", self.db) as trans:
+                self.db.commit_note(note, trans)
+        return note.handle
+
+    def __get_text(self, handle):
+        return self.db.get_note_from_handle(handle).get()
+
+    def test_file(self):
+        path = os.path.join(self.dirpath, "undo.db")
+        self.__edit_note(2)
+        self.assertTrue(os.path.exists(path))
+        self.db.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_size(self):
+        config.set("database.undo-size", 3)
+        handle = self.__edit_note(5)
+        undodb = self.db.undodb
+        self.assertEqual(undodb.undo_count, 3)
+        self.assertRaises(IndexError, undodb.__getitem__, 0)
+        while self.db.undo():
+            pass
+        self.assertEqual(self.__get_text(handle), "text 1")
+        self.db.redo()
+        self.assertEqual(self.__get_text(handle), "text 2")
+
+    def test_delta(self):
+        config.set("database.undo-delta", True)
+        handle = self.__edit_note(3)
+        txn = self.db.undodb.undoq[-1]
+        record = txn.get_record(txn.first)
+        self.assertEqual(record[3]["text"]["string"], "text 1")
+        self.assertEqual(record[4]["text"]["string"], "text 2")
+        self.db.undo()
+        self.assertEqual(self.__get_text(handle), "text 1")
+        self.db.undo()
+        self.assertEqual(self.__get_text(handle), "text 0")
+        self.db.redo()
+        self.db.redo()
+        self.assertEqual(self.__get_text(handle), "text 2")
+
+
+class DbGraphTest(unittest.TestCase):
+    """
+    Tests of the genealogy graph.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add family", self.db) as trans:
+            self.father = self.__add_person(trans)
+            self.mother = self.__add_person(trans)
+            self.child = self.__add_person(trans)
+            self.family = Family()
+            self.family.set_father_handle(self.father.handle)
+            self.family.set_mother_handle(self.mother.handle)
+            self.db.add_family(self.family, trans)
+            self.__add_child(self.child, ChildRefType.ADOPTED, trans)
+        self.graph = self.db.get_genealogy_graph()
+
+    def tearDown(self):
+        self.db.close()
+
+    def __add_person(self, trans):
+        person = Person()
+        self.db.add_person(person, trans)
+        return person
+
+    def __add_child(self, child, relation, trans):
+        child_ref = ChildRef()
+        child_ref.ref = child.handle
+        child_ref.set_father_relation(relation)
+        self.family.add_child_ref(child_ref)
+        child.add_parent_family_handle(self.family.handle)
+        self.db.commit_family(self.family, trans)
+        self.db.commit_person(child, trans)
+        self.father.add_family_handle(self.family.handle)
+        self.mother.add_family_handle(self.family.handle)
+        self.db.commit_person(self.father, trans)
+        self.db.commit_person(self.mother, trans)
+
+    def test_graph(self):
+        graph = self.graph
+        family = self.family.handle
+        self.assertEqual(graph.get_father_handle(family), self.father.handle)
+        self.assertEqual(graph.get_mother_handle(family), self.mother.handle)
+        self.assertEqual(graph.get_child_handles(family), [self.child.handle])
+        self.assertEqual(
+            graph.get_child_refs(family),
+            [(self.child.handle, ChildRefType.ADOPTED, ChildRefType.BIRTH)],
+        )
+        self.assertEqual(
+            graph.get_main_parents_family_handle(self.child.handle), family
+        )
+        self.assertEqual(graph.get_family_handles(self.father.handle), [family])
+        self.assertEqual(graph.get_parent_family_handles(self.father.handle), [])
+        self.assertTrue(graph.has_person(self.child.handle))
+        self.assertFalse(graph.has_person("missing"))
+        self.assertIsNone(PrivateProxyDb(self.db).get_genealogy_graph())
+
+    def test_commit(self):
+        with DbTxn("Add child", self.db) as trans:
+            child = self.__add_person(trans)
+            self.__add_child(child, ChildRefType.BIRTH, trans)
+        self.assertIs(self.db.get_genealogy_graph(), self.graph)
+        self.assertEqual(
+            self.graph.get_child_handles(self.family.handle),
+            [self.child.handle, child.handle],
+        )
+        self.db.undo()
+        self.assertEqual(
+            self.graph.get_child_handles(self.family.handle), [self.child.handle]
+        )
+        self.assertFalse(self.graph.has_person(child.handle))
+
+    def test_batch(self):
+        with DbTxn("Add child", self.db, batch=True) as trans:
+            child = self.__add_person(trans)
+            self.__add_child(child, ChildRefType.BIRTH, trans)
+            self.assertEqual(
+                self.graph.get_main_parents_family_handle(child.handle),
+                self.family.handle,
+            )
+
+    def test_remove(self):
+        with DbTxn("Remove family", self.db) as trans:
+            self.db.remove_family_relationships(self.family.handle, trans)
+        self.assertFalse(self.graph.has_family(self.family.handle))
+        self.assertEqual(self.graph.get_parent_family_handles(self.child.handle), [])
+        self.assertEqual(self.graph.get_family_handles(self.father.handle), [])
+        self.db.undo()
+        self.assertEqual(
+            self.graph.get_main_parents_family_handle(self.child.handle),
+            self.family.handle,
+        )
+        self.assertEqual(
+            self.graph.get_father_handle(self.family.handle), self.father.handle
+        )
+
+
+class DbSortKeyTest(unittest.TestCase):
+    """
+    Tests of the sort keys stored for the list views.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.people = []
+        with DbTxn("Add people", self.db) as trans:
+            for name in ("Ann", "Bob"):
+                person = Person()
+                person.primary_name.set_first_name(name)
+                self.db.add_person(person, trans)
+                self.people.append(person)
+        self.keys = [("a", self.people[0].handle), ("b", self.people[1].handle)]
+
+    def tearDown(self):
+        self.db.close()
+
+    def __store(self, view, depends=()):
+        self.assertEqual(self.db.get_sort_keys("Person", view, depends), {})
+        self.db.set_sort_keys("Person", view, self.keys, depends, complete=True)
+
+    def test_store(self):
+        self.db.set_sort_keys("Person", "name", self.keys)
+        self.assertEqual(self.db.get_sort_keys("Person", "name"), {})
+        self.__store("name")
+        self.assertEqual(
+            self.db.get_sort_keys("Person", "name"),
+            {handle: key for key, handle in self.keys},
+        )
+        self.assertEqual(self.db.get_sort_keys("Person", "birth", ("Event",)), {})
+        self.assertIsNone(PrivateProxyDb(self.db).get_sort_keys("Person", "name"))
+
+    def test_commit(self):
+        self.__store("name")
+        self.__store("birth", ("Event",))
+        with DbTxn("Edit person", self.db) as trans:
+            self.db.commit_person(self.people[0], trans)
+        self.assertEqual(
+            self.db.get_sort_keys("Person", "name"), {self.people[1].handle: "b"}
+        )
+        self.db.set_sort_keys("Person", "name", self.keys[:1])
+        self.assertEqual(len(self.db.get_sort_keys("Person", "name")), 2)
+        with DbTxn("Add event", self.db) as trans:
+            self.db.add_event(Event(), trans)
+        self.assertEqual(len(self.db.get_sort_keys("Person", "name")), 2)
+        self.assertEqual(self.db.get_sort_keys("Person", "birth", ("Event",)), {})
+        self.db.set_sort_keys("Person", "birth", self.keys, ("Event",))
+        self.assertEqual(self.db.get_sort_keys("Person", "birth", ("Event",)), {})
+
+    def __count_keys(self, view):
+        self.db.dbapi.execute("SELECT COUNT(*) FROM sort_key WHERE view = ?", [view])
+        return self.db.dbapi.fetchone()[0]
+
+    def test_invalidate(self):
+        self.__store("birth", ("Event",))
+        with patch.object(
+            self.db.dbapi, "execute", wraps=self.db.dbapi.execute
+        ) as execute:
+            with DbTxn("Add events", self.db) as trans:
+                self.db.add_event(Event(), trans)
+                self.db.add_event(Event(), trans)
+        views = [
+            call for call in execute.call_args_list if "depends LIKE" in call[0][0]
+        ]
+        # The keys are removed with their view, once in the transaction
+        self.assertEqual(len(views), 2)
+        self.assertEqual(self.__count_keys("birth"), 0)
+
+    def test_prune(self):
+        with patch.object(dbapi, "SORT_KEY_VIEWS", 2):
+            for view in ("name", "birth", "death"):
+                self.__store(view)
+        self.assertEqual(self.db.get_sort_keys("Person", "name"), {})
+        self.assertEqual(self.__count_keys("name"), 0)
+        self.assertEqual(len(self.db.get_sort_keys("Person", "birth")), 2)
+        self.assertEqual(len(self.db.get_sort_keys("Person", "death")), 2)
+
+    def test_index(self):
+        self.db.dbapi.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM sort_key WHERE handle = ?", ["a"]
+        )
+        self.assertIn("sort_key_handle", str(self.db.dbapi.fetchall()))
+
+    def test_remove(self):
+        self.__store("name")
+        with DbTxn("Remove person", self.db) as trans:
+            self.db.remove_person(self.people[0].handle, trans)
+        self.assertEqual(
+            self.db.get_sort_keys("Person", "name"), {self.people[1].handle: "b"}
+        )
+        self.db.undo()
+        self.assertEqual(
+            self.db.get_sort_keys("Person", "name"), {self.people[1].handle: "b"}
+        )
+
+
+def count_rows(db, context, rows):
+    """
+    Return a context value and the number of rows, for DbMapTest.
+    """
+    return context, len(rows)
+
+
+def row_handles(db, context, rows):
+    """
+    Return the handles of the rows, for DbMapTest.
+    """
+    return [handle for handle, data in rows]
+
+
+class DbMapTest(unittest.TestCase):
+    """
+    Tests of mapping a function over raw data in worker processes.
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        with open(os.path.join(self.dirpath, DBBACKEND), "w") as file:
+            file.write("sqlite")
+        self.db = make_database("sqlite")
+        self.db.load(self.dirpath)
+        with DbTxn("Add notes", self.db, batch=True) as trans:
+            for index in range(2 * ARRAYSIZE + 10):
+                self.db.add_note(Note("note %d" % (index % 7)), trans)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.dirpath)
+
+    def test_map_data(self):
+        results = list(self.db.map_data("Note", count_rows, "context", 2))
+        self.assertEqual(results, [("context", ARRAYSIZE)] * 2 + [("context", 10)])
+        self.assertIsNone(self.db.map_data("Note", count_rows, "context", 1))
+        self.assertIsNone(self.db.map_data("Note", lambda *args: 0, None, 2))
+        self.assertIsNone(PrivateProxyDb(self.db).map_data("Note", count_rows, None, 2))
+
+    def test_map_data_ordered(self):
+        handles = []
+        for chunk in self.db.map_data("Note", row_handles, None, 2, ordered=True):
+            handles.extend(chunk)
+        self.assertEqual(handles, sorted(self.db.get_note_handles()))
+
+    def test_filter(self):
+        filt = GenericFilterFactory("Note")()
+        filt.add_rule(MatchesSubstringOf(["note 3"]))
+        handles = filt.apply(self.db, jobs=1)
+        self.assertEqual(len(handles), 287)
+        self.assertEqual(filt.apply(self.db, jobs=2), handles)
+        filt.set_invert(True)
+        self.assertEqual(len(filt.apply(self.db, jobs=2)), 2 * ARRAYSIZE + 10 - 287)
+
+    def test_filter_user(self):
+        # The jobs of a command line user are not kept in the settings
+        filt = GenericFilterFactory("Note")()
+        filt.add_rule(MatchesSubstringOf(["note 3"]))
+        user = User()
+        user.jobs = 2
+        with patch.object(filt, "check_parallel", return_value=[]) as check:
+            filt.apply(self.db, user=user)
+        check.assert_called_once_with(self.db, 2, user)
+        self.assertEqual(config.get("database.filter-jobs"), 1)
+
+    def test_serial_rules(self):
+        filt = GenericFilterFactory("Person")()
+        self.assertTrue(filt.is_parallel())
+        rule = IsSpouseOfFilterMatch(["filter"])
+        filt.add_rule(rule)
+        # The rule holds a rule matching another filter once prepared
+        rule.requestprepare(self.db, None)
+        self.assertFalse(filt.is_parallel())
+        rule.requestreset()
+        self.assertEqual(filt.apply(self.db, jobs=2), [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,103 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the SQLite tuning profiles.
+
+Compares the profiles for an import workload, a batch transaction adding a
+generated tree, and for a read-heavy workload with the object cache
+disabled.  Run with::
+
+    python3 -m gramps.plugins.db.dbapi.test.profile_benchmark [PEOPLE]
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import random
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db.utils import DB_PROFILES, make_database, set_profile_for_path
+from gramps.plugins.db.dbapi.test.batch_benchmark import run
+
+READS = 50000
+
+
+def read(db):
+    """
+    Read people by handle in a random order, with their events and
+    backlinks, and return the number of reads made.
+    """
+    handles = list(db.get_person_handles())
+    rng = random.Random(0)
+    count = 0
+    for _ in range(READS):
+        person = db.get_person_from_handle(rng.choice(handles))
+        for event_ref in person.get_event_ref_list():
+            db.get_event_from_handle(event_ref.ref)
+        count += 2
+    for handle in handles[:1000]:
+        list(db.find_backlink_handles(handle))
+        count += 1
+    return count
+
+
+def main(people=10000):
+    """
+    Run the import and read benchmarks for each profile.
+    """
+    for profile in DB_PROFILES:
+        dirpath = tempfile.mkdtemp()
+        try:
+            set_profile_for_path(dirpath, profile)
+            db = make_database("sqlite")
+            db.load(dirpath)
+            db.cache_size = 0
+            start = perf_counter()
+            count = run(db, people)
+            elapsed = perf_counter() - start
+            print(
+                "%-11s import: %d commits in %.2f seconds, %.0f rows/sec"
+                % (profile, count, elapsed, count / elapsed)
+            )
+            start = perf_counter()
+            count = read(db)
+            elapsed = perf_counter() - start
+            print(
+                "%-11s read:   %d reads in %.2f seconds, %.0f reads/sec"
+                % (profile, count, elapsed, count / elapsed)
+            )
+            db.close()
+        finally:
+            shutil.rmtree(dirpath)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -34,6 +34,7 @@
 # -------------------------------------------------------------------------
 import os
 import time
+from collections import OrderedDict, defaultdict
 
 # -------------------------------------------------------------------------
 #
@@ -59,7 +60,8 @@ from gramps.gen.lib import (
 )
 from gramps.version import VERSION
 import gramps.plugins.lib.libgedcom as libgedcom
-from gramps.gen.errors import DatabaseError
+from gramps.gen.db.dbconst import CHUNKSIZE
+from gramps.gen.errors import DatabaseError, HandleError
 
 # keep the following line even though not obviously used (works on import)
 from gramps.gui.plug.export import WriterOptionBox
@@ -161,6 +163,11 @@ PEDIGREE_TYPES = {
 
 NOTES_PER_PERSON = 104  # fudge factor to make progress meter a bit smoother
 
+# Number of objects of each type kept by the lookup of referenced objects
+LOOKUP_SIZE = 20000
+# Size of the buffer of the GEDCOM file
+WRITE_BUFFER_SIZE = 1 << 20
+
 
 # -------------------------------------------------------------------------
 #
@@ -215,6 +222,54 @@ def breakup(txt, limit):
     return data
 
 
+# -------------------------------------------------------------------------
+#
+# gedcom_lines
+#
+# -------------------------------------------------------------------------
+def gedcom_lines(level, token, textlines="", limit=72):
+    """
+    Return the lines of text of a GEDCOM tag in the form of:
+
+        LEVEL TOKEN text
+
+    If the text contains newlines, it is broken into multiple lines using
+    the CONT token. If any line is greater than the limit, it will broken
+    into multiple lines using CONC.
+    """
+    assert token
+    if not textlines:
+        return "%d %s\n" % (level, token)
+    if (
+        (not limit or len(textlines) <= limit)
+        and "\n" not in textlines
+        and "\r" not in textlines
+        and "@" not in textlines
+    ):
+        return "%d %s %s\n" % (level, token, textlines)
+    # break the line into multiple lines if a newline is found
+    textlines = textlines.replace("\n\r", "\n")
+    textlines = textlines.replace("\r", "\n")
+    # Need to double '@' See Gedcom 5.5 spec 'any_char'
+    # but avoid xrefs and escapes
+    if not textlines.startswith("@") and "@#" not in textlines:
+        textlines = textlines.replace("@", "@@")
+    lines = []
+    token_level = level
+    for text in textlines.split("\n"):
+        # make it unicode so that breakup below does the right thin.
+        text = str(text)
+        if limit:
+            prefix = "\n%d CONC " % (level + 1)
+            txt = prefix.join(breakup(text, limit))
+        else:
+            txt = text
+        lines.append("%d %s %s\n" % (token_level, token, txt))
+        token_level = level + 1
+        token = "CONT"
+    return "".join(lines)
+
+
 # -------------------------------------------------------------------------
 #
 # event_has_subordinate_data
@@ -239,6 +294,128 @@ def event_has_subordinate_data(event, event_ref):
         return False
 
 
+# -------------------------------------------------------------------------
+#
+# ObjectLookup class
+#
+# -------------------------------------------------------------------------
+class ObjectLookup:
+    """
+    The objects referenced by the records of a GEDCOM export.
+
+    The objects referenced by each chunk of records, and by their events and
+    citations, are read from the database in bulk before the records are
+    written.  Up to a number of the most recently used objects of each type
+    are kept, so that shared objects such as places and sources are only
+    read once.
+    """
+
+    def __init__(self, dbase, size=LOOKUP_SIZE):
+        self.size = size
+        self.tables = {}
+        for obj_type, get_one, get_many in (
+            (
+                "Citation",
+                dbase.get_citation_from_handle,
+                dbase.get_citations_from_handles,
+            ),
+            ("Event", dbase.get_event_from_handle, dbase.get_events_from_handles),
+            ("Family", dbase.get_family_from_handle, dbase.get_families_from_handles),
+            ("Media", dbase.get_media_from_handle, dbase.get_media_from_handles),
+            ("Note", dbase.get_note_from_handle, dbase.get_notes_from_handles),
+            ("Person", dbase.get_person_from_handle, dbase.get_people_from_handles),
+            ("Place", dbase.get_place_from_handle, dbase.get_places_from_handles),
+            (
+                "Repository",
+                dbase.get_repository_from_handle,
+                dbase.get_repositories_from_handles,
+            ),
+            ("Source", dbase.get_source_from_handle, dbase.get_sources_from_handles),
+        ):
+            self.tables[obj_type] = (OrderedDict(), get_one, get_many)
+
+    def get(self, obj_type, handle):
+        """
+        Return an object of a type, reading it if it was not read before.
+        """
+        objects, get_one, get_many = self.tables[obj_type]
+        if handle in objects:
+            objects.move_to_end(handle)
+            return objects[handle]
+        obj = get_one(handle)
+        objects[handle] = obj
+        return obj
+
+    def load(self, obj_type, handles):
+        """
+        Read the objects of a type with the given handles that were not read
+        before in bulk, and return them.
+        """
+        objects, get_one, get_many = self.tables[obj_type]
+        handles = [
+            handle
+            for handle in dict.fromkeys(handles)
+            if handle and handle not in objects
+        ]
+        if not handles:
+            return []
+        try:
+            result = get_many(handles)
+        except HandleError:
+            # Missing objects are left for get to report
+            return []
+        objects.update(zip(handles, result))
+        return result
+
+    def prefetch(self, records):
+        """
+        Read the objects referenced by records, and by the events and
+        citations among these, in bulk.
+        """
+        for objects, get_one, get_many in self.tables.values():
+            while len(objects) > self.size:
+                objects.popitem(last=False)
+        while records:
+            references = defaultdict(list)
+            for record in records:
+                if record is not None:
+                    for obj_type, handle in record.get_referenced_handles_recursively():
+                        references[obj_type].append(handle)
+            records = []
+            for obj_type, handles in references.items():
+                if obj_type in self.tables:
+                    result = self.load(obj_type, handles)
+                    if obj_type in ("Citation", "Event"):
+                        records.extend(result)
+
+    def get_citation_from_handle(self, handle):
+        return self.get("Citation", handle)
+
+    def get_event_from_handle(self, handle):
+        return self.get("Event", handle)
+
+    def get_family_from_handle(self, handle):
+        return self.get("Family", handle)
+
+    def get_media_from_handle(self, handle):
+        return self.get("Media", handle)
+
+    def get_note_from_handle(self, handle):
+        return self.get("Note", handle)
+
+    def get_person_from_handle(self, handle):
+        return self.get("Person", handle)
+
+    def get_place_from_handle(self, handle):
+        return self.get("Place", handle)
+
+    def get_repository_from_handle(self, handle):
+        return self.get("Repository", handle)
+
+    def get_source_from_handle(self, handle):
+        return self.get("Source", handle)
+
+
 # -------------------------------------------------------------------------
 #
 # GedcomWriter class
@@ -256,6 +433,7 @@ class GedcomWriter(UpdateCallback):
         self.dbase = database
         self.dirname = None
         self.gedcom_file = None
+        self.lookup = None
         self.progress_cnt = 0
         self.setup(option_box)
 
@@ -275,7 +453,10 @@ class GedcomWriter(UpdateCallback):
         """
 
         self.dirname = os.path.dirname(filename)
-        with open(filename, "w", encoding="utf-8") as self.gedcom_file:
+        self.lookup = ObjectLookup(self.dbase)
+        with open(
+            filename, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE
+        ) as self.gedcom_file:
             person_len = self.dbase.get_number_of_people()
             family_len = self.dbase.get_number_of_families()
             source_len = self.dbase.get_number_of_sources()
@@ -308,30 +489,7 @@ class GedcomWriter(UpdateCallback):
         into multiple lines using CONC.
 
         """
-        assert token
-        if textlines:
-            # break the line into multiple lines if a newline is found
-            textlines = textlines.replace("\n\r", "\n")
-            textlines = textlines.replace("\r", "\n")
-            # Need to double '@' See Gedcom 5.5 spec 'any_char'
-            # but avoid xrefs and escapes
-            if not textlines.startswith("@") and "@#" not in textlines:
-                textlines = textlines.replace("@", "@@")
-            textlist = textlines.split("\n")
-            token_level = level
-            for text in textlist:
-                # make it unicode so that breakup below does the right thin.
-                text = str(text)
-                if limit:
-                    prefix = "\n%d CONC " % (level + 1)
-                    txt = prefix.join(breakup(text, limit))
-                else:
-                    txt = text
-                self.gedcom_file.write("%d %s %s\n" % (token_level, token, txt))
-                token_level = level + 1
-                token = "CONT"
-        else:
-            self.gedcom_file.write("%d %s\n" % (level, token))
+        self.gedcom_file.write(gedcom_lines(level, token, textlines, limit))
 
     def _header(self, filename):
         """
@@ -367,7 +525,7 @@ class GedcomWriter(UpdateCallback):
 
         """
         local_time = time.localtime(time.time())
-        (year, mon, day, hour, minutes, sec) = local_time[0:6]
+        year, mon, day, hour, minutes, sec = local_time[0:6]
         date_str = "%d %s %d" % (day, libgedcom.MONTH[mon], year)
         time_str = "%02d:%02d:%02d" % (hour, minutes, sec)
         rname = self.dbase.get_researcher().get_name()
@@ -436,19 +594,26 @@ class GedcomWriter(UpdateCallback):
 
         """
         self.set_text(_("Writing individuals"))
-        phandles = self.dbase.iter_person_handles()
+        for person in self._records(
+            self.dbase.iter_people(), self.dbase.get_people_from_handles
+        ):
+            self.update()
+            self._person(person)
 
-        sorted_list = []
-        for handle in phandles:
-            person = self.dbase.get_person_from_handle(handle)
-            if person:
-                data = (person.get_gramps_id(), handle)
-                sorted_list.append(data)
-        sorted_list.sort()
+    def _records(self, objects, get_objects):
+        """
+        Return an iterator over objects sorted by Gramps ID.
 
-        for data in sorted_list:
-            self.update()
-            self._person(self.dbase.get_person_from_handle(data[1]))
+        The objects are read again by chunks, in bulk, along with the objects
+        they refer to, so that only the IDs are kept for the sort.
+        """
+        sorted_list = sorted((obj.get_gramps_id(), obj.get_handle()) for obj in objects)
+        for start in range(0, len(sorted_list), CHUNKSIZE):
+            records = get_objects(
+                [data[1] for data in sorted_list[start : start + CHUNKSIZE]]
+            )
+            self.lookup.prefetch(records)
+            yield from records
 
     def _person(self, person):
         """
@@ -507,7 +672,7 @@ class GedcomWriter(UpdateCallback):
         +1 <<SOURCE_CITATION>> {0:M}
         """
         for ref in person.get_person_ref_list():
-            person = self.dbase.get_person_from_handle(ref.ref)
+            person = self.lookup.get_person_from_handle(ref.ref)
             if person:
                 self._writeln(level, "ASSO", "@%s@" % person.get_gramps_id())
                 self._writeln(level + 1, "RELA", ref.get_relation())
@@ -522,7 +687,7 @@ class GedcomWriter(UpdateCallback):
 
         """
         for note_handle in notelist:
-            note = self.dbase.get_note_from_handle(note_handle)
+            note = self.lookup.get_note_from_handle(note_handle)
             if note:
                 self._writeln(level, "NOTE", "@%s@" % note.get_gramps_id())
 
@@ -594,7 +759,7 @@ class GedcomWriter(UpdateCallback):
         # bug report 2370.
         adop_written = False
         for event_ref in person.get_event_ref_list():
-            event = self.dbase.get_event_from_handle(event_ref.ref)
+            event = self.lookup.get_event_from_handle(event_ref.ref)
             if not event:
                 continue
             self._process_person_event(person, event, event_ref)
@@ -661,7 +826,7 @@ class GedcomWriter(UpdateCallback):
         adoptions = []
 
         for family in [
-            self.dbase.get_family_from_handle(fh)
+            self.lookup.get_family_from_handle(fh)
             for fh in person.get_parent_family_handle_list()
         ]:
             if family is None:
@@ -767,7 +932,7 @@ class GedcomWriter(UpdateCallback):
 
         # get the list of familes from the handle list
         family_list = [
-            self.dbase.get_family_from_handle(hndl)
+            self.lookup.get_family_from_handle(hndl)
             for hndl in person.get_parent_family_handle_list()
         ]
 
@@ -822,7 +987,7 @@ class GedcomWriter(UpdateCallback):
 
         # get the list of familes from the handle list
         family_list = [
-            self.dbase.get_family_from_handle(hndl)
+            self.lookup.get_family_from_handle(hndl)
             for hndl in person.get_family_handle_list()
         ]
 
@@ -874,18 +1039,11 @@ class GedcomWriter(UpdateCallback):
         Write out the list of families, sorting by Gramps ID.
         """
         self.set_text(_("Writing families"))
-        # generate a list of (GRAMPS_ID, HANDLE) pairs. This list
-        # can then be sorted by the sort routine, which will use the
-        # first value of the tuple as the sort key.
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_family_handles(), self.dbase.get_family_from_handle
-        )
-
-        # loop through the sorted list, pulling of the handle. This list
-        # has already been sorted by GRAMPS_ID
-        for family_handle in [hndl[1] for hndl in sorted_list]:
+        for family in self._records(
+            self.dbase.iter_families(), self.dbase.get_families_from_handles
+        ):
             self.update()
-            self._family(self.dbase.get_family_from_handle(family_handle))
+            self._family(family)
 
     def _family(self, family):
         """
@@ -923,7 +1081,7 @@ class GedcomWriter(UpdateCallback):
         Write the child XREF values to the GEDCOM file.
         """
         child_list = [
-            self.dbase.get_person_from_handle(cref.ref).get_gramps_id()
+            self.lookup.get_person_from_handle(cref.ref).get_gramps_id()
             for cref in child_ref_list
         ]
 
@@ -941,7 +1099,7 @@ class GedcomWriter(UpdateCallback):
 
         """
         if person_handle:
-            person = self.dbase.get_person_from_handle(person_handle)
+            person = self.lookup.get_person_from_handle(person_handle)
             if person:
                 self._writeln(1, token, "@%s@" % person.get_gramps_id())
 
@@ -954,7 +1112,7 @@ class GedcomWriter(UpdateCallback):
 
         """
         for event_ref in family.get_event_ref_list():
-            event = self.dbase.get_event_from_handle(event_ref.ref)
+            event = self.lookup.get_event_from_handle(event_ref.ref)
             if event is None:
                 continue
             self._process_family_event(event, event_ref)
@@ -1041,16 +1199,13 @@ class GedcomWriter(UpdateCallback):
         Write out the list of sources, sorting by Gramps ID.
         """
         self.set_text(_("Writing sources"))
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_source_handles(), self.dbase.get_source_from_handle
-        )
-
-        for source_id, handle in sorted_list:
+        for source in self._records(
+            self.dbase.iter_sources(), self.dbase.get_sources_from_handles
+        ):
             self.update()
-            source = self.dbase.get_source_from_handle(handle)
             if source is None:
                 continue
-            self._writeln(0, "@%s@" % source_id, "SOUR")
+            self._writeln(0, "@%s@" % source.get_gramps_id(), "SOUR")
             if source.get_title():
                 self._writeln(1, "TITL", source.get_title())
 
@@ -1083,16 +1238,13 @@ class GedcomWriter(UpdateCallback):
         """
         self.set_text(_("Writing notes"))
         note_cnt = 0
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_note_handles(), self.dbase.get_note_from_handle
-        )
-
-        for note_handle in [hndl[1] for hndl in sorted_list]:
+        for note in self._records(
+            self.dbase.iter_notes(), self.dbase.get_notes_from_handles
+        ):
             # the following makes the progress bar a bit smoother
             if not note_cnt % NOTES_PER_PERSON:
                 self.update()
             note_cnt += 1
-            note = self.dbase.get_note_from_handle(note_handle)
             if note is None:
                 continue
             self._note_record(note)
@@ -1125,18 +1277,16 @@ class GedcomWriter(UpdateCallback):
         +1 <<CHANGE_DATE>> {0:1}
         """
         self.set_text(_("Writing repositories"))
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_repository_handles(), self.dbase.get_repository_from_handle
-        )
 
         # GEDCOM only allows for a single repository per source
 
-        for repo_id, handle in sorted_list:
+        for repo in self._records(
+            self.dbase.iter_repositories(), self.dbase.get_repositories_from_handles
+        ):
             self.update()
-            repo = self.dbase.get_repository_from_handle(handle)
             if repo is None:
                 continue
-            self._writeln(0, "@%s@" % repo_id, "REPO")
+            self._writeln(0, "@%s@" % repo.get_gramps_id(), "REPO")
             if repo.get_name():
                 self._writeln(1, "NAME", repo.get_name())
             for addr in repo.get_address_list():
@@ -1163,7 +1313,7 @@ class GedcomWriter(UpdateCallback):
         if reporef.ref is None:
             return
 
-        repo = self.dbase.get_repository_from_handle(reporef.ref)
+        repo = self.lookup.get_repository_from_handle(reporef.ref)
         if repo is None:
             return
 
@@ -1183,7 +1333,7 @@ class GedcomWriter(UpdateCallback):
         Write out the BIRTH and DEATH events for the person.
         """
         if event_ref:
-            event = self.dbase.get_event_from_handle(event_ref.ref)
+            event = self.lookup.get_event_from_handle(event_ref.ref)
             if event_has_subordinate_data(event, event_ref):
                 self._writeln(1, key)
             else:
@@ -1237,7 +1387,7 @@ class GedcomWriter(UpdateCallback):
         place = None
 
         if event.get_place_handle():
-            place = self.dbase.get_place_from_handle(event.get_place_handle())
+            place = self.lookup.get_place_from_handle(event.get_place_handle())
             self._place(place, dateobj, 2)
 
         for attr in event.get_attribute_list():
@@ -1314,13 +1464,13 @@ class GedcomWriter(UpdateCallback):
         self._date(index + 1, lds_ord.get_date_object())
         if lds_ord.get_family_handle():
             family_handle = lds_ord.get_family_handle()
-            family = self.dbase.get_family_from_handle(family_handle)
+            family = self.lookup.get_family_from_handle(family_handle)
             if family:
                 self._writeln(index + 1, "FAMC", "@%s@" % family.get_gramps_id())
         if lds_ord.get_temple():
             self._writeln(index + 1, "TEMP", lds_ord.get_temple())
         if lds_ord.get_place_handle():
-            place = self.dbase.get_place_from_handle(lds_ord.get_place_handle())
+            place = self.lookup.get_place_from_handle(lds_ord.get_place_handle())
             self._place(place, lds_ord.get_date_object(), 2)
         if lds_ord.get_status() != LdsOrd.STATUS_NONE:
             self._writeln(2, "STAT", LDS_STATUS[lds_ord.get_status()])
@@ -1434,7 +1584,7 @@ class GedcomWriter(UpdateCallback):
         +1 <<NOTE_STRUCTURE>> {0:M}
         """
 
-        citation = self.dbase.get_citation_from_handle(citation_handle)
+        citation = self.lookup.get_citation_from_handle(citation_handle)
         if citation is None:  # removed by proxy
             return
 
@@ -1442,7 +1592,7 @@ class GedcomWriter(UpdateCallback):
         if src_handle is None:
             return
 
-        src = self.dbase.get_source_from_handle(src_handle)
+        src = self.lookup.get_source_from_handle(src_handle)
         if src is None:
             return
 
@@ -1464,7 +1614,7 @@ class GedcomWriter(UpdateCallback):
 
         if len(citation.get_note_list()) > 0:
             note_list = [
-                self.dbase.get_note_from_handle(h) for h in citation.get_note_list()
+                self.lookup.get_note_from_handle(h) for h in citation.get_note_list()
             ]
             note_list = [n for n in note_list if n.get_type() == NoteType.SOURCE_TEXT]
 
@@ -1479,7 +1629,7 @@ class GedcomWriter(UpdateCallback):
                 self._writeln(level + 2, "TEXT", ref_text)
 
             note_list = [
-                self.dbase.get_note_from_handle(h) for h in citation.get_note_list()
+                self.lookup.get_note_from_handle(h) for h in citation.get_note_list()
             ]
             note_list = [
                 n.handle
@@ -1512,7 +1662,7 @@ class GedcomWriter(UpdateCallback):
         n OBJE @<XREF:OBJE>@ {1:1}
         """
         photo_obj_id = photo.get_reference_handle()
-        photo_obj = self.dbase.get_media_from_handle(photo_obj_id)
+        photo_obj = self.lookup.get_media_from_handle(photo_obj_id)
         if photo_obj:
             # if not os.path.isfile(path):
             # return
@@ -1523,18 +1673,11 @@ class GedcomWriter(UpdateCallback):
         Write out the list of media, sorting by Gramps ID.
         """
         self.set_text(_("Writing media"))
-        # generate a list of (GRAMPS_ID, HANDLE) pairs. This list
-        # can then be sorted by the sort routine, which will use the
-        # first value of the tuple as the sort key.
-        sorted_list = sort_handles_by_id(
-            self.dbase.get_media_handles(), self.dbase.get_media_from_handle
-        )
-
-        # loop through the sorted list, pulling of the handle. This list
-        # has already been sorted by GRAMPS_ID
-        for media_handle in [hndl[1] for hndl in sorted_list]:
+        for media in self._records(
+            self.dbase.iter_media(), self.dbase.get_media_from_handles
+        ):
             self.update()
-            self._media(self.dbase.get_media_from_handle(media_handle))
+            self._media(media)
 
     def _media(self, media):
         """
@@ -1588,12 +1731,13 @@ class GedcomWriter(UpdateCallback):
         """
         if place is None:
             return
-        place_name = _pd.display(self.dbase, place, dateobj)
+        # the place displayer only reads the enclosing places
+        place_name = _pd.display(self.lookup, place, dateobj)
         self._writeln(level, "PLAC", place_name.replace("\r", " "), limit=120)
         longitude = place.get_longitude()
         latitude = place.get_latitude()
         if longitude and latitude:
-            (latitude, longitude) = conv_lat_lon(latitude, longitude, "GEDCOM")
+            latitude, longitude = conv_lat_lon(latitude, longitude, "GEDCOM")
         if longitude and latitude:
             self._writeln(level + 1, "MAP")
             self._writeln(level + 2, "LATI", latitude)
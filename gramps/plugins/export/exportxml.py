@@ -39,6 +39,11 @@ import time
 import shutil
 import os
 import codecs
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
 from xml.sax.saxutils import escape
 
 # ------------------------------------------------------------------------
@@ -58,7 +63,9 @@ LOG = logging.getLogger(".WriteXML")
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
+from gramps.gen.config import config
 from gramps.gen.const import URL_HOMEPAGE
+import gramps.gen.lib
 from gramps.gen.lib import Date, Person
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.db.exceptions import DbWriteFailure
@@ -83,6 +90,11 @@ except:
 # table for skipping control chars from XML except 09, 0A, 0D
 strip_dict = dict.fromkeys(list(range(9)) + list(range(11, 13)) + list(range(14, 32)))
 
+# Size of the blocks of data compressed by each thread of a ParallelGzipFile
+BLOCK_SIZE = 1 << 20
+# Size of the window of deflate, primed with the end of the previous block
+WINDOW_SIZE = 1 << 15
+
 
 def escxml(d):
     return (
@@ -99,6 +111,101 @@ def escxml(d):
     )
 
 
+def _write_rows(db, context, rows):
+    """
+    Return the number of rows, and the XML of the objects of the rows of
+    raw data, in a process exporting a database.
+    """
+    obj_type, method_name, strip_photos = context
+    obj_class = getattr(gramps.gen.lib, obj_type)
+    writer = GrampsXmlWriter(db, strip_photos, 0)
+    writer.g = StringIO()
+    write = getattr(writer, method_name)
+    for handle, data in rows:
+        write(db.serializer.data_to_object(obj_class, data), 2)
+    return len(rows), writer.g.getvalue()
+
+
+def _deflate(data, last, zdict):
+    """
+    Return a block of data compressed into a raw deflate stream, either
+    flushed or finished if it is the last block, with the window primed
+    with the end of the previous block.
+    """
+    if zdict:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+# -------------------------------------------------------------------------
+#
+# ParallelGzipFile
+#
+# -------------------------------------------------------------------------
+class ParallelGzipFile:
+    """
+    Writes a single gzip member to a binary file, compressing blocks of the
+    data in a pool of threads.
+    """
+
+    def __init__(self, filename=None, threads=2, fileobj=None):
+        self.owned = fileobj is None
+        if self.owned:
+            fileobj = open(filename, "wb")
+        self.fileobj = fileobj
+        self.threads = threads
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.queue = deque()
+        self.buffer = []
+        self.buffered = 0
+        self.size = 0
+        self.crc = 0
+        self.zdict = b""
+        self.fileobj.write(
+            b"\x1f\x8b\x08\x00" + struct.pack("<L", int(time.time())) + b"\x02\xff"
+        )
+
+    def write(self, data):
+        """
+        Write bytes, compressed once a block is buffered.
+        """
+        self.buffer.append(data)
+        self.buffered += len(data)
+        if self.buffered >= BLOCK_SIZE:
+            self.__submit(False)
+        return len(data)
+
+    def __submit(self, last):
+        data = b"".join(self.buffer)
+        self.buffer = []
+        self.buffered = 0
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        self.queue.append(self.executor.submit(_deflate, data, last, self.zdict))
+        self.zdict = data[-WINDOW_SIZE:]
+        while self.queue and (len(self.queue) > 2 * self.threads or last):
+            self.fileobj.write(self.queue.popleft().result())
+
+    def close(self):
+        """
+        Compress the remaining data and write the gzip trailer.
+        """
+        if self.fileobj is None:
+            return
+        try:
+            self.__submit(True)
+            self.fileobj.write(struct.pack("<LL", self.crc, self.size & 0xFFFFFFFF))
+        finally:
+            self.executor.shutdown()
+            if self.owned:
+                self.fileobj.close()
+            self.fileobj = None
+
+
 # -------------------------------------------------------------------------
 #
 #
@@ -109,7 +216,16 @@ class GrampsXmlWriter(UpdateCallback):
     Writes a database to the XML file.
     """
 
-    def __init__(self, db, strip_photos=0, compress=1, version="unknown", user=None):
+    def __init__(
+        self,
+        db,
+        strip_photos=0,
+        compress=1,
+        version="unknown",
+        user=None,
+        jobs=None,
+        threads=None,
+    ):
         """
         Initialize, but does not write, an XML file.
 
@@ -119,8 +235,12 @@ class GrampsXmlWriter(UpdateCallback):
         >              1: remove everything expect the filename (eg gpkg)
         >              2: remove leading slash (quick write)
         compress - attempt to compress the database
+        jobs - number of processes writing the objects, that of the user,
+               or else the "export.jobs" setting, if None
+        threads - number of threads compressing the file, the
+                  "export.compress-threads" setting if None
         """
-        UpdateCallback.__init__(self, user.callback)
+        UpdateCallback.__init__(self, user.callback if user else None)
         self.user = user
         self.compress = compress
         if not _gzip_ok:
@@ -128,6 +248,12 @@ class GrampsXmlWriter(UpdateCallback):
         self.db = db
         self.strip_photos = strip_photos
         self.version = version
+        if jobs is None:
+            jobs = getattr(user, "jobs", None) or config.get("export.jobs")
+        if threads is None:
+            threads = config.get("export.compress-threads")
+        self.jobs = jobs
+        self.threads = threads
 
         self.status = None
 
@@ -184,7 +310,9 @@ class GrampsXmlWriter(UpdateCallback):
 
             self.fileroot = os.path.dirname(filename)
             try:
-                if self.compress and _gzip_ok:
+                if self.compress and _gzip_ok and self.threads > 1:
+                    g = ParallelGzipFile(filename, self.threads)
+                elif self.compress and _gzip_ok:
                     try:
                         g = gzip.open(filename, "wb")
                     except:
@@ -208,7 +336,9 @@ class GrampsXmlWriter(UpdateCallback):
         Write the database to the specified file handle.
         """
 
-        if self.compress and _gzip_ok:
+        if self.compress and _gzip_ok and self.threads > 1:
+            g = ParallelGzipFile(threads=self.threads, fileobj=handle)
+        elif self.compress and _gzip_ok:
             try:
                 g = gzip.GzipFile(mode="wb", fileobj=handle)
             except:
@@ -302,11 +432,7 @@ class GrampsXmlWriter(UpdateCallback):
         # Write primary objects
         if event_len > 0:
             self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
-                if event:
-                    self.write_event(event, 2)
-                self.update()
+            self.write_objects("Event", "write_event")
             self.g.write("  </events>\n")
 
         if person_len > 0:
@@ -316,75 +442,42 @@ class GrampsXmlWriter(UpdateCallback):
                 self.g.write(' home="_%s"' % person.handle)
             self.g.write(">\n")
 
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
-                if person:
-                    self.write_person(person, 2)
-                self.update()
+            self.write_objects("Person", "write_person")
             self.g.write("  </people>\n")
 
         if family_len > 0:
             self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
-                if family:
-                    self.write_family(family, 2)
-                self.update()
+            self.write_objects("Family", "write_family")
             self.g.write("  </families>\n")
 
         if citation_len > 0:
             self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
-                if citation:
-                    self.write_citation(citation, 2)
-                self.update()
+            self.write_objects("Citation", "write_citation")
             self.g.write("  </citations>\n")
 
         if source_len > 0:
             self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
-                if source:
-                    self.write_source(source, 2)
-                self.update()
+            self.write_objects("Source", "write_source")
             self.g.write("  </sources>\n")
 
         if place_len > 0:
             self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
-                if place:
-                    self.write_place_obj(place, 2)
-                self.update()
+            self.write_objects("Place", "write_place_obj")
             self.g.write("  </places>\n")
 
         if obj_len > 0:
             self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_handles()):
-                obj = self.db.get_media_from_handle(handle)
-                if obj:
-                    self.write_object(obj, 2)
-                self.update()
+            self.write_objects("Media", "write_object")
             self.g.write("  </objects>\n")
 
         if repo_len > 0:
             self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
-                if repo:
-                    self.write_repository(repo, 2)
-                self.update()
+            self.write_objects("Repository", "write_repository")
             self.g.write("  </repositories>\n")
 
         if note_len > 0:
             self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
-                if note:
-                    self.write_note(note, 2)
-                self.update()
+            self.write_objects("Note", "write_note")
             self.g.write("  </notes>\n")
 
         # Data is written, now write bookmarks.
@@ -396,6 +489,34 @@ class GrampsXmlWriter(UpdateCallback):
     #        self.status.end()
     #        self.status = None
 
+    def write_objects(self, obj_type, method_name):
+        """
+        Write the objects of a type in handle order, rendering them in
+        worker processes from the raw data of the database if it can.
+        """
+        results = None
+        if self.jobs > 1:
+            results = self.db.map_data(
+                obj_type,
+                _write_rows,
+                (obj_type, method_name, self.strip_photos),
+                self.jobs,
+                ordered=True,
+            )
+        if results is None:
+            get_object = self.db.method("get_%s_from_handle", obj_type)
+            write = getattr(self, method_name)
+            for handle in sorted(self.db.method("get_%s_handles", obj_type)()):
+                obj = get_object(handle)
+                if obj:
+                    write(obj, 2)
+                self.update()
+            return
+        for count, text in results:
+            self.g.write(text)
+            for _dummy in range(count):
+                self.update()
+
     def write_metadata(self):
         """Method to write out metadata of the database"""
         mediapath = self.db.get_mediapath()
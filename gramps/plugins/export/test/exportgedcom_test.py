@@ -0,0 +1,107 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unit test of the GEDCOM export
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gramps.gen.db.utils import make_database
+from gramps.gen.proxy import PrivateProxyDb
+from gramps.gen.user import User
+from gramps.plugins.importer.importgedcom import importData
+from gramps.plugins.importer.test.gedcom_benchmark import write_gedcom
+from .. import exportgedcom
+from ..exportgedcom import GedcomWriter, ObjectLookup, gedcom_lines
+
+
+class ExportGedcomTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dirpath = tempfile.mkdtemp()
+        path = os.path.join(cls.dirpath, "test.ged")
+        write_gedcom(path, 30)
+        os.mkdir(os.path.join(cls.dirpath, "db"))
+        cls.db = make_database("sqlite")
+        cls.db.load(os.path.join(cls.dirpath, "db"))
+        importData(cls.db, path, User())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.dirpath)
+
+    def __export(self, db):
+        path = os.path.join(self.dirpath, "export.ged")
+        GedcomWriter(db, User()).write_gedcom_file(path)
+        with open(path, encoding="utf-8") as file:
+            # Skip the header, which holds the date of the export
+            return file.read().split("\n0 @", 1)[1]
+
+    def test_chunks(self):
+        expected = self.__export(self.db)
+        self.assertEqual(expected.count(" INDI\n"), 30)
+        with patch.object(exportgedcom, "CHUNKSIZE", 7):
+            self.assertEqual(self.__export(self.db), expected)
+
+    def test_proxy(self):
+        proxy = PrivateProxyDb(self.db)
+        expected = self.__export(proxy)
+        with patch.object(exportgedcom, "CHUNKSIZE", 7):
+            self.assertEqual(self.__export(proxy), expected)
+
+    def test_lookup(self):
+        lookup = ObjectLookup(self.db, size=5)
+        people = list(self.db.iter_people())
+        lookup.prefetch(people)
+        event_handles = [ref.ref for ref in people[0].get_event_ref_list()]
+        self.assertTrue(event_handles)
+        for handle in event_handles:
+            self.assertIn(handle, lookup.tables["Event"][0])
+        place = lookup.get_place_from_handle(
+            lookup.get_event_from_handle(event_handles[0]).get_place_handle()
+        )
+        self.assertTrue(place.get_name().get_value())
+        # The tables are trimmed before each chunk
+        lookup.prefetch(people[:1])
+        self.assertLessEqual(len(lookup.tables["Event"][0]), 5 + len(event_handles))
+
+    def test_lines(self):
+        self.assertEqual(
+            gedcom_lines(1, "NAME", "John /Smith/"), "1 NAME John /Smith/\n"
+        )
+        self.assertEqual(gedcom_lines(0, "TRLR"), "0 TRLR\n")
+        self.assertEqual(
+            gedcom_lines(1, "NOTE", "one\ntwo @ three"),
+            "1 NOTE one\n2 CONT two @@ three\n",
+        )
+        self.assertEqual(
+            gedcom_lines(1, "NOTE", "abc def ghi", limit=4),
+            "1 NOTE ab\n2 CONC c de\n2 CONC f gh\n2 CONC i\n",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
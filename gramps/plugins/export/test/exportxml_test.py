@@ -0,0 +1,107 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unit test of the Gramps XML export
+"""
+
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gramps.gen.db.dbconst import DBBACKEND
+from gramps.gen.db.utils import make_database
+from gramps.gen.proxy import PrivateProxyDb
+from gramps.gen.user import User
+from gramps.plugins.importer.importxml import importData
+from gramps.plugins.importer.test.xml_benchmark import write_xml
+from .. import exportxml
+from ..exportxml import GrampsXmlWriter, ParallelGzipFile
+
+
+class ExportXmlTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dirpath = tempfile.mkdtemp()
+        path = os.path.join(cls.dirpath, "test.gramps")
+        write_xml(path, 2)
+        os.mkdir(os.path.join(cls.dirpath, "db"))
+        with open(os.path.join(cls.dirpath, "db", DBBACKEND), "w") as file:
+            file.write("sqlite")
+        cls.db = make_database("sqlite")
+        cls.db.load(os.path.join(cls.dirpath, "db"))
+        importData(cls.db, path, User())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.dirpath)
+
+    def __export(self, db, compress=0, jobs=1, threads=1):
+        path = os.path.join(self.dirpath, "export.gramps")
+        writer = GrampsXmlWriter(
+            db, 0, compress, user=User(), jobs=jobs, threads=threads
+        )
+        writer.write(path)
+        with open(path, "rb") as file:
+            data = file.read()
+        if compress:
+            data = gzip.decompress(data)
+        return data
+
+    def test_jobs(self):
+        expected = self.__export(self.db)
+        self.assertEqual(expected.count(b"<person "), 120)
+        self.assertEqual(self.__export(self.db, jobs=2), expected)
+
+    def test_user_jobs(self):
+        user = User()
+        user.jobs = 3
+        self.assertEqual(GrampsXmlWriter(self.db, user=user).jobs, 3)
+        self.assertEqual(GrampsXmlWriter(self.db, user=User()).jobs, 1)
+
+    def test_proxy(self):
+        # Proxies are exported by the writer itself
+        proxy = PrivateProxyDb(self.db)
+        self.assertEqual(self.__export(proxy, jobs=2), self.__export(proxy))
+
+    def test_threads(self):
+        expected = self.__export(self.db, compress=1)
+        with patch.object(exportxml, "BLOCK_SIZE", 1 << 12):
+            self.assertEqual(self.__export(self.db, compress=1, threads=3), expected)
+
+    def test_gzip_file(self):
+        data = os.urandom(1 << 14) + b"text " * 20000
+        fileobj = io.BytesIO()
+        with patch.object(exportxml, "BLOCK_SIZE", 1000):
+            gzip_file = ParallelGzipFile(threads=2, fileobj=fileobj)
+            for start in range(0, len(data), 700):
+                gzip_file.write(data[start : start + 700])
+            gzip_file.close()
+        self.assertEqual(gzip.decompress(fileobj.getvalue()), data)
+        self.assertFalse(fileobj.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the GEDCOM export.
+
+Imports generated GEDCOM files of the given numbers of individuals into an
+SQLite database, and reports the time taken by their export.  Run with::
+
+    python3 -m gramps.plugins.export.test.gedcom_benchmark [PEOPLE ...]
+
+The default is 10000 people; a tree of 500000 people needs about half an
+hour to generate.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db.utils import make_database
+from gramps.gen.user import User
+from gramps.plugins.export.exportgedcom import GedcomWriter
+from gramps.plugins.importer.importgedcom import importData
+from gramps.plugins.importer.test.gedcom_benchmark import write_gedcom
+
+
+def main(sizes=(10000,)):
+    """
+    Run the benchmark for trees of the given numbers of people.
+    """
+    for people in sizes:
+        dirpath = tempfile.mkdtemp()
+        try:
+            path = os.path.join(dirpath, "benchmark.ged")
+            write_gedcom(path, people)
+            dbpath = os.path.join(dirpath, "db")
+            os.mkdir(dbpath)
+            db = make_database("sqlite")
+            db.load(dbpath)
+            importData(db, path, User())
+            count = sum(
+                db.method("get_number_of_%s", obj_type)()
+                for obj_type in ("people", "families", "events", "places", "notes")
+            )
+
+            start = perf_counter()
+            GedcomWriter(db, User()).write_gedcom_file(path)
+            exported = perf_counter() - start
+            size = os.path.getsize(path) / 2**20
+            people = db.get_number_of_people()
+            db.close()
+        finally:
+            shutil.rmtree(dirpath)
+        print(
+            "%8d people, %d objects, %.1f MB: export %.2f seconds, "
+            "%.0f objects/sec" % (people, count, size, exported, count / exported)
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000])
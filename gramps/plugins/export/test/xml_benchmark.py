@@ -0,0 +1,93 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the Gramps XML export.
+
+Imports the given numbers of copies of example/gramps/data.gramps into an
+SQLite database, and reports the time taken by its compressed export by
+one process and by the given number of worker processes and compression
+threads.  Run with::
+
+    python3 -m gramps.plugins.export.test.xml_benchmark [JOBS [COPIES ...]]
+
+The default is 4 jobs, and 200 copies of 60 people each.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db.dbconst import DBBACKEND
+from gramps.gen.db.utils import make_database
+from gramps.gen.user import User
+from gramps.plugins.export.exportxml import GrampsXmlWriter
+from gramps.plugins.importer.importxml import importData
+from gramps.plugins.importer.test.xml_benchmark import write_xml
+
+
+def main(jobs=4, sizes=(200,)):
+    """
+    Run the benchmark for databases of the given numbers of copies.
+    """
+    for copies in sizes:
+        dirpath = tempfile.mkdtemp()
+        try:
+            path = os.path.join(dirpath, "benchmark.gramps")
+            write_xml(path, copies)
+            dbpath = os.path.join(dirpath, "db")
+            os.mkdir(dbpath)
+            with open(os.path.join(dbpath, DBBACKEND), "w") as file:
+                file.write("sqlite")
+            db = make_database("sqlite")
+            db.load(dbpath)
+            importData(db, path, User())
+            count = db.get_number_of_people()
+
+            times = []
+            for workers in (1, jobs):
+                writer = GrampsXmlWriter(db, user=User(), jobs=workers, threads=workers)
+                start = perf_counter()
+                writer.write(path)
+                times.append(perf_counter() - start)
+            db.close()
+        finally:
+            shutil.rmtree(dirpath)
+        print(
+            "%8d people: export %.2f seconds, %.2f seconds with %d jobs (x%.1f)"
+            % (count, times[0], times[1], jobs, times[0] / times[1])
+        )
+
+
+if __name__ == "__main__":
+    ARGS = [int(arg) for arg in sys.argv[1:]]
+    main(*ARGS[:1], ARGS[1:] or [200])
@@ -975,7 +975,7 @@ class GeneWebParser:
                     _(
                         "Invalid date {date} in {gw_snippet}, "
                         "preserving date as text."
-                    ).format(date=e.date.__dict__, gw_snippet=field)
+                    ).format(date=e.date.get_object_state(), gw_snippet=field)
                 )
                 date.set(modifier=Date.MOD_TEXTONLY, text=field)
             return date
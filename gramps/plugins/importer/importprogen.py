@@ -45,7 +45,6 @@ from gramps.gen.config import config
 
 from gramps.gen.lib import Citation
 from gramps.gen.lib.date import Today
-from gramps.gen.lib.datebase import DateBase
 from gramps.gen.utils.libformatting import ImportInfo
 
 from gramps.gui.dialog import InfoDialog
@@ -539,12 +538,10 @@ class ProgenOptions(ManagedWindow):
                 widget, set_import, get_import, self.dbase.readonly
             )
         date = Today()
-        datebase = DateBase()
-        datebase.set_date_object(date)
         self.default_methods["date"] = MonitoredDate(
             self.glade.get_object("tag_default_date"),
             self.glade.get_object("tag_default_date_btn"),
-            datebase.get_date_object(),
+            date,
             self.uistate,
             [],
             self.dbase.readonly,
@@ -136,7 +136,8 @@ try:
 except:
     GZIP_OK = False
 
-PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
+# Size of the blocks of the file passed to the XML parser
+READ_SIZE = 1 << 20
 
 CHILD_REL_MAP = {
     "Birth": ChildRefType(ChildRefType.BIRTH),
@@ -168,8 +169,6 @@ def importData(database, filename, user):
     database.smap = {}
     database.pmap = {}
     database.fmap = {}
-    line_cnt = 1
-    person_cnt = 0
 
     with ImportOpenFileContextManager(filename, user) as xml_file:
         if xml_file is None:
@@ -193,16 +192,11 @@ def importData(database, filename, user):
                 ),
             )
 
-        if filename != "-":
-            linecounter = LineParser(filename)
-            line_cnt = linecounter.get_count()
-            person_cnt = linecounter.get_person_count()
-
         read_only = database.readonly
         database.readonly = False
 
         try:
-            info = parser.parse(xml_file, line_cnt, person_cnt)
+            info = parser.parse(xml_file)
         except GrampsImportError as err:  # version error
             user.notify_error(*err.messages())
             return
@@ -409,61 +403,6 @@ class ImportInfo:
         return txt
 
 
-class LineParser:
-    def __init__(self, filename):
-        self.count = 0
-        self.person_count = 0
-
-        if GZIP_OK:
-            use_gzip = 1
-            try:
-                with gzip.open(filename, "r") as f:
-                    f.read(1)
-            except IOError as msg:
-                use_gzip = 0
-            except ValueError as msg:
-                use_gzip = 1
-        else:
-            use_gzip = 0
-
-        try:
-            if use_gzip:
-                import io
-
-                # Bug 6255. TextIOWrapper is required for python3 to
-                #           present file contents as text, otherwise they
-                #           are read as binary. However due to a missing
-                #           method (read1) in early python3 versions this
-                #           try block will fail.
-                #           Gramps will still import XML files using python
-                #           versions < 3.3.0 but the file progress meter
-                #           will not work properly, going immediately to
-                #           100%.
-                #           It should work correctly from version 3.3.
-                ofile = io.TextIOWrapper(
-                    gzip.open(filename, "rb"), encoding="utf8", errors="replace"
-                )
-            else:
-                ofile = open(filename, "r", encoding="utf8", errors="replace")
-
-            for line in ofile:
-                self.count += 1
-                if PERSON_RE.match(line):
-                    self.person_count += 1
-        except:
-            self.count = 0
-            self.person_count = 0
-        finally:
-            # Ensure the file handle is always closed
-            ofile.close()
-
-    def get_count(self):
-        return self.count
-
-    def get_person_count(self):
-        return self.person_count
-
-
 # -------------------------------------------------------------------------
 #
 # ImportOpenFileContextManager
@@ -649,6 +588,47 @@ class GrampsParser(UpdateCallback):
         self.nidswap = {}
         self.eidswap = {}
         self.import_handles = {}
+        # The objects created for the references to objects not read yet,
+        # by handle, until their element is read
+        self.placeholders = {}
+        # The database methods used by inaugurate, by target, and by
+        # inaugurate_id, by key
+        self.has_handle_func = {
+            "person": self.db.has_person_handle,
+            "family": self.db.has_family_handle,
+            "event": self.db.has_event_handle,
+            "place": self.db.has_place_handle,
+            "source": self.db.has_source_handle,
+            "citation": self.db.get_raw_citation_data,
+            "repository": self.db.has_repository_handle,
+            "media": self.db.has_media_handle,
+            "note": self.db.has_note_handle,
+            "tag": self.db.has_tag_handle,
+        }
+        self.get_raw_obj_data = {
+            "person": self.db.get_raw_person_data,
+            "family": self.db.get_raw_family_data,
+            "event": self.db.get_raw_event_data,
+            "place": self.db.get_raw_place_data,
+            "source": self.db.get_raw_source_data,
+            "citation": self.db.get_raw_citation_data,
+            "repository": self.db.get_raw_repository_data,
+            "media": self.db.get_raw_media_data,
+            "note": self.db.get_raw_note_data,
+            "tag": self.db.get_raw_tag_data,
+        }
+        self.add_func = {
+            "person": self.db.add_person,
+            "family": self.db.add_family,
+            "event": self.db.add_event,
+            "place": self.db.add_place,
+            "source": self.db.add_source,
+            "citation": self.db.add_citation,
+            "repository": self.db.add_repository,
+            "media": self.db.add_media,
+            "note": self.db.add_note,
+        }
+        self.id_tables = self.__make_id_tables()
 
         if default_tag_format:
             name = time.strftime(default_tag_format)
@@ -805,7 +785,8 @@ class GrampsParser(UpdateCallback):
         class object. Be aware that in the first case the side effect of this
         function is to fill the object instance with the data read from the db.
         In the second case, an empty object with the correct handle will be
-        created.
+        created.  An object instance new to the database is only given its
+        handle: it is added to the database when its element ends.
 
         :param handle: The handle of the primary object, typically as read
                        directly from the XML attributes.
@@ -827,20 +808,10 @@ class GrampsParser(UpdateCallback):
             handle = self.import_handles[handle][target][HANDLE]
             if not isinstance(prim_obj, abc.Callable):
                 # This method is called by a start_<primary_object> method.
-                get_raw_obj_data = {
-                    "person": self.db.get_raw_person_data,
-                    "family": self.db.get_raw_family_data,
-                    "event": self.db.get_raw_event_data,
-                    "place": self.db.get_raw_place_data,
-                    "source": self.db.get_raw_source_data,
-                    "citation": self.db.get_raw_citation_data,
-                    "repository": self.db.get_raw_repository_data,
-                    "media": self.db.get_raw_media_data,
-                    "note": self.db.get_raw_note_data,
-                    "tag": self.db.get_raw_tag_data,
-                }[target]
-                raw = get_raw_obj_data(handle)
-                temp_obj = from_dict(raw)
+                temp_obj = self.placeholders.pop(handle, None)
+                if temp_obj is None:
+                    raw = self.get_raw_obj_data[target](handle)
+                    temp_obj = from_dict(raw)
                 prim_obj.set_object_state(temp_obj.get_object_state())
                 self.import_handles[orig_handle][target][INSTANTIATED] = True
             return handle
@@ -860,42 +831,24 @@ class GrampsParser(UpdateCallback):
                 while handle in self.import_handles:
                     handle = create_id()
             else:
-                has_handle_func = {
-                    "person": self.db.has_person_handle,
-                    "family": self.db.has_family_handle,
-                    "event": self.db.has_event_handle,
-                    "place": self.db.has_place_handle,
-                    "source": self.db.has_source_handle,
-                    "citation": self.db.get_raw_citation_data,
-                    "repository": self.db.has_repository_handle,
-                    "media": self.db.has_media_handle,
-                    "note": self.db.has_note_handle,
-                    "tag": self.db.has_tag_handle,
-                }[target]
+                has_handle_func = self.has_handle_func[target]
                 while has_handle_func(handle):
                     handle = create_id()
             self.import_handles[orig_handle] = {target: [handle, False]}
-        # method is called by a reference
-        if isinstance(prim_obj, abc.Callable):
-            prim_obj = prim_obj()
-        else:
+        if not isinstance(prim_obj, abc.Callable):
+            # This method is called by a start_<primary_object> method, and the
+            # object is committed by the stop_<primary_object> method.
             self.import_handles[orig_handle][target][INSTANTIATED] = True
+            prim_obj.set_handle(handle)
+            return handle
+        # method is called by a reference
+        prim_obj = prim_obj()
         prim_obj.set_handle(handle)
         if target == "tag":
             self.db.add_tag(prim_obj, self.trans)
         else:
-            add_func = {
-                "person": self.db.add_person,
-                "family": self.db.add_family,
-                "event": self.db.add_event,
-                "place": self.db.add_place,
-                "source": self.db.add_source,
-                "citation": self.db.add_citation,
-                "repository": self.db.add_repository,
-                "media": self.db.add_media,
-                "note": self.db.add_note,
-            }[target]
-            add_func(prim_obj, self.trans, set_gid=False)
+            self.add_func[target](prim_obj, self.trans, set_gid=False)
+        self.placeholders[handle] = prim_obj
         return handle
 
     def inaugurate_id(self, id_, key, prim_obj):
@@ -907,6 +860,41 @@ class GrampsParser(UpdateCallback):
                 _("The Gramps Xml you are trying to " "import is malformed."),
                 _("Attributes that link the data " "together are missing."),
             )
+        (
+            id2handle_map,
+            has_handle_func,
+            add_func,
+            get_raw_obj_data,
+            id2id_map,
+            id2user_format,
+            find_next_gramps_id,
+            has_gramps_id,
+        ) = self.id_tables[key]
+
+        gramps_id = self.legalize_id(
+            id_, key, id2id_map, id2user_format, find_next_gramps_id, has_gramps_id
+        )
+        handle = id2handle_map.get(gramps_id)
+        if handle:
+            raw = get_raw_obj_data(handle)
+            temp_obj = from_dict(raw)
+            prim_obj.set_object_state(temp_obj.get_object_state())
+        else:
+            handle = create_id()
+            while has_handle_func(handle):
+                handle = create_id()
+            if isinstance(prim_obj, abc.Callable):
+                prim_obj = prim_obj()
+            prim_obj.set_handle(handle)
+            prim_obj.set_gramps_id(gramps_id)
+            add_func(prim_obj, self.trans)
+            id2handle_map[gramps_id] = handle
+        return handle
+
+    def __make_id_tables(self):
+        """
+        Return the maps and database methods used by inaugurate_id, by key.
+        """
         id2handle_map = [
             self.gid2id,
             self.gid2fid,
@@ -917,7 +905,7 @@ class GrampsParser(UpdateCallback):
             self.gid2rid,
             "reference",
             self.gid2nid,
-        ][key]
+        ]
         has_handle_func = [
             self.db.has_person_handle,
             self.db.has_family_handle,
@@ -928,7 +916,7 @@ class GrampsParser(UpdateCallback):
             self.db.has_repository_handle,
             "reference",
             self.db.has_note_handle,
-        ][key]
+        ]
         add_func = [
             self.db.add_person,
             self.db.add_family,
@@ -939,7 +927,7 @@ class GrampsParser(UpdateCallback):
             self.db.add_repository,
             "reference",
             self.db.add_note,
-        ][key]
+        ]
         get_raw_obj_data = [
             self.db.get_raw_person_data,
             self.db.get_raw_family_data,
@@ -950,7 +938,7 @@ class GrampsParser(UpdateCallback):
             self.db.get_raw_repository_data,
             "reference",
             self.db.get_raw_note_data,
-        ][key]
+        ]
         id2id_map = [
             self.idswap,
             self.fidswap,
@@ -961,7 +949,7 @@ class GrampsParser(UpdateCallback):
             self.ridswap,
             "reference",
             self.nidswap,
-        ][key]
+        ]
         id2user_format = [
             self.db.id2user_format,
             self.db.fid2user_format,
@@ -972,7 +960,7 @@ class GrampsParser(UpdateCallback):
             self.db.rid2user_format,
             "reference",
             self.db.nid2user_format,
-        ][key]
+        ]
         find_next_gramps_id = [
             self.db.find_next_person_gramps_id,
             self.db.find_next_family_gramps_id,
@@ -983,7 +971,7 @@ class GrampsParser(UpdateCallback):
             self.db.find_next_repository_gramps_id,
             "reference",
             self.db.find_next_note_gramps_id,
-        ][key]
+        ]
         has_gramps_id = [
             self.db.has_person_gramps_id,
             self.db.has_family_gramps_id,
@@ -994,27 +982,19 @@ class GrampsParser(UpdateCallback):
             self.db.has_repository_gramps_id,
             "reference",
             self.db.has_note_gramps_id,
-        ][key]
-
-        gramps_id = self.legalize_id(
-            id_, key, id2id_map, id2user_format, find_next_gramps_id, has_gramps_id
+        ]
+        return list(
+            zip(
+                id2handle_map,
+                has_handle_func,
+                add_func,
+                get_raw_obj_data,
+                id2id_map,
+                id2user_format,
+                find_next_gramps_id,
+                has_gramps_id,
+            )
         )
-        handle = id2handle_map.get(gramps_id)
-        if handle:
-            raw = get_raw_obj_data(handle)
-            temp_obj = from_dict(raw)
-            prim_obj.set_object_state(temp_obj.get_object_state())
-        else:
-            handle = create_id()
-            while has_handle_func(handle):
-                handle = create_id()
-            if isinstance(prim_obj, abc.Callable):
-                prim_obj = prim_obj()
-            prim_obj.set_handle(handle)
-            prim_obj.set_gramps_id(gramps_id)
-            add_func(prim_obj, self.trans)
-            id2handle_map[gramps_id] = handle
-        return handle
 
     def legalize_id(
         self, id_, key, gramps_ids, id2user_format, find_next_gramps_id, has_gramps_id
@@ -1044,14 +1024,21 @@ class GrampsParser(UpdateCallback):
                 gramps_ids[id_] = gramps_id
         return gramps_ids[id_]
 
-    def parse(self, ifile, linecount=1, personcount=0):
+    def parse(self, ifile):
         """
         Parse the xml file
         :param ifile: must be a file handle that is already open, with position
                       at the start of the file
         """
+        # The progress is that of the file read, which is the compressed file
+        # of a gzipped file, so that the file is only read once
+        raw_file = getattr(ifile, "fileobj", ifile)
+        try:
+            size = os.fstat(raw_file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            size = 0
         with DbTxn(_("Gramps XML import"), self.db, batch=True) as self.trans:
-            self.set_total(linecount)
+            self.set_total(size)
 
             self.db.disable_signals()
 
@@ -1062,7 +1049,15 @@ class GrampsParser(UpdateCallback):
             self.p.StartElementHandler = self.startElement
             self.p.EndElementHandler = self.endElement
             self.p.CharacterDataHandler = self.characters
-            self.p.ParseFile(ifile)
+            self.p.buffer_text = True
+            self.p.buffer_size = READ_SIZE
+            data = ifile.read(READ_SIZE)
+            while data:
+                self.p.Parse(data, False)
+                if size:
+                    self.update(raw_file.tell())
+                data = ifile.read(READ_SIZE)
+            self.p.Parse(b"", True)
 
             if len(self.name_formats) > 0:
                 # add new name formats to the existing table
@@ -1292,7 +1287,6 @@ class GrampsParser(UpdateCallback):
         # Gramps LEGACY: title in the placeobj tag
         self.placeobj.title = attrs.get("title", "")
         self.locations = 0
-        self.update(self.p.CurrentLineNumber)
         if self.default_tag:
             self.placeobj.add_tag(self.default_tag.handle)
         return self.placeobj
@@ -1403,7 +1397,6 @@ class GrampsParser(UpdateCallback):
             self.info.add("new-object", EVENT_KEY, self.event)
         else:
             # This is new event, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.event = Event()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
@@ -1626,7 +1619,6 @@ class GrampsParser(UpdateCallback):
         Add a person to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.person = Person()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -1762,7 +1754,6 @@ class GrampsParser(UpdateCallback):
         Add a family object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.family = Family()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -2050,7 +2041,6 @@ class GrampsParser(UpdateCallback):
         self.in_note = 0
         if "handle" in attrs:
             # This is new note, with ID and handle already existing
-            self.update(self.p.CurrentLineNumber)
             self.note = Note()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
@@ -2255,7 +2245,6 @@ class GrampsParser(UpdateCallback):
         Add a citation object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.citation = Citation()
         orig_handle = attrs["handle"].replace("_", "")
         is_merge_candidate = self.replace_import_handle and self.db.has_citation_handle(
@@ -2314,7 +2303,6 @@ class GrampsParser(UpdateCallback):
         Add a source object to db if it doesn't exist yet and assign
         id, privacy and changetime.
         """
-        self.update(self.p.CurrentLineNumber)
         self.source = Source()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
@@ -2474,7 +2462,7 @@ class GrampsParser(UpdateCallback):
         pass
 
     def stop_database(self, *tag):
-        self.update(self.p.CurrentLineNumber)
+        pass
 
     def stop_media(self, *tag):
         self.db.commit_media(self.object, self.trans, self.object.get_change_time())
@@ -2739,7 +2727,7 @@ class GrampsParser(UpdateCallback):
         # but you may re-order them if needed.
         LOG.warning(
             _("Invalid date {date} in XML {xml}, preserving XML as text").format(
-                date=date_error.date.__dict__, xml=xml
+                date=date_error.date.get_object_state(), xml=xml
             )
         )
         date_value.set(modifier=Date.MOD_TEXTONLY, text=xml)
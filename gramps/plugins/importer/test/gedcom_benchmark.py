@@ -0,0 +1,147 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the GEDCOM import.
+
+Generates GEDCOM files of the given numbers of individuals, and reports the
+time taken by the lexer alone and by the import into an SQLite database.
+Run with::
+
+    python3 -m gramps.plugins.importer.test.gedcom_benchmark [PEOPLE ...]
+
+The default is 10000 people; 100000 and 1000000 need several minutes.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db.utils import make_database
+from gramps.gen.user import User
+from gramps.plugins.importer.importgedcom import importData
+from gramps.plugins.lib.libgedcom import Lexer, UTF8Reader
+
+MONTHS = "JAN FEB MAR APR MAY JUN JUL AUG SEP OCT NOV DEC".split()
+
+
+def write_person(file, index, family, parent_family):
+    """
+    Write an individual with birth and death events and a note.
+    """
+    year = 1700 + index % 300
+    file.write("0 @I%d@ INDI\n" % index)
+    file.write("1 NAME Given%d /Surname%d/\n" % (index % 500, index % 1000))
+    file.write("1 SEX %s\n" % ("M" if index % 2 else "F"))
+    file.write("1 BIRT\n")
+    file.write("2 DATE %d %s %d\n" % (1 + index % 28, MONTHS[index % 12], year))
+    file.write("2 PLAC Town%d, County%d, State%d\n" % (index % 700, index % 70, 7))
+    file.write("1 DEAT\n")
+    file.write("2 DATE ABT %d\n" % (year + 60))
+    if family:
+        file.write("1 FAMS @F%d@\n" % family)
+    if parent_family:
+        file.write("1 FAMC @F%d@\n" % parent_family)
+    file.write("1 NOTE Note of person %d,\n" % index)
+    file.write("2 CONT written on two lines\n")
+    file.write("2 CONC  and continued.\n")
+
+
+def write_gedcom(path, people):
+    """
+    Write a GEDCOM file of a number of people, where every third person is
+    the child of a family formed by the two people before.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("0 HEAD\n1 SOUR Gramps\n1 GEDC\n2 VERS 5.5.1\n")
+        file.write("2 FORM LINEAGE-LINKED\n1 CHAR UTF-8\n")
+        for index in range(0, people - 2, 3):
+            family = index // 3 + 1
+            write_person(file, index, family, None)
+            write_person(file, index + 1, family, None)
+            write_person(file, index + 2, None, family)
+            file.write("0 @F%d@ FAM\n" % family)
+            file.write("1 HUSB @I%d@\n1 WIFE @I%d@\n" % (index + 1, index))
+            file.write("1 CHIL @I%d@\n" % (index + 2))
+            file.write("1 MARR\n2 DATE %d\n" % (1720 + index % 300))
+        file.write("0 TRLR\n")
+
+
+def lex(path):
+    """
+    Read all the lines of a GEDCOM file with the lexer, and return their
+    number.
+    """
+    count = 0
+    with open(path, "rb") as ifile:
+        lexer = Lexer(UTF8Reader(ifile, print, "UTF-8"), print)
+        while lexer.readline() is not None:
+            count += 1
+        lexer.clean_up()
+    return count
+
+
+def main(sizes=(10000,)):
+    """
+    Run the benchmark for files of the given numbers of people.
+    """
+    for people in sizes:
+        dirpath = tempfile.mkdtemp()
+        try:
+            path = os.path.join(dirpath, "benchmark.ged")
+            write_gedcom(path, people)
+            size = os.path.getsize(path) / 2**20
+
+            start = perf_counter()
+            lines = lex(path)
+            lexed = perf_counter() - start
+
+            dbpath = os.path.join(dirpath, "db")
+            os.mkdir(dbpath)
+            db = make_database("sqlite")
+            db.load(dbpath)
+            start = perf_counter()
+            importData(db, path, User())
+            imported = perf_counter() - start
+            count = db.get_number_of_people()
+            db.close()
+        finally:
+            shutil.rmtree(dirpath)
+        print(
+            "%8d people, %.1f MB: lexer %.2f seconds, %.0f lines/sec; "
+            "import %.2f seconds, %.0f people/sec"
+            % (count, size, lexed, lines / lexed, imported, count / imported)
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000])
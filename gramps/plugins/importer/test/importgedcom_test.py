@@ -0,0 +1,170 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unit test of the lexer and of the places of the GEDCOM import
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+
+from gramps.gen.db.utils import make_database
+from gramps.gen.user import User
+from ..importgedcom import importData
+from ...lib import libgedcom
+from ...lib.libgedcom import Lexer, UTF8Reader, TOKEN_DATE, TOKEN_ID, TOKEN_NOTE
+
+
+class LexerTest(unittest.TestCase):
+    def setUp(self):
+        self.msgs = []
+
+    def __lexer(self, text):
+        reader = UTF8Reader(BytesIO(text.encode("utf-8")), self.msgs.append, "UTF-8")
+        return Lexer(reader, self.msgs.append)
+
+    def __read(self, text):
+        lexer = self.__lexer(text)
+        lines = []
+        line = lexer.readline()
+        while line is not None:
+            lines.append((line.line, line.level, line.token, line.data))
+            line = lexer.readline()
+        lexer.clean_up()
+        return lines
+
+    def test_continuation(self):
+        lines = self.__read(
+            "0 @N1@ NOTE\n"
+            "1 CONC First\n"
+            "1 CONT second  line\n"
+            "1 CONC  continued\n"
+            "0 @N2@ NOTE  Text\n"
+            "0 TRLR\n"
+        )
+        self.assertEqual(
+            [line[:3] for line in lines],
+            [(1, 0, TOKEN_ID), (5, 0, TOKEN_ID), (6, 0, libgedcom.TOKEN_TRLR)],
+        )
+        self.assertEqual(lines[0][3], "NOTE First\nsecond  line continued")
+        self.assertEqual(lines[1][3], "NOTE  Text")
+
+    def test_ignored_lines(self):
+        lines = self.__read("0 HEAD\nbad line\n1 NOTE text\n\n0 TRLR\n")
+        self.assertEqual([line[0] for line in lines], [1, 3, 5])
+        self.assertEqual(lines[1][2], TOKEN_NOTE)
+        self.assertEqual(len(self.msgs), 2)
+        self.assertTrue(self.msgs[0].endswith("bad line"))
+
+    def test_dates(self):
+        lines = self.__read("1 BIRT\n2 DATE ABT 1800\n1 DEAT\n2 DATE ABT 1800\n")
+        self.assertEqual(lines[1][2], TOKEN_DATE)
+        self.assertEqual(lines[1][3].get_year(), 1800)
+        self.assertEqual(lines[1][3].get_modifier(), lines[3][3].get_modifier())
+        self.assertIsNot(lines[1][3], lines[3][3])
+
+    def test_batches(self):
+        text = "".join("0 @I%d@ INDI\n1 SEX M\n" % index for index in range(5000))
+        with patch.object(libgedcom, "QUEUE_SIZE", 1):
+            lines = self.__read(text)
+        self.assertEqual([line[0] for line in lines], list(range(1, 10001)))
+
+    def test_clean_up(self):
+        text = "".join("0 @I%d@ INDI\n" % index for index in range(50000))
+        lexer = self.__lexer(text)
+        self.assertEqual(lexer.readline().line, 1)
+        lexer.clean_up()
+        self.assertEqual(
+            [thread.name for thread in threading.enumerate()].count("GEDCOM lexer"),
+            0,
+        )
+
+
+class PlaceTest(unittest.TestCase):
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.dirpath, "db"))
+        self.db = make_database("sqlite")
+        self.db.load(os.path.join(self.dirpath, "db"))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.dirpath)
+
+    def __import(self, places):
+        path = os.path.join(self.dirpath, "test.ged")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("0 HEAD\n1 CHAR UTF-8\n1 PLAC\n2 FORM City, County, Country\n")
+            for index, place in enumerate(places):
+                file.write("0 @I%d@ INDI\n1 BIRT\n2 PLAC %s\n" % (index, place))
+            file.write("0 TRLR\n")
+        importData(self.db, path, User())
+
+    def __titles(self):
+        return sorted(place.get_title() for place in self.db.iter_places())
+
+    def test_shared(self):
+        self.__import(["Ely, Cambs, England", "March, Cambs, England"] * 2)
+        # The top place of the first import has no enclosing place
+        self.__import(["England"])
+        self.assertEqual(
+            self.__titles(),
+            [
+                "Cambs, England",
+                "Ely, Cambs, England",
+                "England",
+                "March, Cambs, England",
+            ],
+        )
+        handles = {event.get_place_handle() for event in self.db.iter_events()}
+        self.assertEqual(len(handles), 3)
+
+    def test_hierarchy(self):
+        self.__import(
+            ["Ely, Cambs, England", "March, Cambs, England", "Paris, , France"]
+        )
+        places = {place.handle: place for place in self.db.iter_places()}
+        parents = {
+            place.get_name().get_value(): [
+                places[ref.ref].get_name().get_value()
+                for ref in place.get_placeref_list()
+            ]
+            for place in places.values()
+        }
+        self.assertEqual(
+            parents,
+            {
+                "Ely": ["Cambs"],
+                "March": ["Cambs"],
+                "Cambs": ["England"],
+                "England": [],
+                "Paris": ["France"],
+                "France": [],
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
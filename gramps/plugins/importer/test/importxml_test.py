@@ -0,0 +1,79 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unit test of the Gramps XML import
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from gramps.gen.db.utils import make_database
+from gramps.gen.user import User
+from .. import importxml
+from ..importxml import importData
+from .xml_benchmark import write_xml
+
+
+class ImportXmlTest(unittest.TestCase):
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.dirpath, "db"))
+        self.db = make_database("sqlite")
+        self.db.load(os.path.join(self.dirpath, "db"))
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.dirpath)
+
+    def __import(self, copies):
+        path = os.path.join(self.dirpath, "test.gramps")
+        write_xml(path, copies)
+        progress = []
+        user = User()
+        user.callback_function = lambda percent, text=None: progress.append(percent)
+        importData(self.db, path, user)
+        return progress
+
+    def test_import(self):
+        with patch.object(importxml, "READ_SIZE", 1 << 12):
+            progress = self.__import(3)
+        self.assertEqual(self.db.get_number_of_people(), 180)
+        self.assertEqual(self.db.get_number_of_families(), 69)
+        self.assertEqual(progress, sorted(progress))
+        self.assertGreater(len(progress), 1)
+        self.assertEqual(progress[-1], 100)
+
+    def test_references(self):
+        # The events refer to the places before these are read
+        self.__import(2)
+        for event in self.db.iter_events():
+            if event.get_place_handle():
+                place = self.db.get_place_from_handle(event.get_place_handle())
+                self.assertTrue(place.get_name().get_value())
+        for person in self.db.iter_people():
+            self.assertTrue(person.gramps_id.startswith("I"))
+
+
+if __name__ == "__main__":
+    unittest.main()
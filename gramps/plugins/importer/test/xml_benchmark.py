@@ -0,0 +1,140 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026      Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Benchmark of the Gramps XML import.
+
+Generates gzipped Gramps XML files made of the given numbers of copies of
+example/gramps/data.gramps, with the handles and ids of each copy renamed,
+and reports the time taken by their import into an SQLite database.  Run
+with::
+
+    python3 -m gramps.plugins.importer.test.xml_benchmark [COPIES ...]
+
+The default is 200 copies, of 60 people each.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import gzip
+import os
+import re
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import ROOT_DIR
+from gramps.gen.db.utils import make_database
+from gramps.gen.user import User
+from gramps.plugins.importer.importxml import importData
+
+EXAMPLE = os.path.join(ROOT_DIR, os.pardir, "example", "gramps", "data.gramps")
+SECTIONS = (
+    "events",
+    "people",
+    "families",
+    "citations",
+    "sources",
+    "places",
+    "objects",
+    "repositories",
+    "notes",
+)
+HANDLE_RE = re.compile(r'((?:handle|hlink)="_)([^"]*)"')
+ID_RE = re.compile(r' id="([A-Z]+)(\d+)"')
+
+
+def rename(text, copy, tags):
+    """
+    Return the text of a copy of objects, with their handles and ids
+    renamed, except for the handles of the tags, which are not copied.
+    """
+
+    def handle(match):
+        if match.group(2) in tags:
+            return match.group(0)
+        return '%s%sX%d"' % (match.group(1), match.group(2), copy)
+
+    def gramps_id(match):
+        return ' id="%s%d"' % (match.group(1), int(match.group(2)) + 10000 * copy)
+
+    return ID_RE.sub(gramps_id, HANDLE_RE.sub(handle, text))
+
+
+def write_xml(path, copies):
+    """
+    Write a gzipped Gramps XML file of a number of copies of the objects of
+    the example file.
+    """
+    with open(EXAMPLE, encoding="utf-8") as file:
+        text = file.read()
+    tags = set(re.findall(r'<tag handle="_([^"]*)"', text))
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        position = 0
+        for section in SECTIONS:
+            start = text.index(">", text.index("<%s" % section)) + 1
+            end = text.index("</%s>" % section)
+            file.write(text[position:start])
+            file.write(text[start:end])
+            for copy in range(1, copies):
+                file.write(rename(text[start:end], copy, tags))
+            position = end
+        file.write(text[position:])
+
+
+def main(sizes=(200,)):
+    """
+    Run the benchmark for files of the given numbers of copies.
+    """
+    for copies in sizes:
+        dirpath = tempfile.mkdtemp()
+        try:
+            path = os.path.join(dirpath, "benchmark.gramps")
+            write_xml(path, copies)
+            size = os.path.getsize(path) / 2**20
+
+            dbpath = os.path.join(dirpath, "db")
+            os.mkdir(dbpath)
+            db = make_database("sqlite")
+            db.load(dbpath)
+            start = perf_counter()
+            importData(db, path, User())
+            imported = perf_counter() - start
+            count = db.get_number_of_people()
+            db.close()
+        finally:
+            shutil.rmtree(dirpath)
+        print(
+            "%8d people, %.1f MB compressed: import %.2f seconds, %.0f people/sec"
+            % (count, size, imported, count / imported)
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [200])
@@ -90,7 +90,9 @@ all lines until the next level 2 token is found (in this case, skipping the
 #
 # -------------------------------------------------------------------------
 import os
+import queue
 import re
+import threading
 import time
 
 # from xml.parsers.expat import ParserCreate
@@ -761,6 +763,14 @@ STRIP_DICT = dict.fromkeys(list(range(9)) + list(range(11, 13)) + list(range(14,
 # undefined, but if they have been used, the file is probably supposed to be
 # cp1252
 DEL_AND_C1 = dict.fromkeys(list(range(0x7F, 0x9F)))
+# Size hint in characters of the lines read from the file at a time, number of
+# lines passed from the lexer thread to the parser at a time, and number of
+# these batches read ahead of the parser
+READ_SIZE = 1 << 16
+LINE_BATCH = 1000
+QUEUE_SIZE = 16
+# Number of the different date texts whose parsed dates are kept
+DATE_CACHE_SIZE = 10000
 
 # -------------------------------------------------------------------------
 #
@@ -929,127 +939,208 @@ class GedcomDateParser(DateParser):
 #
 # -------------------------------------------------------------------------
 class Lexer:
-    """low level line reading and early parsing"""
+    """
+    low level line reading and early parsing
+
+    The lines are read in bulk and tokenized by a thread of their own, with
+    the CONT and CONC lines folded into the line they continue, and passed
+    to the parser as GedLine objects, in batches of whole level 0 records,
+    through a bounded queue.  Reading the file thus overlaps with the
+    parsing and the database writes of the import.
+    """
 
     def __init__(self, ifile, __add_msg):
         self.ifile = ifile
-        self.current_list = []
-        self.eof = False
-        self.cnv = None
-        self.cnt = 0
-        self.index = 0
-        self.func_map = {
-            TOKEN_CONT: self.__fix_token_cont,
-            TOKEN_CONC: self.__fix_token_conc,
-        }
         self.__add_msg = __add_msg
+        self.__queue = queue.Queue(QUEUE_SIZE)
+        self.__thread = None
+        self.__stop = False
+        self.__eof = False
+        # The batch being read by the parser, and being written by the thread
+        self.__batch = []
+        self.__pos = 0
+        self.__output = []
+        ifile.set_add_msg(self.__output_msg)
 
     def readline(self):
-        """read a line from file with possibility of putting it back"""
-        if len(self.current_list) <= 1 and not self.eof:
-            self.__readahead()
-        try:
-            return GedLine(self.current_list.pop())
-        except:
-            LOG.debug("Error in reading Gedcom line", exc_info=True)
-            return None
-
-    def __fix_token_cont(self, data):
-        line = self.current_list[0]
-        new_value = line[2] + "\n" + data[2]
-        self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
-
-    def __fix_token_conc(self, data):
-        line = self.current_list[0]
-        if len(line[2]) == 4:
-            # This deals with lines of the form
-            # 0 @<XREF:NOTE>@ NOTE
-            #   1 CONC <SUBMITTER TEXT>
-            # The previous line contains only a tag and no data so concat a
-            # space to separate the new line from the tag. This prevents the
-            # first letter of the new line being lost later
-            # in _GedcomParse.__parse_record
-            new_value = line[2] + " " + data[2]
-        else:
-            new_value = line[2] + data[2]
-        self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
+        """
+        Return the next line of the file as a GedLine, or None at the end of
+        the file or if the line could not be read.
+        """
+        while True:
+            if self.__pos == len(self.__batch):
+                if self.__eof:
+                    return None
+                if self.__thread is None:
+                    self.__thread = threading.Thread(
+                        target=self.__run, name="GEDCOM lexer", daemon=True
+                    )
+                    self.__thread.start()
+                batch = self.__queue.get()
+                if isinstance(batch, Exception):
+                    self.__eof = True
+                    raise batch
+                if batch is None:
+                    self.__eof = True
+                    return None
+                self.__batch = batch
+                self.__pos = 0
+            line = self.__batch[self.__pos]
+            self.__pos += 1
+            if isinstance(line, str):
+                # A message of the lexer, reported in the order of the lines
+                self.__add_msg(line)
+            else:
+                return line
 
-    def __readahead(self):
-        while len(self.current_list) < 5:
-            line = self.ifile.readline()
-            self.index += 1
-            if not line:
-                self.eof = True
-                return
+    def __output_msg(self, message):
+        """
+        Add a message to the lines passed to the parser.
+        """
+        self.__output.append(message)
 
-            original_line = line
+    def __put(self, item):
+        """
+        Pass an item to the parser, unless it has stopped reading.  Return
+        False if it has.
+        """
+        while not self.__stop:
             try:
-                # According to the GEDCOM 5.5 standard,
-                # Chapter 1 subsection Grammar "leading whitespace preceeding
-                # a GEDCOM line should be ignored"
-                # We will also strip the terminator which is any combination
-                # of carriage_return and line_feed
-                line = line.lstrip(" ").rstrip("\n\r")
-                # split into level+delim+rest
-                line = line.partition(" ")
-                level = int(line[0])
-                # there should only be one space after the level,
-                # but we can ignore more,
-                line = line[2].lstrip(" ")
-                # then split into tag+delim+line_value
-                # or xfef_id+delim+rest
-                # the xref_id can have spaces in it
-                if line.startswith("@"):
-                    line = line.split("@", 2)
-                    # line is now [None, alphanum+pointer_string, rest]
-                    tag = "@" + line[1] + "@"
-                    line_value = line[2].lstrip()
-                    # Ignore meaningless @IDENT@ on CONT or CONC line
-                    # as noted at http://www.tamurajones.net/IdentCONT.xhtml
-                    if line_value.startswith(("CONT ", "CONC ")):
-                        line = line_value.partition(" ")
+                self.__queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __run(self):
+        """
+        Pass the lines of the file to the parser, as batches of GedLine
+        objects of whole level 0 records, followed by None.
+        """
+        GedLine.clear_dates()
+        try:
+            for data in self.__iter_data():
+                if data[0] == 0 and len(self.__output) >= LINE_BATCH:
+                    if not self.__put(self.__output):
+                        return
+                    self.__output = []
+                try:
+                    line = GedLine(data)
+                except:
+                    LOG.debug("Error in reading Gedcom line", exc_info=True)
+                    line = None
+                self.__output.append(line)
+            if self.__put(self.__output):
+                self.__put(None)
+        except Exception as err:
+            self.__put(err)
+
+    def __iter_data(self):
+        """
+        Return an iterator over the (level, token, value, tag, line number)
+        tuples of the lines of the file, with the values of the CONT and
+        CONC lines joined to the value of the line they continue.
+        """
+        get_token = TOKENS.get
+        index = 0
+        # The last line, its value as a list of parts, and the value length
+        last = None
+        parts = None
+        size = 0
+        lines = self.ifile.readlines()
+        while lines:
+            for line in lines:
+                index += 1
+                original_line = line
+                try:
+                    # According to the GEDCOM 5.5 standard,
+                    # Chapter 1 subsection Grammar "leading whitespace
+                    # preceeding a GEDCOM line should be ignored"
+                    # We will also strip the terminator which is any
+                    # combination of carriage_return and line_feed
+                    line = line.lstrip(" ").rstrip("\n\r")
+                    # split into level+delim+rest
+                    line = line.partition(" ")
+                    level = int(line[0])
+                    # there should only be one space after the level,
+                    # but we can ignore more,
+                    line = line[2].lstrip(" ")
+                    # then split into tag+delim+line_value
+                    # or xfef_id+delim+rest
+                    # the xref_id can have spaces in it
+                    if line.startswith("@"):
+                        line = line.split("@", 2)
+                        # line is now [None, alphanum+pointer_string, rest]
+                        tag = "@" + line[1] + "@"
+                        line_value = line[2].lstrip()
+                        # Ignore meaningless @IDENT@ on CONT or CONC line
+                        # as noted at http://www.tamurajones.net/IdentCONT.xhtml
+                        if line_value.startswith(("CONT ", "CONC ")):
+                            line = line_value.partition(" ")
+                            tag = line[0]
+                            line_value = line[2]
+                    else:
+                        line = line.partition(" ")
                         tag = line[0]
                         line_value = line[2]
+                except:
+                    problem = _("Line ignored ")
+                    text = original_line.rstrip("\n\r")
+                    prob_width = 66
+                    problem = problem.ljust(prob_width)[0 : (prob_width - 1)]
+                    text = text.replace("\n", "\n".ljust(prob_width + 22))
+                    message = "%s              %s" % (problem, text)
+                    self.__output_msg(message)
+                    continue
+
+                # Need to un-double '@' See Gedcom 5.5 spec 'any_char'
+                line_value = line_value.replace("@@", "@")
+                token = get_token(tag, TOKEN_UNKNOWN)
+
+                if last is not None and token == TOKEN_CONT:
+                    parts.append("\n")
+                    parts.append(line_value)
+                    size += 1 + len(line_value)
+                elif last is not None and token == TOKEN_CONC:
+                    if size == 4:
+                        # This deals with lines of the form
+                        # 0 @<XREF:NOTE>@ NOTE
+                        #   1 CONC <SUBMITTER TEXT>
+                        # The previous line contains only a tag and no data
+                        # so concat a space to separate the new line from
+                        # the tag. This prevents the first letter of the new
+                        # line being lost later in
+                        # _GedcomParse.__parse_record
+                        parts.append(" ")
+                        size += 1
+                    parts.append(line_value)
+                    size += len(line_value)
                 else:
-                    line = line.partition(" ")
-                    tag = line[0]
-                    line_value = line[2]
-            except:
-                problem = _("Line ignored ")
-                text = original_line.rstrip("\n\r")
-                prob_width = 66
-                problem = problem.ljust(prob_width)[0 : (prob_width - 1)]
-                text = text.replace("\n", "\n".ljust(prob_width + 22))
-                message = "%s              %s" % (problem, text)
-                self.__add_msg(message)
-                continue
-
-            # Need to un-double '@' See Gedcom 5.5 spec 'any_char'
-            line_value = line_value.replace("@@", "@")
-            token = TOKENS.get(tag, TOKEN_UNKNOWN)
-            data = (level, token, line_value, tag, self.index)
-
-            func = self.func_map.get(data[1])
-            if func:
-                func(data)
-            else:
-                # There will normally only be one space between tag and
-                # line_value, but in case there is more then one, remove extra
-                # spaces after CONC/CONT processing
-                # Also, Gedcom spec says there should be no spaces at end of
-                # line, however some programs put them there (FTM), so let's
-                # leave them in place.
-                data = data[:2] + (data[2].lstrip(),) + data[3:]
-                self.current_list.insert(0, data)
+                    if last is not None:
+                        yield (last[0], last[1], "".join(parts), last[3], last[4])
+                    # There will normally only be one space between tag and
+                    # line_value, but in case there is more then one, remove
+                    # extra spaces after CONC/CONT processing
+                    # Also, Gedcom spec says there should be no spaces at end
+                    # of line, however some programs put them there (FTM), so
+                    # let's leave them in place.
+                    line_value = line_value.lstrip()
+                    last = (level, token, None, tag, index)
+                    parts = [line_value]
+                    size = len(line_value)
+            lines = self.ifile.readlines()
+        if last is not None:
+            yield (last[0], last[1], "".join(parts), last[3], last[4])
 
     def clean_up(self):
         """
-        Break circular references to parsing methods stored in dictionaries
-        to aid garbage collection
+        Stop the thread reading the file, if the parser stops reading before
+        the end of the file.
         """
-        for key in list(self.func_map.keys()):
-            del self.func_map[key]
-        del self.func_map
+        self.__stop = True
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
 
 
 # -----------------------------------------------------------------------
@@ -1078,6 +1169,8 @@ class GedLine:
     """
 
     __DATE_CNV = GedcomDateParser()
+    # The dates parsed from the same texts, which are often repeated
+    __DATES = {}
 
     @staticmethod
     def __extract_date(text):
@@ -1238,11 +1331,23 @@ class GedLine:
         except:
             self.data = Person.UNKNOWN
 
+    @staticmethod
+    def clear_dates():
+        """
+        Forget the dates parsed, when the date format may have changed.
+        """
+        GedLine.__DATES.clear()
+
     def calc_date(self):
         """
         Converts the data field to a Date object
         """
-        self.data = self.__extract_date(self.data)
+        date = self.__DATES.get(self.data)
+        if date is None:
+            if len(self.__DATES) >= DATE_CACHE_SIZE:
+                self.__DATES.clear()
+            date = self.__DATES[self.data] = self.__extract_date(self.data)
+        self.data = Date(date)
         self.token = TOKEN_DATE
 
     def calc_unknown(self):
@@ -1333,8 +1438,23 @@ class BaseReader:
 
     def readline(self):
         """Read a single line"""
+        return self.convert(self.ifile.readline())
+
+    def readlines(self):
+        """
+        Read the next lines in bulk, returning an empty list at the end of
+        the file.
+        """
+        return [self.convert(line) for line in self.ifile.readlines(READ_SIZE)]
+
+    def convert(self, line):
+        """Return a line read from the file, cleaned up"""
         raise NotImplementedError()
 
+    def set_add_msg(self, __add_msg):
+        """Set the function called with the error messages"""
+        self.__add_msg = __add_msg
+
     def report_error(self, problem, line):
         """Create an error message"""
         line = line.rstrip("\n\r")
@@ -1360,8 +1480,7 @@ class UTF8Reader(BaseReader):
                 ifile, encoding="utf_8", errors="replace", newline=None
             )
 
-    def readline(self):
-        line = self.ifile.readline()
+    def convert(self, line):
         return line.translate(STRIP_DICT)
 
 
@@ -1375,8 +1494,7 @@ class UTF16Reader(BaseReader):
         )
         self.reset()
 
-    def readline(self):
-        line = self.ifile.readline()
+    def convert(self, line):
         return line.translate(STRIP_DICT)
 
 
@@ -1389,8 +1507,7 @@ class AnsiReader(BaseReader):
             ifile, encoding="latin1", errors="replace", newline=None
         )
 
-    def readline(self):
-        line = self.ifile.readline()
+    def convert(self, line):
         if line.translate(DEL_AND_C1) != line:
             self.report_error(
                 "DEL or C1 control chars in line did you mean " "CHAR cp1252??", line
@@ -1407,8 +1524,7 @@ class CP1252Reader(BaseReader):
             ifile, encoding="cp1252", errors="replace", newline=None
         )
 
-    def readline(self):
-        line = self.ifile.readline()
+    def convert(self, line):
         return line.translate(STRIP_DICT)
 
 
@@ -1885,8 +2001,7 @@ class AnselReader(BaseReader):
             ifile, encoding="ascii", errors="surrogateescape", newline=None
         )
 
-    def readline(self):
-        line = self.ifile.readline()
+    def convert(self, line):
         linebytes = line.encode(encoding="ascii", errors="surrogateescape")
         return self.__ansel_to_unicode(linebytes)
 
@@ -3056,15 +3171,11 @@ class GedcomParser(UpdateCallback):
         }
         self.func_list.append(self.note_parse_tbl)
 
-        # look for existing place titles, build a map
-        self.place_names = defaultdict(list)
-        cursor = dbase.get_place_cursor()
-        data = next(cursor)
-        while data:
-            (handle, val) = data
-            self.place_names[val[2]].append(handle)
-            data = next(cursor)
-        cursor.close()
+        # index the existing places, see __find_place
+        self.place_index = defaultdict(list)
+        self.place_keys = {}
+        for place in dbase.iter_places():
+            self.__index_place(place)
 
         enc = stage_one.get_encoding()
 
@@ -3103,29 +3214,33 @@ class GedcomParser(UpdateCallback):
           0 TRLR                                          {1:1}
 
         """
-        with DbTxn(_("GEDCOM import"), self.dbase, not use_trans) as self.trans:
-            self.dbase.disable_signals()
-            self.__parse_header_head()
-            self.want_parse_warnings = False
-            self.want_parse_warnings = True
-            if self.use_def_src:
-                self.dbase.add_source(self.def_src, self.trans)
-            if self.default_tag and self.default_tag.handle is None:
-                self.dbase.add_tag(self.default_tag, self.trans)
-            self.__parse_header()
-            self.__parse_record()
-            self.__parse_trailer()
-            for title, handle in self.inline_srcs.items():
-                src = Source()
-                src.set_handle(handle)
-                src.set_title(title)
-                self.dbase.add_source(src, self.trans)
-            self.__clean_up()
-
-            self.place_import.generate_hierarchy(self.trans)
-
-            if not self.dbase.get_feature("skip-check-xref"):
-                self.__check_xref()
+        try:
+            with DbTxn(_("GEDCOM import"), self.dbase, not use_trans) as self.trans:
+                self.dbase.disable_signals()
+                self.__parse_header_head()
+                self.want_parse_warnings = False
+                self.want_parse_warnings = True
+                if self.use_def_src:
+                    self.dbase.add_source(self.def_src, self.trans)
+                if self.default_tag and self.default_tag.handle is None:
+                    self.dbase.add_tag(self.default_tag, self.trans)
+                self.__parse_header()
+                self.__parse_record()
+                self.__parse_trailer()
+                for title, handle in self.inline_srcs.items():
+                    src = Source()
+                    src.set_handle(handle)
+                    src.set_title(title)
+                    self.dbase.add_source(src, self.trans)
+                self.__clean_up()
+
+                self.place_import.generate_hierarchy(self.trans)
+
+                if not self.dbase.get_feature("skip-check-xref"):
+                    self.__check_xref()
+        finally:
+            # Stop reading the file if the import failed
+            self.lexer.clean_up()
         self.dbase.enable_signals()
         self.dbase.request_rebuild()
         if self.number_of_errors == 0:
@@ -3308,31 +3423,64 @@ class GedcomParser(UpdateCallback):
             return True
         return False
 
+    def __place_key(self, title, location, placeref_list):
+        """
+        Return the key of a place in the place index: its title and its
+        primary location.  The places enclosed by others, such as the place
+        details of addresses, are never shared, and have no key.
+
+        @param title: The place title
+        @type title: string
+        @param location: The primary location
+        @type location: gen.lib.Location
+        @param placeref_list: The place references
+        @type placeref_list: list
+        @return tuple or None
+        """
+        if placeref_list != []:
+            return None
+        if self.__loc_is_empty(location):
+            return (title, None)
+        return (title, location.serialize())
+
+    def __index_place(self, place):
+        """
+        Add a place to the place index, or move it to its new key if its
+        title, primary location or place references have changed.
+
+        @param place: The place
+        @type place: gen.lib.Place
+        """
+        key = self.__place_key(
+            place.get_title(), self.__get_first_loc(place), place.get_placeref_list()
+        )
+        old_key = self.place_keys.get(place.handle)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self.place_index[old_key].remove(place.handle)
+            del self.place_keys[place.handle]
+        if key is not None:
+            self.place_index[key].append(place.handle)
+            self.place_keys[place.handle] = key
+
     def __find_place(self, title, location, placeref_list):
         """
         Finds an existing place based on the title and primary location.
 
+        The places are looked up in the place index, which is kept up to date
+        as the places are added and merged during the import.
+
         @param title: The place title
         @type title: string
         @param location: The current location
         @type location: gen.lib.Location
         @return gen.lib.Place
         """
-        for place_handle in self.place_names[title]:
-            place = self.dbase.get_place_from_handle(place_handle)
-            if place.get_title() == title:
-                if (
-                    self.__loc_is_empty(location)
-                    and self.__loc_is_empty(self.__get_first_loc(place))
-                    and place.get_placeref_list() == placeref_list
-                ):
-                    return place
-                elif (
-                    not self.__loc_is_empty(location)
-                    and not self.__loc_is_empty(self.__get_first_loc(place))
-                    and self.__get_first_loc(place).is_equivalent(location) == IDENTICAL
-                ) and place.get_placeref_list() == placeref_list:
-                    return place
+        key = self.__place_key(title, location, placeref_list)
+        handles = self.place_index.get(key)
+        if handles:
+            return self.dbase.get_place_from_handle(handles[0])
         return None
 
     def __add_place(self, event, sub_state):
@@ -3364,7 +3512,7 @@ class GedcomParser(UpdateCallback):
                 # handle.
                 if location:
                     self.place_import.store_location(location, place.handle)
-                self.place_names[place.get_title()].append(place.get_handle())
+                self.__index_place(place)
                 event.set_place_handle(place.get_handle())
             else:
                 place.merge(sub_state.place)
@@ -3373,6 +3521,7 @@ class GedcomParser(UpdateCallback):
                     self.place_import, place, place_title
                 )
                 self.dbase.commit_place(place, self.trans)
+                self.__index_place(place)
                 if location:
                     self.place_import.store_location(location, place.handle)
                 event.set_place_handle(place.get_handle())
@@ -5125,7 +5274,7 @@ class GedcomParser(UpdateCallback):
                 place.set_title(title)
                 place.name.set_value(title)
                 self.dbase.add_place(place, self.trans)
-                self.place_names[place.get_title()].append(place.get_handle())
+                self.__index_place(place)
             else:
                 pass
             state.lds_ord.set_place_handle(place.handle)
@@ -6234,10 +6383,11 @@ class GedcomParser(UpdateCallback):
             if place is None:
                 place = state.place
                 self.dbase.add_place(place, self.trans)
-                self.place_names[place.get_title()].append(place.get_handle())
+                self.__index_place(place)
             else:
                 place.merge(state.place)
                 self.dbase.commit_place(place, self.trans)
+                self.__index_place(place)
             place_title = _pd.display(self.dbase, place)
             state.pf.load_place(self.place_import, place, place_title)
 
@@ -66,34 +66,21 @@ class PlaceImport:
         """
         Generate missing places in the place hierarchy.
         """
+        # The parents found or created, by enclosing location, so that the
+        # places of a same town, county etc. only look for their parent once
+        parents = {}
         for handle, location in self.handle2loc.items():
             # find title and type
             for type_num, name in enumerate(location):
                 if name:
                     break
 
-            loc = list(location)
-            loc[type_num] = ""
-
-            # find top parent
-            parent = None
-            for n in range(7):
-                if loc[n]:
-                    tup = tuple([""] * n + loc[n:])
-                    parent = self.loc2handle.get(tup)
-                    if parent:
-                        break
-
-            # create missing parent places
-            if parent:
-                n -= 1
-            while n > type_num:
-                if loc[n]:
-                    # TODO for Arabic, should the next comma be translated?
-                    title = ", ".join([item for item in loc[n:] if item])
-                    parent = self.__add_place(loc[n], n, parent, title, trans)
-                    self.loc2handle[tuple([""] * n + loc[n:])] = parent
-                n -= 1
+            tup = ("",) * (type_num + 1) + location[type_num + 1 :]
+            if tup in parents:
+                parent = parents[tup]
+            else:
+                parent = self.__find_parent(list(tup), type_num, trans)
+                parents[tup] = parent
 
             # link to existing place
             if parent:
@@ -103,6 +90,33 @@ class PlaceImport:
                 place.set_placeref_list([placeref])
                 self.db.commit_place(place, trans, place.get_change_time())
 
+    def __find_parent(self, loc, type_num, trans):
+        """
+        Return the handle of the place enclosing a location, whose title is
+        at the given level, creating the missing places between it and its
+        top existing parent.
+        """
+        # find top parent
+        parent = None
+        for n in range(7):
+            if loc[n]:
+                tup = tuple([""] * n + loc[n:])
+                parent = self.loc2handle.get(tup)
+                if parent:
+                    break
+
+        # create missing parent places
+        if parent:
+            n -= 1
+        while n > type_num:
+            if loc[n]:
+                # TODO for Arabic, should the next comma be translated?
+                title = ", ".join([item for item in loc[n:] if item])
+                parent = self.__add_place(loc[n], n, parent, title, trans)
+                self.loc2handle[tuple([""] * n + loc[n:])] = parent
+            n -= 1
+        return parent
+
     def __add_place(self, name, type_num, parent, title, trans):
         """
         Add a missing place to the database.
@@ -117,6 +131,4 @@ class PlaceImport:
             placeref = PlaceRef()
             placeref.ref = parent
             place.set_placeref_list([placeref])
-        handle = self.db.add_place(place, trans)
-        self.db.commit_place(place, trans)
-        return handle
+        return self.db.add_place(place, trans)
@@ -27,6 +27,9 @@
 # python modules
 #
 # -------------------------------------------------------------------------
+import os
+import time
+
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
@@ -71,25 +74,39 @@ class Rebuild(tool.Tool):
 
         self.db.disable_signals()
 
+        workers = self.options.handler.options_dict["workers"] or os.cpu_count()
         if uistate:
             self.callback = uistate.pulse_progressbar
             uistate.set_busy_cursor(True)
             uistate.progress.show()
             uistate.push_message(dbstate, _("Rebuilding secondary indexes..."))
+        else:
+            self.callback = None
+            print("Rebuilding Secondary Indexes...")
 
-            self.db.rebuild_secondary(self.callback)
+        start = time.perf_counter()
+        count = self.db.rebuild_secondary(self.callback, workers=workers)
+        elapsed = time.perf_counter() - start
+        throughput = _(
+            "%(count)d objects in %(seconds).1f seconds (%(rate)d per second)."
+        ) % {
+            "count": count,
+            "seconds": elapsed,
+            "rate": count / elapsed if elapsed else count,
+        }
 
+        if uistate:
             uistate.set_busy_cursor(False)
             uistate.progress.hide()
             OkDialog(
                 _("Secondary indexes rebuilt"),
-                _("All secondary indexes have been rebuilt."),
+                "%s\n\n%s"
+                % (_("All secondary indexes have been rebuilt."), throughput),
                 parent=uistate.window,
             )
         else:
-            print("Rebuilding Secondary Indexes...")
-            self.db.rebuild_secondary(None)
             print("All secondary indexes have been rebuilt.")
+            print(throughput)
 
         self.db.enable_signals()
         self.db.request_rebuild()
@@ -107,3 +124,15 @@ class RebuildOptions(tool.ToolOptions):
 
     def __init__(self, name, person_id=None):
         tool.ToolOptions.__init__(self, name, person_id)
+
+        # Options specific for this tool
+        self.options_dict = {
+            "workers": 1,
+        }
+        self.options_help = {
+            "workers": (
+                "=num",
+                "Number of worker processes",
+                "1 for none, or 0 for one per processor",
+            ),
+        }
@@ -29,6 +29,9 @@
 # python modules
 #
 # -------------------------------------------------------------------------
+import os
+import time
+
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
@@ -81,18 +84,29 @@ class RebuildRefMap(tool.Tool):
             self.callback = None
             print(_("Rebuilding reference maps..."))
 
-        self.db.reindex_reference_map(self.callback)
+        workers = self.options.handler.options_dict["workers"] or os.cpu_count()
+        start = time.perf_counter()
+        count = self.db.reindex_reference_map(self.callback, workers=workers)
+        elapsed = time.perf_counter() - start
+        throughput = _(
+            "%(count)d objects in %(seconds).1f seconds (%(rate)d per second)."
+        ) % {
+            "count": count,
+            "seconds": elapsed,
+            "rate": count / elapsed if elapsed else count,
+        }
 
         if uistate:
             uistate.set_busy_cursor(False)
             uistate.progress.hide()
             OkDialog(
                 _("Reference maps rebuilt"),
-                _("All reference maps have been rebuilt."),
+                "%s\n\n%s" % (_("All reference maps have been rebuilt."), throughput),
                 parent=uistate.window,
             )
         else:
             print(_("All reference maps have been rebuilt."))
+            print(throughput)
         self.db.enable_signals()
 
 
@@ -108,3 +122,15 @@ class RebuildRefMapOptions(tool.ToolOptions):
 
     def __init__(self, name, person_id=None):
         tool.ToolOptions.__init__(self, name, person_id)
+
+        # Options specific for this tool
+        self.options_dict = {
+            "workers": 1,
+        }
+        self.options_help = {
+            "workers": (
+                "=num",
+                "Number of worker processes",
+                "1 for none, or 0 for one per processor",
+            ),
+        }
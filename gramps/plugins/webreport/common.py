@@ -747,6 +747,14 @@ def add_birthdate(dbase, ppl_handle_list, rlocale):
     return sortable_individuals
 
 
+class _FallbackDate(Date):
+    """
+    A copy of a date, which tells whether it is that of a fallback event.
+    """
+
+    __slots__ = ("fallback",)
+
+
 def _find_birth_date(dbase, individual):
     """
     will look for a birth date within the person's events
@@ -759,7 +767,7 @@ def _find_birth_date(dbase, individual):
     if birth_ref:
         birth = dbase.get_event_from_handle(birth_ref.ref)
         if birth:
-            date_out = birth.get_date_object()
+            date_out = _FallbackDate(birth.get_date_object())
             date_out.fallback = False
     else:
         person_evt_ref_list = individual.get_primary_event_ref_list()
@@ -768,7 +776,7 @@ def _find_birth_date(dbase, individual):
                 event = dbase.get_event_from_handle(evt_ref.ref)
                 if event:
                     if event.get_type().is_birth_fallback():
-                        date_out = event.get_date_object()
+                        date_out = _FallbackDate(event.get_date_object())
                         date_out.fallback = True
                         LOG.debug("setting fallback to true for '%s'", event)
                         break
@@ -787,7 +795,7 @@ def _find_death_date(dbase, individual):
     if death_ref:
         death = dbase.get_event_from_handle(death_ref.ref)
         if death:
-            date_out = death.get_date_object()
+            date_out = _FallbackDate(death.get_date_object())
             date_out.fallback = False
     else:
         person_evt_ref_list = individual.get_primary_event_ref_list()
@@ -796,7 +804,7 @@ def _find_death_date(dbase, individual):
                 event = dbase.get_event_from_handle(evt_ref.ref)
                 if event:
                     if event.get_type().is_death_fallback():
-                        date_out = event.get_date_object()
+                        date_out = _FallbackDate(event.get_date_object())
                         date_out.fallback = True
                         LOG.debug("setting fallback to true for '%s'", event)
                         break